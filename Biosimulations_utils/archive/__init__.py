@@ -8,11 +8,12 @@
 
 from .data_model import ArchiveFormat, Archive  # noqa: F401
 from .combine import CombineArchiveWriter, CombineArchiveReader
+from .combine_zipfile import ZipfileCombineArchiveWriter, ZipfileCombineArchiveReader, ZipfileCombineArchive
 
-__all__ = ['write_archive', 'read_archive']
+__all__ = ['write_archive', 'read_archive', 'open_archive']
 
 
-def write_archive(archive, in_dir, out_file, format=ArchiveFormat.combine):
+def write_archive(archive, in_dir, out_file, format=ArchiveFormat.combine, contents=None, engine='libcombine'):
     """ Write an archive
 
     Args:
@@ -20,33 +21,81 @@ def write_archive(archive, in_dir, out_file, format=ArchiveFormat.combine):
         in_dir (:obj:`str`): directory which contains the files in the archive
         out_file (:obj:`str`): path to save archive
         format (:obj:`ArchiveFormat`, optional): archive format
+        contents (:obj:`dict`, optional): dictionary that maps the names of files in the archive to their contents;
+            these files are added from memory rather than from :obj:`in_dir`. With the ``zipfile`` engine, the
+            contents can also be binary file-like objects or iterators of chunks of bytes.
+        engine (:obj:`str`, optional): engine for writing COMBINE archives
+
+            * ``libcombine``: stage the files of the archive with libCOMBINE
+            * ``zipfile``: stream the files of the archive directly into the archive, and generate its
+              manifest and metadata without libCOMBINE
 
     Raises:
-        :obj:`NotImplementedError`: the format is not supported
+        :obj:`NotImplementedError`: the format or engine is not supported
     """
     if format == ArchiveFormat.combine:
-        Writer = CombineArchiveWriter
+        if engine == 'libcombine':
+            Writer = CombineArchiveWriter
+        elif engine == 'zipfile':
+            Writer = ZipfileCombineArchiveWriter
+        else:
+            raise NotImplementedError("Engine {} is not supported".format(engine))
     else:
         raise NotImplementedError("Format {} is not supported".format(format.name))
-    Writer().run(archive, in_dir, out_file)
+    Writer().run(archive, in_dir, out_file, contents=contents)
 
 
-def read_archive(in_file, out_dir, format=ArchiveFormat.combine):
+def read_archive(in_file, out_dir, format=ArchiveFormat.combine, engine='libcombine', filenames=None):
     """ Read an archive
 
     Args:
         in_dir (:obj:`str`): directory which contains the files in the archive
         out_file (:obj:`str`): path to save archive
         format (:obj:`ArchiveFormat`, optional): archive format
+        engine (:obj:`str`, optional): engine for reading COMBINE archives
+
+            * ``libcombine``: read the archive and extract all of its files with libCOMBINE
+            * ``zipfile``: read the manifest and metadata of the archive directly from its zip file, and
+              only extract the files in :obj:`filenames`
+
+        filenames (:obj:`list` of :obj:`str`, optional): paths of the files to extract within the archive
+            (e.g., ``./model.xml``); if :obj:`None`, extract all of the files of the archive. Only supported by
+            the ``zipfile`` engine.
 
     Returns:
         :obj:`Archive`: description of archive
 
+    Raises:
+        :obj:`NotImplementedError`: the format or engine is not supported
+    """
+    if format == ArchiveFormat.combine:
+        if engine == 'libcombine':
+            if filenames is not None:
+                raise NotImplementedError("Extracting selected files with engine {} is not supported".format(engine))
+            return CombineArchiveReader().run(in_file, out_dir)
+        elif engine == 'zipfile':
+            return ZipfileCombineArchiveReader().run(in_file, out_dir, filenames=filenames)
+        else:
+            raise NotImplementedError("Engine {} is not supported".format(engine))
+    else:
+        raise NotImplementedError("Format {} is not supported".format(format.name))
+
+
+def open_archive(in_file, format=ArchiveFormat.combine):
+    """ Open an archive for random access to its files, without extracting them
+
+    Args:
+        in_file (:obj:`str`): path to archive
+        format (:obj:`ArchiveFormat`, optional): archive format
+
+    Returns:
+        :obj:`ZipfileCombineArchive`: opened archive, which should be closed when it is no longer needed
+            (e.g., by using it as a context manager)
+
     Raises:
         :obj:`NotImplementedError`: the format is not supported
     """
     if format == ArchiveFormat.combine:
-        Reader = CombineArchiveReader
+        return ZipfileCombineArchive(in_file)
     else:
         raise NotImplementedError("Format {} is not supported".format(format.name))
-    return Reader().run(in_file, out_dir)
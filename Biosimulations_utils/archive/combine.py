@@ -21,16 +21,36 @@ import os
 __all__ = ['CombineArchiveWriter', 'CombineArchiveReader']
 
 
+def get_format_by_spec_url(spec_url):
+    """ Get the format of a file in an archive from the URL of its specification
+
+    Args:
+        spec_url (:obj:`str`): URL of the specification of the format
+
+    Returns:
+        :obj:`Format`: format
+    """
+    format = get_enum_format_by_attr(BiomodelFormat, 'spec_url', spec_url)
+    if not format:
+        format = get_enum_format_by_attr(SimulationFormat, 'spec_url', spec_url)
+    if format:
+        return copy.copy(format)
+    return Format(spec_url=spec_url)
+
+
 class CombineArchiveWriter(ArchiveWriter):
     """ Writer for COMBINE/OMEX archives """
 
-    def run(self, archive, in_dir, out_file):
+    def run(self, archive, in_dir, out_file, contents=None):
         """ Write an archive to a file
 
         Args:
             archive (:obj:`Archive`): description of archive
             in_dir (:obj:`str`): directory which contains the files in the archive
             out_file (:obj:`str`): path to save archive
+            contents (:obj:`dict`, optional): dictionary that maps the names of files in the archive to their
+                contents (:obj:`str` or UTF-8-encoded :obj:`bytes`); these files are added from memory rather than
+                from :obj:`in_dir`
 
         Raises:
             :obj:`AssertionError`: if files could not be added to the archive or the archive could not be
@@ -43,13 +63,25 @@ class CombineArchiveWriter(ArchiveWriter):
         self._write_metadata(archive, archive_comb, '.')
 
         # add files to archive
+        contents = contents or {}
         for file in archive.files:
-            assert archive_comb.addFile(
-                os.path.join(in_dir, file.filename),
-                file.filename,
-                file.format.spec_url if file.format else '',
-                file is archive.master_file
-            )
+            if file.filename in contents:
+                content = contents[file.filename]
+                if isinstance(content, bytes):
+                    content = content.decode()
+                assert archive_comb.addFileFromString(
+                    content,
+                    file.filename,
+                    file.format.spec_url if file.format else '',
+                    file is archive.master_file
+                )
+            else:
+                assert archive_comb.addFile(
+                    os.path.join(in_dir, file.filename),
+                    file.filename,
+                    file.format.spec_url if file.format else '',
+                    file is archive.master_file
+                )
             self._write_metadata(file, archive_comb, file.filename)
 
         # save archive to a file
@@ -118,14 +150,7 @@ class CombineArchiveReader(ArchiveReader):
             file_comb = archive_comb.getEntryByLocation(filename)
 
             if file_comb.isSetFormat():
-                spec_url = file_comb.getFormat()
-                format = get_enum_format_by_attr(BiomodelFormat, 'spec_url', spec_url)
-                if not format:
-                    format = get_enum_format_by_attr(SimulationFormat, 'spec_url', spec_url)
-                if format:
-                    format = copy.copy(format)
-                else:
-                    format = Format(spec_url=spec_url)
+                format = get_format_by_spec_url(file_comb.getFormat())
             else:
                 format = None
 
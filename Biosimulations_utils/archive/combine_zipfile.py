@@ -0,0 +1,430 @@
+""" Reader and writer for OMEX archives which access their files directly in zip files
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .combine import CombineArchiveReader, get_format_by_spec_url
+from .core import ArchiveWriter, ArchiveReader, ArchiveIoError
+from .data_model import Archive, ArchiveFile, ArchiveFormat
+from ..data_model import Person
+from lxml import etree
+import dateutil.parser
+import os
+import re
+import shutil
+import zipfile
+
+__all__ = ['ZipfileCombineArchiveWriter', 'ZipfileCombineArchiveReader', 'ZipfileCombineArchive']
+
+MANIFEST_NS = 'http://identifiers.org/combine.specifications/omex-manifest'
+METADATA_FORMAT = 'http://identifiers.org/combine.specifications/omex-metadata'
+RDF_NS = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+DCTERMS_NS = 'http://purl.org/dc/terms/'
+VCARD_NS = 'http://www.w3.org/2006/vcard/ns#'
+
+MANIFEST_FILENAME = 'manifest.xml'
+METADATA_FILENAME = 'metadata.rdf'
+
+# W3C date time formats of the dates of OMEX metadata
+W3CDTF_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?)?(Z|[+\-]\d{2}:\d{2})?')
+
+
+class ZipfileCombineArchiveWriter(ArchiveWriter):
+    """ Writer for COMBINE/OMEX archives which streams the files of archives directly into zip files
+
+    Unlike :obj:`CombineArchiveWriter`, which stages each file with libCOMBINE before the archive is
+    zipped, this writer streams each file into the archive from its contents in memory, from a file-like
+    object or iterator of chunks, or from :obj:`in_dir`. The writer generates the manifest
+    (``manifest.xml``) and the OMEX metadata (``metadata.rdf``) of the archive itself. The archives can
+    be read with :obj:`CombineArchiveReader`.
+    """
+
+    CHUNK_SIZE = 2 ** 20
+
+    def run(self, archive, in_dir, out_file, contents=None):
+        """ Write an archive to a file
+
+        Args:
+            archive (:obj:`Archive`): description of archive
+            in_dir (:obj:`str`): directory which contains the files in the archive
+            out_file (:obj:`str`): path to save archive
+            contents (:obj:`dict`, optional): dictionary that maps the names of files in the archive to their
+                contents (:obj:`str` or UTF-8-encoded :obj:`bytes`), binary file-like objects from which to read
+                their contents, or iterators of chunks of their contents (:obj:`bytes`); these files are added from
+                these sources rather than from :obj:`in_dir`
+        """
+        contents = contents or {}
+        with zipfile.ZipFile(out_file, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+            for file in archive.files:
+                arcname = self._get_arcname(file.filename)
+                if file.filename in contents:
+                    self._write_contents(zip_file, arcname, contents[file.filename])
+                else:
+                    zip_file.write(os.path.join(in_dir, file.filename), arcname)
+
+            has_metadata = self._has_metadata(archive) or any(self._has_metadata(file) for file in archive.files)
+            if has_metadata:
+                zip_file.writestr(METADATA_FILENAME, self._gen_metadata(archive))
+            zip_file.writestr(MANIFEST_FILENAME, self._gen_manifest(archive, has_metadata))
+
+    def _write_contents(self, zip_file, arcname, contents):
+        """ Stream the contents of a file into an archive
+
+        Args:
+            zip_file (:obj:`zipfile.ZipFile`): archive
+            arcname (:obj:`str`): name of the file within the zip file
+            contents (:obj:`str`, :obj:`bytes`, file-like object, or iterator of :obj:`bytes`): contents of the file,
+                a binary file-like object from which to read the contents, or an iterator of chunks of the contents
+        """
+        if isinstance(contents, str):
+            zip_file.writestr(arcname, contents.encode())
+        elif isinstance(contents, bytes):
+            zip_file.writestr(arcname, contents)
+        else:
+            with zip_file.open(arcname, 'w') as file:
+                if hasattr(contents, 'read'):
+                    shutil.copyfileobj(contents, file, self.CHUNK_SIZE)
+                else:
+                    for chunk in contents:
+                        file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+    @staticmethod
+    def _get_arcname(filename):
+        """ Get the name of a file within the zip file of an archive
+
+        Args:
+            filename (:obj:`str`): path of the file within the archive (e.g., ``./model.xml``)
+
+        Returns:
+            :obj:`str`: name of the file within the zip file (e.g., ``model.xml``)
+        """
+        if filename.startswith('./'):
+            return filename[2:]
+        return filename
+
+    @staticmethod
+    def _has_metadata(obj):
+        """ Determine whether an archive or a file in an archive has metadata
+
+        Args:
+            obj (:obj:`Archive` or :obj:`ArchiveFile`): archive or file in an archive
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the object has metadata
+        """
+        return bool(obj.description or obj.authors or obj.created or obj.updated)
+
+    def _gen_manifest(self, archive, has_metadata):
+        """ Generate the manifest of an archive
+
+        Args:
+            archive (:obj:`Archive`): description of archive
+            has_metadata (:obj:`bool`): if :obj:`True`, include the OMEX metadata file in the manifest
+
+        Returns:
+            :obj:`bytes`: manifest
+        """
+        manifest = etree.Element('{{{}}}omexManifest'.format(MANIFEST_NS), nsmap={None: MANIFEST_NS})
+        for file in archive.files:
+            etree.SubElement(manifest, '{{{}}}content'.format(MANIFEST_NS), location=file.filename,
+                             format=file.format.spec_url if file.format else '',
+                             master='true' if file is archive.master_file else 'false')
+        if has_metadata:
+            etree.SubElement(manifest, '{{{}}}content'.format(MANIFEST_NS), location=METADATA_FILENAME,
+                             format=METADATA_FORMAT, master='false')
+        return etree.tostring(manifest, xml_declaration=True, encoding='UTF-8', pretty_print=True)
+
+    def _gen_metadata(self, archive):
+        """ Generate the OMEX metadata of an archive and its files
+
+        Args:
+            archive (:obj:`Archive`): description of archive
+
+        Returns:
+            :obj:`bytes`: OMEX metadata in RDF format
+        """
+        rdf = etree.Element('{{{}}}RDF'.format(RDF_NS), nsmap={'rdf': RDF_NS, 'dcterms': DCTERMS_NS, 'vCard': VCARD_NS})
+        for obj, filename in [(archive, '.')] + [(file, file.filename) for file in archive.files]:
+            if self._has_metadata(obj):
+                self._gen_description(obj, filename, rdf)
+        return etree.tostring(rdf, xml_declaration=True, encoding='UTF-8', pretty_print=True)
+
+    def _gen_description(self, obj, filename, rdf):
+        """ Generate the OMEX metadata about an archive or a file in an archive
+
+        Args:
+            obj (:obj:`Archive` or :obj:`ArchiveFile`): archive or file in an archive
+            filename (:obj:`str`): path of object with archive
+            rdf (:obj:`etree._Element`): RDF element to add the metadata to
+        """
+        desc = etree.SubElement(rdf, '{{{}}}Description'.format(RDF_NS))
+        desc.set('{{{}}}about'.format(RDF_NS), filename)
+
+        if obj.description:
+            etree.SubElement(desc, '{{{}}}description'.format(DCTERMS_NS)).text = obj.description
+
+        for name, date in (('modified', obj.updated), ('created', obj.created)):
+            if date:
+                date_elem = etree.SubElement(desc, '{{{}}}{}'.format(DCTERMS_NS, name))
+                date_elem.set('{{{}}}parseType'.format(RDF_NS), 'Resource')
+                etree.SubElement(date_elem, '{{{}}}W3CDTF'.format(DCTERMS_NS)).text = date.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        for author in obj.authors:
+            creator = etree.SubElement(desc, '{{{}}}creator'.format(DCTERMS_NS))
+            creator.set('{{{}}}parseType'.format(RDF_NS), 'Resource')
+            name = etree.SubElement(creator, '{{{}}}hasName'.format(VCARD_NS))
+            name.set('{{{}}}parseType'.format(RDF_NS), 'Resource')
+            if author.last_name:
+                etree.SubElement(name, '{{{}}}family-name'.format(VCARD_NS)).text = author.last_name
+            if author.first_name:
+                etree.SubElement(name, '{{{}}}given-name'.format(VCARD_NS)).text = author.first_name
+
+
+class ZipfileCombineArchiveReader(ArchiveReader):
+    """ Reader for COMBINE/OMEX archives which only extracts the requested files of archives
+
+    Archives are read with :obj:`ZipfileCombineArchive`, which reads their manifests and metadata from
+    their zip files without extracting their other files. The archives are described the same as by
+    :obj:`CombineArchiveReader`.
+    """
+
+    def run(self, in_file, out_dir, filenames=None):
+        """ Read an archive from a file
+
+        Args:
+            in_file (:obj:`str`): path to archive
+            out_dir (:obj:`str`): directory to extract the files of the archive to
+            filenames (:obj:`list` of :obj:`str`, optional): paths of the files to extract within the archive
+                (e.g., ``./model.xml``); if :obj:`None`, extract all of the files of the archive
+
+        Returns:
+            :obj:`Archive`: description of archive
+
+        Raises:
+            :obj:`ArchiveIoError`: archive is invalid
+        """
+        with ZipfileCombineArchive(in_file) as archive_zip:
+            archive_zip.extract(out_dir, filenames=filenames)
+            return archive_zip.archive
+
+
+class ZipfileCombineArchive(object):
+    """ COMBINE/OMEX archive which is opened for random access to its files
+
+    Opening an archive only reads the central directory of its zip file, its manifest, and its OMEX
+    metadata. The other files of the archive can then be streamed from the zip file (:obj:`open`), read
+    into memory (:obj:`read`), or extracted (:obj:`extract`) on demand. Files which are stored without
+    compression are streamed directly from the zip file.
+
+    Attributes:
+        filename (:obj:`str`): path to the archive
+        archive (:obj:`Archive`): description of archive
+        _zip_file (:obj:`zipfile.ZipFile`): zip file of the archive
+    """
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename (:obj:`str`): path to the archive
+
+        Raises:
+            :obj:`ArchiveIoError`: archive is invalid
+        """
+        self.filename = filename
+        try:
+            self._zip_file = zipfile.ZipFile(filename, 'r')
+        except (OSError, zipfile.BadZipFile):
+            raise ArchiveIoError("Invalid COMBINE archive")
+
+        try:
+            self.archive = self._read_archive()
+        except Exception:
+            self._zip_file.close()
+            raise
+
+    def open(self, filename):
+        """ Open a file of the archive
+
+        Args:
+            filename (:obj:`str`): path of the file within the archive (e.g., ``./model.xml``)
+
+        Returns:
+            :obj:`zipfile.ZipExtFile`: binary file-like object from which to read the file
+
+        Raises:
+            :obj:`KeyError`: the archive doesn't contain the file
+        """
+        return self._zip_file.open(ZipfileCombineArchiveWriter._get_arcname(filename), 'r')
+
+    def read(self, filename):
+        """ Read a file of the archive into memory
+
+        Args:
+            filename (:obj:`str`): path of the file within the archive (e.g., ``./model.xml``)
+
+        Returns:
+            :obj:`bytes`: contents of the file
+
+        Raises:
+            :obj:`KeyError`: the archive doesn't contain the file
+        """
+        return self._zip_file.read(ZipfileCombineArchiveWriter._get_arcname(filename))
+
+    def extract(self, out_dir, filenames=None):
+        """ Extract files of the archive
+
+        Args:
+            out_dir (:obj:`str`): directory to extract the files to
+            filenames (:obj:`list` of :obj:`str`, optional): paths of the files to extract within the archive
+                (e.g., ``./model.xml``); if :obj:`None`, extract all of the files of the zip file of the archive,
+                including its manifest and metadata
+
+        Raises:
+            :obj:`KeyError`: the archive doesn't contain a file
+        """
+        if filenames is None:
+            self._zip_file.extractall(out_dir)
+        else:
+            for filename in filenames:
+                self._zip_file.extract(ZipfileCombineArchiveWriter._get_arcname(filename), out_dir)
+
+    def close(self):
+        """ Close the zip file of the archive """
+        self._zip_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _read_archive(self):
+        """ Read the manifest and metadata of the archive
+
+        Returns:
+            :obj:`Archive`: description of archive
+
+        Raises:
+            :obj:`ArchiveIoError`: archive is invalid
+        """
+        try:
+            manifest = etree.fromstring(self._zip_file.read(MANIFEST_FILENAME))
+        except (KeyError, etree.XMLSyntaxError):
+            raise ArchiveIoError("Invalid COMBINE archive")
+
+        # read the manifest
+        contents = []
+        for content in manifest.iterfind('{{{}}}content'.format(MANIFEST_NS)):
+            contents.append((content.get('location', ''), content.get('format', ''), content.get('master', '') in ['true', '1']))
+
+        # read the metadata; like libCOMBINE, metadata files which can't be parsed are treated as other files, and
+        # the last description of each object within a metadata file takes precedence over the preceding descriptions,
+        # whereas the descriptions in the first metadata file take precedence over those in the following files
+        location_to_desc = {}
+        metadata_locations = set()
+        for location, format, _ in contents:
+            if format == METADATA_FORMAT:
+                try:
+                    rdf = etree.fromstring(self._zip_file.read(ZipfileCombineArchiveWriter._get_arcname(location)))
+                except (KeyError, etree.XMLSyntaxError):
+                    continue
+                metadata_locations.add(location)
+
+                file_location_to_desc = {}
+                for desc in rdf.iterfind('{{{}}}Description'.format(RDF_NS)):
+                    file_location_to_desc[desc.get('{{{}}}about'.format(RDF_NS), '')] = desc
+                for desc_location, desc in file_location_to_desc.items():
+                    location_to_desc.setdefault(desc_location, desc)
+
+        # instantiate archive
+        archive = Archive(format=ArchiveFormat.combine.value)
+        self._read_metadata(location_to_desc.get('.', None), archive)
+
+        # read files
+        for location, format, master in contents:
+            if location == '.' or location in metadata_locations:
+                continue
+
+            file = ArchiveFile(
+                filename=location,
+                format=get_format_by_spec_url(format) if format else None,
+            )
+            self._read_metadata(location_to_desc.get(location, None), file)
+            archive.files.append(file)
+
+            if master and archive.master_file is None:
+                archive.master_file = file
+
+        return archive
+
+    def _read_metadata(self, desc, obj):
+        """ Read metadata about an archive or a file in an archive
+
+        Args:
+            desc (:obj:`etree._Element`): ``rdf:Description`` element for the object, or :obj:`None`
+            obj (:obj:`Archive` of :obj:`ArchiveFile`): object to add metadata to
+        """
+        if desc is None:
+            return
+
+        description = ''.join(''.join(elem.itertext()) for elem in desc.iterfind('{{{}}}description'.format(DCTERMS_NS)))
+
+        # creators are either direct children of ``dcterms:creator`` or items of containers (e.g., ``rdf:Bag``), and
+        # their names are described either by ``vCard:hasName`` or ``vCard:n`` elements
+        authors = []
+        for creator in desc.iterfind('{{{}}}creator'.format(DCTERMS_NS)):
+            items = creator.findall('{{{0}}}*/{{{0}}}li'.format(RDF_NS)) or [creator]
+            for item in items:
+                name = item.find('{{{}}}hasName'.format(VCARD_NS))
+                if name is None:
+                    name = item.find('{{{}}}n'.format(VCARD_NS))
+                if name is None:
+                    continue
+                first_name = name.findtext('{{{}}}given-name'.format(VCARD_NS)) or None
+                last_name = name.findtext('{{{}}}family-name'.format(VCARD_NS)) or None
+                if first_name or last_name:
+                    authors.append(Person(first_name=first_name, last_name=last_name))
+
+        created = None
+        for date in desc.iterfind('{{{0}}}created/{{{0}}}W3CDTF'.format(DCTERMS_NS)):
+            created = self._parse_date(date.text)
+
+        updated = None
+        has_updated = False
+        for date in desc.iterfind('{{{0}}}modified/{{{0}}}W3CDTF'.format(DCTERMS_NS)):
+            has_updated = True
+            date = self._parse_date(date.text)
+            if date and (updated is None or date > updated):
+                updated = date
+
+        # like libCOMBINE, ignore descriptions which don't have descriptions, creators, or modification dates
+        if not description and not authors and not has_updated:
+            return
+
+        obj.description = description or None
+        obj.authors.extend(authors)
+        obj.created = created
+        obj.updated = updated
+
+    @staticmethod
+    def _parse_date(date):
+        """ Parse a date, normalized to seconds and to UTC if it doesn't have a time zone, the same as by libCOMBINE
+
+        Args:
+            date (:obj:`str`): date in W3C date time format
+
+        Returns:
+            :obj:`datetime.datetime`: date, or :obj:`None` if the date couldn't be parsed or the date is the
+                date which libCOMBINE uses for dates which aren't set
+        """
+        match = W3CDTF_PATTERN.fullmatch((date or '').strip())
+        if not match:
+            return None
+        year, month, day, hour, minute, second, time_zone = match.groups()
+        date = '{}-{}-{}T{}:{}:{}{}'.format(year, month, day, hour or '00', minute or '00', second or '00', time_zone or 'Z')
+        if date == CombineArchiveReader.NONE_DATETIME:
+            return None
+        return dateutil.parser.parse(date)
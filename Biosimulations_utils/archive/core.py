@@ -16,13 +16,15 @@ __all__ = ['ArchiveWriter', 'ArchiveReader', 'ArchiveIoError', 'ArchiveIoWarning
 class ArchiveWriter(abc.ABC):
     """ Writer for archives """
     @abc.abstractmethod
-    def run(archive, in_dir, out_file):
+    def run(archive, in_dir, out_file, contents=None):
         """ Write an archive to a file
 
         Args:
             archive (:obj:`Archive`): description of archive
             in_dir (:obj:`str`): directory which contains the files in the archive
             out_file (:obj:`str`): path to save archive
+            contents (:obj:`dict`, optional): dictionary that maps the names of files in the archive to their
+                contents; these files are added from memory rather than from :obj:`in_dir`
         """
         pass  # pragma: no cover
 
@@ -14,13 +14,12 @@ from ..simulation.data_model import Simulation  # noqa: F401
 from ..visualization.data_model import Visualization  # noqa: F401
 import datetime
 import dateutil.tz
+import io
 try:
     import docker
 except ModuleNotFoundError:
     pass
 import os
-import tempfile
-import shutil
 
 __all__ = ['gen_archive_for_sim', 'exec_archive']
 
@@ -41,17 +40,13 @@ def gen_archive_for_sim(model_filename, simulation, archive_filename, simulation
     # get reference to model
     model = simulation.model
 
-    # create temporary directory for the contents of the archive
-    tmp_dir = tempfile.mkdtemp()
-
-    # copy model to the temporary directory
+    # name of the model in the archive
     model_archive_filename = '{}.{}'.format(os.path.splitext(model.file.name)[0], model.format.extension)
-    shutil.copyfile(model_filename, os.path.join(tmp_dir, model_archive_filename))
 
-    # save simulation to the temporary directory
+    # write simulation to memory
     sim_archive_filename = '{}.{}'.format(simulation.id, simulation.format.extension)
-    write_simulation(simulation, os.path.join(tmp_dir, sim_archive_filename),
-                     visualization=visualization, **(simulation_format_opts or {}))
+    sim_file = io.StringIO()
+    write_simulation(simulation, sim_file, visualization=visualization, **(simulation_format_opts or {}))
 
     # create archive
     archive = Archive(
@@ -77,11 +72,13 @@ def gen_archive_for_sim(model_filename, simulation, archive_filename, simulation
     archive.master_file = archive.files[1]
     archive.created = archive.updated = datetime.datetime.utcnow().replace(microsecond=0).replace(tzinfo=dateutil.tz.UTC)
 
-    # save archive to a file
-    write_archive(archive, tmp_dir, archive_filename, format=ArchiveFormat.combine)
-
-    # remove temporary directory
-    shutil.rmtree(tmp_dir)
+    # save archive to a file, streaming the model and simulation directly into the archive
+    with open(model_filename, 'rb') as model_file:
+        write_archive(archive, None, archive_filename, format=ArchiveFormat.combine, engine='zipfile',
+                      contents={
+                          archive.files[0].filename: model_file,
+                          archive.files[1].filename: sim_file.getvalue(),
+                      })
 
     # return archive
     return archive
@@ -6,27 +6,175 @@
 :License: MIT
 """
 
-from .data_model import BiomodelFormat
+from ..parse_cache import get_parse_cache
+from ..utils import read_source
+from .core import BiomodelIoError
+from .data_model import Biomodel, BiomodelFormat
 from .sbml import SbmlBiomodelReader
+from .sbml_lxml import LxmlSbmlBiomodelReader
+import concurrent.futures
+import os
 
-__all__ = ['read_biomodel']
+__all__ = ['read_biomodel', 'read_biomodels']
 
 
-def read_biomodel(filename, format):
-    """ Read a model from a file
+def read_biomodel(filename, format, engine='libsbml', cache=None, rebuild_cache=False, stats=None, profile='full'):
+    """ Read a model from a file, or from its contents in memory
 
     Args:
-        filename (:obj:`str`): path to a file which defines a model
+        filename (:obj:`str`, :obj:`bytes`, or file-like object): path to a file which defines a model, the contents
+            of the file (e.g., a model downloaded from a repository), or a file-like object from which to read the model
         format (:obj:`BiomodelFormat`): model format
+        engine (:obj:`str`, optional): engine for reading SBML-encoded models
+
+            * ``libsbml``: read the model with libSBML
+            * ``lxml``: stream the model with lxml, which requires less memory, and fall back
+              to libSBML for models which use constructs which the lxml reader doesn't support
+
+        cache (:obj:`bool` or :obj:`ParseCache`, optional): if :obj:`True`, get the model from the process-wide
+            parse cache if it has already been read, or save it to the cache; if a :obj:`ParseCache`, use that
+            cache; if :obj:`None` or :obj:`False`, bypass the cache
+        rebuild_cache (:obj:`bool`, optional): if :obj:`True`, read the model even if it is in the cache and
+            replace the cached model
+        stats (:obj:`BiomodelReaderStats`, optional): collector for the time spent in each phase of reading the
+            model and the numbers of elements read (e.g., species, reactions, rules, units formatted, taxa resolved)
+        profile (:obj:`str`, optional): profile which determines which parts of the model are read
+
+            * ``full``: read the entire model
+            * ``metadata_only``: read the format and metadata of the model, without resolving its taxon or
+              reading its units, parameters, or variables
+            * ``parameters_only``: read the format, metadata, and parameters of the model, without resolving its
+              taxon or reading its variables
 
     Returns:
         :obj:`dict`: model
 
     Raises:
-        :obj:`NotImplementedError`: the format is not supported
+        :obj:`NotImplementedError`: the format, engine, or profile is not supported
     """
     if format == BiomodelFormat.sbml:
-        Reader = SbmlBiomodelReader
+        if engine == 'libsbml':
+            Reader = SbmlBiomodelReader
+        elif engine == 'lxml':
+            Reader = LxmlSbmlBiomodelReader
+        else:
+            raise NotImplementedError("Engine {} is not supported".format(engine))
     else:
         raise NotImplementedError("Model format {} is not supported".format(format.name))
-    return Reader().run(filename)
+    if profile not in Reader.PROFILES:
+        raise NotImplementedError("Profile {} is not supported".format(profile))
+
+    filename = read_source(filename)
+    if not cache:
+        return Reader().run(filename, stats=stats, profile=profile)
+
+    if cache is True:
+        cache = get_parse_cache()
+    key = cache.get_key(filename, type='biomodel', format=format.name, engine=engine, profile=profile)
+    if key is not None and not rebuild_cache:
+        val = cache.get(key)
+        if val is not None:
+            if stats is not None:
+                stats.count('parse_cache_hits')
+            model = Biomodel.from_json(val)
+            _set_model_file(model, filename)
+            return model
+
+    model = Reader().run(filename, stats=stats, profile=profile)
+    if key is not None:
+        cache.set(key, model.to_json())
+    return model
+
+
+def _set_model_file(model, filename):
+    """ Set the name and size of the file of a model read from the parse cache to those of the file which was read,
+    because entries are keyed on the contents of files rather than on their paths
+
+    Args:
+        model (:obj:`Biomodel`): model
+        filename (:obj:`str` or :obj:`bytes`): path to the file which defines the model, or the contents of the file
+    """
+    if model.file is None:
+        return
+    if isinstance(filename, bytes):
+        model.file.name = None
+        model.file.size = len(filename)
+    else:
+        model.file.name = os.path.basename(filename)
+        model.file.size = os.path.getsize(filename)
+
+
+def read_biomodels(filenames, format, engine='libsbml', workers=None, ordered=True, cache=None, rebuild_cache=False,
+                   profile='full'):
+    """ Read multiple models from files, optionally in parallel with a pool of processes
+
+    Because libSBML objects can't be pickled, the workers return the JSON representations
+    of the models, which are then converted back to :obj:`Biomodel` objects.
+
+    Args:
+        filenames (:obj:`list` of :obj:`str`): paths to files which define models
+        format (:obj:`BiomodelFormat`): model format
+        engine (:obj:`str`, optional): engine for reading SBML-encoded models (see :obj:`read_biomodel`)
+        workers (:obj:`int`, optional): number of processes to read the models with; if :obj:`None` or 1,
+            the models are read sequentially in the current process
+        ordered (:obj:`bool`, optional): if :obj:`True`, yield the models in the order of :obj:`filenames`;
+            otherwise, yield the models as they are read
+        cache (:obj:`bool` or :obj:`ParseCache`, optional): parse cache (see :obj:`read_biomodel`)
+        rebuild_cache (:obj:`bool`, optional): if :obj:`True`, read the models even if they are in the cache
+        profile (:obj:`str`, optional): profile which determines which parts of the models are read
+            (see :obj:`read_biomodel`)
+
+    Yields:
+        :obj:`tuple`:
+
+            * :obj:`str`: path to the file which defines the model
+            * :obj:`Biomodel`: model, or :obj:`None` if the model couldn't be read
+            * :obj:`Exception`: :obj:`BiomodelIoError` or :obj:`ValueError` raised while reading the model,
+              or :obj:`None` if the model was read
+    """
+    if not workers or workers == 1:
+        for filename in filenames:
+            try:
+                model = read_biomodel(filename, format, engine=engine, cache=cache, rebuild_cache=rebuild_cache, profile=profile)
+                yield (filename, model, None)
+            except (BiomodelIoError, ValueError) as exception:
+                yield (filename, None, exception)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_biomodel_to_json, filename, format, engine, cache, rebuild_cache, profile)
+                   for filename in filenames]
+        if not ordered:
+            futures = concurrent.futures.as_completed(futures)
+
+        for future in futures:
+            filename, model, exception = future.result()
+            if model is not None:
+                model = Biomodel.from_json(model)
+            yield (filename, model, exception)
+
+
+def _read_biomodel_to_json(filename, format, engine, cache, rebuild_cache, profile='full'):
+    """ Read a model from a file into its JSON representation so that it can be returned from a worker process
+
+    Args:
+        filename (:obj:`str`): path to a file which defines a model
+        format (:obj:`BiomodelFormat`): model format
+        engine (:obj:`str`): engine for reading SBML-encoded models
+        cache (:obj:`bool` or :obj:`ParseCache`): parse cache
+        rebuild_cache (:obj:`bool`): if :obj:`True`, read the model even if it is in the cache
+        profile (:obj:`str`, optional): profile which determines which parts of the model are read
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: path to the file which defines the model
+            * :obj:`dict`: JSON representation of the model, or :obj:`None` if the model couldn't be read
+            * :obj:`Exception`: :obj:`BiomodelIoError` or :obj:`ValueError` raised while reading the model,
+              or :obj:`None` if the model was read
+    """
+    try:
+        model = read_biomodel(filename, format, engine=engine, cache=cache, rebuild_cache=rebuild_cache, profile=profile)
+        return (filename, model.to_json(), None)
+    except (BiomodelIoError, ValueError) as exception:
+        return (filename, None, exception)
@@ -8,39 +8,85 @@
 
 from ..data_model import Format  # noqa: F401
 from .data_model import Biomodel, BiomodelParameter, BiomodelVariable  # noqa: F401
+from ..utils import get_source_name, read_source
 import abc
+import collections
+import contextlib
+import time
 
-__all__ = ['BiomodelReader', 'BiomodelIoError', 'BiomodelIoWarning']
+__all__ = ['BiomodelReader', 'BiomodelReaderStats', 'BiomodelIoError', 'BiomodelIoWarning']
 
 
 class BiomodelReader(abc.ABC):
     """ Read information about models
 
+    Models can be read with profiles which skip the phases of reading models that some callers don't need
+
+    * ``full``: read the metadata, taxon, units, parameters, and variables of the model
+    * ``metadata_only``: read the format and metadata (e.g., id, name, modeling framework) of the model, without
+      resolving its taxon or formatting its units
+    * ``parameters_only``: read the format, metadata, and parameters of the model, without resolving its taxon
+
     Attributes:
-        _filename (:obj:`str`): path to a file which defines a model
+        stats (:obj:`BiomodelReaderStats`): statistics about the reading of the last model
+        _filename (:obj:`str`): path to a file which defines a model, or a placeholder for models read from memory
     """
 
+    # dictionary that maps the names of profiles to the optional phases that they read
+    PROFILES = {
+        'full': ('taxon', 'units', 'parameters', 'variables'),
+        'metadata_only': (),
+        'parameters_only': ('units', 'parameters'),
+    }
+
     def __init__(self):
+        self.stats = BiomodelReaderStats()
         self._filename = None
 
-    def run(self, filename):
+    def run(self, filename, stats=None, profile='full'):
         """ Read a model from a file
 
         Args:
-            filename (:obj:`str`): path to a file which defines a model
+            filename (:obj:`str`, :obj:`bytes`, or file-like object): path to a file which defines a model, the
+                contents of the file, or a file-like object from which to read the model
+            stats (:obj:`BiomodelReaderStats`, optional): collector for the time spent in each phase of
+                reading the model and the numbers of elements read; if :obj:`None`, a new collector is
+                created and saved to :obj:`stats`. Phases skipped by the profile aren't timed.
+            profile (:obj:`str`, optional): profile which determines which phases of reading the model
+                are executed (see :obj:`PROFILES`)
 
         Returns:
             :obj:`Biomodel`: model
+
+        Raises:
+            :obj:`NotImplementedError`: the profile is not supported
         """
-        self._filename = filename
+        phases = self.PROFILES.get(profile, None)
+        if phases is None:
+            raise NotImplementedError("Profile {} is not supported".format(profile))
+
+        filename = read_source(filename)
+        self._filename = get_source_name(filename)
+        self.stats = stats = stats if stats is not None else BiomodelReaderStats()
 
         model = Biomodel()
-        model_orig = self._read_from_file(filename, model)
-        self._read_format(model_orig, model)
-        self._read_metadata(model_orig, model)
-        units = self._read_units(model_orig, model)
-        self._read_parameters(model_orig, model, units)
-        self._read_variables(model_orig, model, units)
+        with stats.time('read_from_file'):
+            model_orig = self._read_from_file(filename, model)
+        with stats.time('read_format'):
+            self._read_format(model_orig, model)
+        with stats.time('read_metadata'):
+            self._read_metadata(model_orig, model)
+            if 'taxon' in phases:
+                self._read_taxon(model_orig, model)
+        if 'units' in phases:
+            with stats.time('read_units'):
+                units = self._read_units(model_orig, model)
+        if 'parameters' in phases:
+            with stats.time('read_parameters'):
+                self._read_parameters(model_orig, model, units)
+        if 'variables' in phases:
+            with stats.time('read_variables'):
+                self._read_variables(model_orig, model, units)
 
         return model
 
@@ -49,7 +95,7 @@ class BiomodelReader(abc.ABC):
         """ Read a model from a file
 
         Args:
-            filename (:obj:`str`): path to a file which defines a model
+            filename (:obj:`str` or :obj:`bytes`): path to a file which defines a model, or the contents of the file
             model (:obj:`Biomodel`): model
 
         Returns:
@@ -83,6 +129,19 @@ class BiomodelReader(abc.ABC):
         """
         pass  # pragma: no cover
 
+    @abc.abstractmethod
+    def _read_taxon(self, model_orig, model):
+        """ Read the taxon of a model
+
+        Args:
+            model_orig (:obj:`object`): original model encoded in a format such as SBML
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`Taxon`: taxon of the model, or :obj:`None` if the taxon of the model can't be resolved
+        """
+        pass  # pragma: no cover
+
     @abc.abstractmethod
     def _read_units(self, model_orig, model):
         """ Read the units of a model
@@ -123,6 +182,76 @@ class BiomodelReader(abc.ABC):
         pass  # pragma: no cover
 
 
+class BiomodelReaderStats(object):
+    """ Collector for the wall time spent in each phase of reading models and for counts of the elements read
+
+    Custom collectors (e.g., which forward measurements to a monitoring system) can be implemented by
+    overriding :obj:`add_time` and :obj:`count`.
+
+    Attributes:
+        times (:obj:`collections.OrderedDict`): dictionary that maps the names of phases to their wall times (s)
+        counts (:obj:`collections.Counter`): dictionary that maps the names of counters (e.g., ``species``,
+            ``reactions``, ``rules``, ``units_formatted``, ``taxa_resolved``) to their values
+    """
+
+    def __init__(self):
+        self.times = collections.OrderedDict()
+        self.counts = collections.Counter()
+
+    @contextlib.contextmanager
+    def time(self, phase):
+        """ Measure the wall time of a phase
+
+        Args:
+            phase (:obj:`str`): name of the phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase, duration):
+        """ Add to the wall time of a phase
+
+        Args:
+            phase (:obj:`str`): name of the phase
+            duration (:obj:`float`): wall time (s)
+        """
+        self.times[phase] = self.times.get(phase, 0.) + duration
+
+    def count(self, name, n=1):
+        """ Increment a counter
+
+        Args:
+            name (:obj:`str`): name of the counter
+            n (:obj:`int`, optional): increment
+        """
+        self.counts[name] += n
+
+    def replay(self, collector):
+        """ Add the times and counts of this collector to another collector
+
+        Args:
+            collector (:obj:`BiomodelReaderStats`): collector
+        """
+        for phase, duration in self.times.items():
+            collector.add_time(phase, duration)
+        for name, n in self.counts.items():
+            collector.count(name, n)
+
+    def to_json(self):
+        """ Export to JSON
+
+        Returns:
+            :obj:`dict`
+        """
+        return {
+            'times': dict(self.times),
+            'counts': dict(self.counts),
+        }
+
+
 class BiomodelIoError(Exception):
     """ Model IO error """
     pass
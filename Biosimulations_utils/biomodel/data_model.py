@@ -10,6 +10,8 @@ from ..data_model import Format, Identifier, JournalReference, License, Ontology
 import enum
 import datetime  # noqa: F401
 import dateutil.parser
+import numpy
+import sys
 import wc_utils.util.enumerate
 
 __all__ = [
@@ -17,7 +19,10 @@ __all__ = [
     'BiomodelFormat',
     'Biomodel',
     'BiomodelParameter',
+    'BiomodelParameterTable',
     'BiomodelVariable',
+    'XPathTarget',
+    'calc_recommended_param_ranges',
 ]
 
 
@@ -313,12 +318,101 @@ class Biomodel(object):
             updated=dateutil.parser.parse(val.get('updated')) if val.get('updated', None) else None,
         )
 
+    def get_parameter_table(self, zero_fold=None, non_zero_fold=None):
+        """ Get a columnar view of the parameters of the model
+
+        Args:
+            zero_fold (:obj:`float`, optional): if set, recalculate the recommended ranges of the numeric parameters
+                with this maximum for parameters whose default values are zero
+            non_zero_fold (:obj:`float`, optional): if set, recalculate the recommended ranges of the numeric parameters
+                with this multiplicative factor for parameters whose default values are non-zero
+
+        Returns:
+            :obj:`BiomodelParameterTable`: columnar view of the parameters
+        """
+        return BiomodelParameterTable.from_parameters(self.parameters, zero_fold=zero_fold, non_zero_fold=non_zero_fold)
+
+
+class XPathTarget(object):
+    """ Compact representation of an XPath to an element or attribute of a model
+
+    A target is represented by a template for its XPath with ``{}`` placeholders for the ids of
+    the elements along the path (e.g., ``/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='{}']``)
+    and the ids which fill the placeholders. Templates are interned so that all targets of the same
+    kind of element share a single copy of their common path. The XPath is only rendered when it is
+    needed (e.g., when the target is exported to JSON).
+
+    Targets are equal to, and hash the same as, other targets and strings with the same XPath, so that
+    targets can be compared with, and used interchangeably as dictionary keys with, targets read from
+    JSON or SED-ML documents.
+
+    Attributes:
+        template (:obj:`str`): interned template for the XPath
+        ids (:obj:`tuple` of :obj:`str`): ids which fill the placeholders of the template
+        _hash (:obj:`int`): hash of the XPath
+    """
+
+    __slots__ = ('template', 'ids', '_hash')
+
+    def __init__(self, template, *ids):
+        """
+        Args:
+            template (:obj:`str`): template for the XPath
+            *ids (:obj:`str`): ids which fill the placeholders of the template
+        """
+        self.template = sys.intern(template)
+        self.ids = ids
+        self._hash = None
+
+    def __str__(self):
+        """ Get the XPath of the target
+
+        Returns:
+            :obj:`str`: XPath
+        """
+        return self.template.format(*self.ids)
+
+    def __repr__(self):
+        """ Get a string representation of the target
+
+        Returns:
+            :obj:`str`
+        """
+        return '{}({!r})'.format(self.__class__.__name__, str(self))
+
+    def __eq__(self, other):
+        """ Determine if a target has the same XPath as another target or a string
+
+        Args:
+            other (:obj:`XPathTarget` or :obj:`str`): other target
+
+        Returns:
+            :obj:`bool`
+        """
+        if isinstance(other, XPathTarget):
+            if self.template is other.template:
+                return self.ids == other.ids
+            return str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        """ Get the hash of the XPath of the target
+
+        Returns:
+            :obj:`int`
+        """
+        if self._hash is None:
+            self._hash = hash(str(self))
+        return self._hash
+
 
 class BiomodelParameter(object):
     """ A parameter of a model
 
     Attributes:
-        target (:obj:`str`): address within the model (e.g., XML path)
+        target (:obj:`XPathTarget` or :obj:`str`): address within the model (e.g., XML path)
         group (:obj:`str`): Name of the group that the parameter belongs to (e.g., 'Initial species amounts/concentrations').
             Used to organize the display of parameters in the BioSimulations user interface.
         id (:obj:`str`): id
@@ -335,7 +429,7 @@ class BiomodelParameter(object):
                  identifiers=None, type=None, value=None, recommended_range=None, units=None):
         """
         Args:
-            target (:obj:`str`, optional): address within the model (e.g., XML path)
+            target (:obj:`XPathTarget` or :obj:`str`, optional): address within the model (e.g., XML path)
             group (:obj:`str`, optional): Name of the group that the parameter belongs to (e.g., 'Initial species amounts/concentrations').
                 Used to organize the display of parameters in the BioSimulations user interface.
             id (:obj:`str`, optional): id
@@ -386,7 +480,7 @@ class BiomodelParameter(object):
             :obj:`dict`
         """
         return {
-            'target': self.target,
+            'target': str(self.target) if self.target is not None else None,
             'group': self.group,
             'id': self.id,
             'name': self.name,
@@ -438,7 +532,7 @@ class BiomodelVariable(object):
     """ A variable of a model
 
     Attributes:
-        target (:obj:`str`): address within the model (e.g., XML path)
+        target (:obj:`XPathTarget` or :obj:`str`): address within the model (e.g., XML path)
         group (:obj:`str`): Name of the group that the variable belongs to (e.g., 'Species amounts/concentrations').
             Used to organize the display of variable in the BioSimulations user interface.
         id (:obj:`str`): id
@@ -453,7 +547,7 @@ class BiomodelVariable(object):
                  identifiers=None, type=None, units=None):
         """
         Args:
-            target (:obj:`str`, optional): address within the model (e.g., XML path)
+            target (:obj:`XPathTarget` or :obj:`str`, optional): address within the model (e.g., XML path)
             group (:obj:`str`): Name of the group that the variable belongs to (e.g., 'Species amounts/concentrations').
             Used to organize the display of variable in the BioSimulations user interface.
             id (:obj:`str`, optional): id
@@ -498,7 +592,7 @@ class BiomodelVariable(object):
             :obj:`dict`
         """
         return {
-            'target': self.target,
+            'target': str(self.target) if self.target is not None else None,
             'group': self.group,
             'id': self.id,
             'name': self.name,
@@ -540,3 +634,148 @@ class BiomodelVariable(object):
             :obj:`str`
         """
         return variable.id
+
+
+class BiomodelParameterTable(object):
+    """ Columnar view of the parameters of a model
+
+    Each column is an array which is aligned with the parameters of the model, so that parameters can be filtered
+    and sampled in bulk (e.g., ``table[table.types == table.TYPES.index(Type.float)]``). Values and recommended
+    bounds of parameters which aren't numeric or which aren't set are :obj:`numpy.nan`.
+
+    Attributes:
+        ids (:obj:`numpy.ndarray` of :obj:`str`): ids
+        targets (:obj:`numpy.ndarray` of :obj:`XPathTarget` or :obj:`str`): addresses within the model (e.g., XML paths)
+        types (:obj:`numpy.ndarray` of :obj:`int`): types, encoded as indices into :obj:`TYPES`, or -1 if not set
+        values (:obj:`numpy.ndarray` of :obj:`float`): default values
+        recommended_mins (:obj:`numpy.ndarray` of :obj:`float`): minimum recommended values
+        recommended_maxs (:obj:`numpy.ndarray` of :obj:`float`): maximum recommended values
+    """
+
+    TYPES = tuple(Type)
+
+    def __init__(self, ids, targets, types, values, recommended_mins, recommended_maxs):
+        """
+        Args:
+            ids (:obj:`numpy.ndarray` of :obj:`str`): ids
+            targets (:obj:`numpy.ndarray` of :obj:`XPathTarget` or :obj:`str`): addresses within the model (e.g., XML paths)
+            types (:obj:`numpy.ndarray` of :obj:`int`): types, encoded as indices into :obj:`TYPES`, or -1 if not set
+            values (:obj:`numpy.ndarray` of :obj:`float`): default values
+            recommended_mins (:obj:`numpy.ndarray` of :obj:`float`): minimum recommended values
+            recommended_maxs (:obj:`numpy.ndarray` of :obj:`float`): maximum recommended values
+        """
+        self.ids = ids
+        self.targets = targets
+        self.types = types
+        self.values = values
+        self.recommended_mins = recommended_mins
+        self.recommended_maxs = recommended_maxs
+
+    def __len__(self):
+        """ Get the number of parameters
+
+        Returns:
+            :obj:`int`
+        """
+        return self.ids.shape[0]
+
+    def __getitem__(self, key):
+        """ Get a subset of the parameters
+
+        Args:
+            key (:obj:`slice`, :obj:`numpy.ndarray` of :obj:`bool`, or :obj:`numpy.ndarray` of :obj:`int`): slice,
+                mask, or indices of the parameters
+
+        Returns:
+            :obj:`BiomodelParameterTable`: subset of the parameters
+        """
+        return self.__class__(
+            ids=self.ids[key],
+            targets=self.targets[key],
+            types=self.types[key],
+            values=self.values[key],
+            recommended_mins=self.recommended_mins[key],
+            recommended_maxs=self.recommended_maxs[key],
+        )
+
+    @classmethod
+    def from_parameters(cls, parameters, zero_fold=None, non_zero_fold=None):
+        """ Create a columnar view of parameters
+
+        Args:
+            parameters (:obj:`list` of :obj:`BiomodelParameter`): parameters
+            zero_fold (:obj:`float`, optional): if set, recalculate the recommended ranges of the numeric parameters
+                with this maximum for parameters whose default values are zero
+            non_zero_fold (:obj:`float`, optional): if set, recalculate the recommended ranges of the numeric parameters
+                with this multiplicative factor for parameters whose default values are non-zero
+
+        Returns:
+            :obj:`BiomodelParameterTable`: columnar view of the parameters
+        """
+        parameters = list(parameters)
+        n_params = len(parameters)
+
+        ids = numpy.empty(n_params, dtype=object)
+        targets = numpy.empty(n_params, dtype=object)
+        types = numpy.full(n_params, -1, dtype=numpy.int8)
+        values = numpy.full(n_params, numpy.nan)
+        recommended_mins = numpy.full(n_params, numpy.nan)
+        recommended_maxs = numpy.full(n_params, numpy.nan)
+
+        type_codes = {type: i_type for i_type, type in enumerate(cls.TYPES)}
+        for i_param, param in enumerate(parameters):
+            ids[i_param] = param.id
+            targets[i_param] = param.target
+            if param.type is not None:
+                types[i_param] = type_codes[Type(param.type)]
+            if cls._is_number(param.value):
+                values[i_param] = param.value
+            if param.recommended_range and all(cls._is_number(bound) for bound in param.recommended_range):
+                recommended_mins[i_param], recommended_maxs[i_param] = param.recommended_range
+
+        if zero_fold is not None or non_zero_fold is not None:
+            numeric = numpy.isin(types, [type_codes[Type.integer], type_codes[Type.float]]) & ~numpy.isnan(values)
+            mins, maxs = calc_recommended_param_ranges(
+                values[numeric],
+                zero_fold=10. if zero_fold is None else zero_fold,
+                non_zero_fold=10. if non_zero_fold is None else non_zero_fold)
+            recommended_mins[numeric] = mins
+            recommended_maxs[numeric] = maxs
+
+        return cls(ids=ids, targets=targets, types=types, values=values,
+                   recommended_mins=recommended_mins, recommended_maxs=recommended_maxs)
+
+    @staticmethod
+    def _is_number(value):
+        """ Determine if a value is a number
+
+        Args:
+            value (:obj:`object`): value
+
+        Returns:
+            :obj:`bool`
+        """
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def calc_recommended_param_ranges(values, zero_fold=10., non_zero_fold=10.):
+    """ Calculate recommended ranges for the values of parameters
+
+    Args:
+        values (:obj:`numpy.ndarray` of :obj:`float`): default values, :math:`d`
+        zero_fold (:obj:`float`, optional): maximum recommended value for parameters whose default values are zero,
+            producing the recommended range :math:`0 - f_0`
+        non_zero_fold (:obj:`float`, optional): Multiplicative factor, :math:`f`, for the recommended minimum and maximum
+            values relative to the default values, producing the recommend ranges :math:`d / f - d * f`
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`numpy.ndarray` of :obj:`float`: recommended minimum values
+            * :obj:`numpy.ndarray` of :obj:`float`: recommended maximum values
+    """
+    values = numpy.asarray(values, dtype=numpy.float64)
+    zero = values == 0
+    mins = numpy.where(zero, 0., values * non_zero_fold ** -1)
+    maxs = numpy.where(zero, zero_fold, values * non_zero_fold)
+    return mins, maxs
@@ -7,11 +7,13 @@
 """
 
 from ..data_model import Format, OntologyTerm, RemoteFile, Taxon, Type  # noqa: F401
+from ..taxonomy import get_taxonomy_resolver
 from ..utils import pretty_print_units, crop_image, get_logger
 from .core import BiomodelReader, BiomodelIoError
-from .data_model import Biomodel, BiomodelParameter, BiomodelVariable, BiomodelingFramework, BiomodelFormat  # noqa: F401
+from .data_model import (Biomodel, BiomodelParameter, BiomodelVariable, BiomodelingFramework, BiomodelFormat,  # noqa: F401
+                         XPathTarget, calc_recommended_param_ranges)
+import collections
 import copy
-import ete3
 import libsbml
 import logging
 import os
@@ -20,7 +22,26 @@ import requests
 import requests.exceptions
 import requests_cache.core  # noqa: F401
 
-__all__ = ['SbmlBiomodelReader', 'visualize_biomodel']
+__all__ = ['SbmlBiomodelReader', 'SbmlUnitDefCache', 'unit_def_cache', 'read_constant_from_math', 'visualize_biomodel']
+
+# templates for the XPaths of the parameters and variables of SBML-encoded models
+COMPARTMENT_TARGET = "/sbml:sbml/sbml:model/sbml:listOfCompartments/sbml:compartment[@id='{}']"
+COMPARTMENT_SIZE_TARGET = COMPARTMENT_TARGET + "/@size"
+SPECIES_TARGET = "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='{}']"
+SPECIES_INITIAL_TARGET = SPECIES_TARGET + "/@initial{}"
+PARAMETER_TARGET = "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='{}']"
+PARAMETER_VALUE_TARGET = PARAMETER_TARGET + "/@value"
+REACTION_TARGET = "/sbml:sbml/sbml:model/sbml:listOfReactions/{}:{}[@id='{}']"
+LOCAL_PARAMETER_VALUE_TARGET = REACTION_TARGET + "/sbml:kineticLaw/sbml:listOfLocalParameters/sbml:{}[@id='{}']/@value"
+KINETIC_LAW_PARAMETER_VALUE_TARGET = REACTION_TARGET + "/sbml:kineticLaw/sbml:listOfParameters/sbml:{}[@id='{}']/@value"
+INITIAL_ASSIGNMENT_VALUE_TARGET = ("/sbml:sbml/sbml:model/sbml:listOfInitialAssignments"
+                                   "/sbml:initialAssignment[@symbol='{}']/mathml:math/mathml:cn/text")
+ASSIGNMENT_RULE_VALUE_TARGET = ("/sbml:sbml/sbml:model/sbml:listOfRules"
+                                "/sbml:assignmentRule[@variable='{}']/mathml:math/mathml:cn/text")
+OBJECTIVE_TARGET = "/sbml:sbml/sbml:model/fbc:listOfObjectives/fbc:objective[@fbc:id='{}']"
+FLUX_OBJECTIVE_COEFFICIENT_TARGET = OBJECTIVE_TARGET + "/fbc:listOfFluxObjectives/fbc:fluxObjective[@fbc:reaction='{}']/@fbc:coefficient"
+QUALITATIVE_SPECIES_TARGET = "/sbml:sbml/sbml:model/qual:listOfQualitativeSpecies/qual:qualitativeSpecies[@qual:id='{}']"
+QUALITATIVE_SPECIES_INITIAL_LEVEL_TARGET = QUALITATIVE_SPECIES_TARGET + "/@qual:initialLevel"
 
 
 class XmlName(object):
@@ -41,22 +62,338 @@ class XmlName(object):
         self.name = name
 
 
+class SbmlAssignment(object):
+    """ Classification of a scalar rule or an initial assignment of an SBML-encoded model
+
+    Attributes:
+        sbml (:obj:`libsbml.Rule` or :obj:`libsbml.InitialAssignment`): rule or initial assignment
+        target_id (:obj:`str`): id of the variable of the rule or the symbol of the initial assignment
+        target_sbml (:obj:`libsbml.SBase`): variable of the rule or symbol of the initial assignment
+        type (:obj:`Type`): type of the value of the rule or initial assignment, or :obj:`None` if the
+            mathematical expression of the rule or initial assignment isn't a literal number
+        value (:obj:`int` or :obj:`float`): value of the rule or initial assignment, or :obj:`None` if the
+            mathematical expression of the rule or initial assignment isn't a literal number
+    """
+
+    def __init__(self, sbml, target_id, target_sbml, type, value):
+        """
+        Args:
+            sbml (:obj:`libsbml.Rule` or :obj:`libsbml.InitialAssignment`): rule or initial assignment
+            target_id (:obj:`str`): id of the variable of the rule or the symbol of the initial assignment
+            target_sbml (:obj:`libsbml.SBase`): variable of the rule or symbol of the initial assignment
+            type (:obj:`Type`): type of the value of the rule or initial assignment
+            value (:obj:`int` or :obj:`float`): value of the rule or initial assignment
+        """
+        self.sbml = sbml
+        self.target_id = target_id
+        self.target_sbml = target_sbml
+        self.type = type
+        self.value = value
+
+
+class SbmlModelIndex(object):
+    """ Index of the elements of an SBML-encoded model by their ids
+
+    The rules and initial assignments are only indexed and classified when they are first accessed
+    because classifying them requires reading their mathematical expressions, which readers of only
+    the metadata of models don't need.
+
+    Attributes:
+        model_sbml (:obj:`libsbml.Model`): SBML-encoded model
+        compartments (:obj:`dict`): dictionary that maps the ids of compartments to compartments
+        species (:obj:`dict`): dictionary that maps the ids of species to species
+        reactions (:obj:`dict`): dictionary that maps the ids of reactions to reactions
+        parameters (:obj:`dict`): dictionary that maps the ids of global parameters to parameters
+        rules (:obj:`dict`): dictionary that maps the ids of the variables of scalar rules to rules
+        initial_assignments (:obj:`dict`): dictionary that maps the ids of the symbols of initial assignments
+            to initial assignments
+        scalar_rule_assignments (:obj:`list` of :obj:`SbmlAssignment`): classifications of the scalar rules
+        initial_assignment_assignments (:obj:`list` of :obj:`SbmlAssignment`): classifications of the initial
+            assignments
+    """
+
+    def __init__(self, model_sbml):
+        """
+        Args:
+            model_sbml (:obj:`libsbml.Model`): SBML-encoded model
+        """
+        self.model_sbml = model_sbml
+        self.compartments = self._index_by_id(model_sbml.getListOfCompartments())
+        self.species = self._index_by_id(model_sbml.getListOfSpecies())
+        self.reactions = self._index_by_id(model_sbml.getListOfReactions())
+        self.parameters = self._index_by_id(model_sbml.getListOfParameters())
+        self._rules = None
+        self._scalar_rule_assignments = None
+        self._initial_assignments = None
+        self._initial_assignment_assignments = None
+
+    @property
+    def rules(self):
+        """ Get the rules
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of the variables of scalar rules to rules
+        """
+        if self._rules is None:
+            self._index_rules()
+        return self._rules
+
+    @property
+    def scalar_rule_assignments(self):
+        """ Get the classifications of the scalar rules
+
+        Returns:
+            :obj:`list` of :obj:`SbmlAssignment`: classifications of the scalar rules
+        """
+        if self._scalar_rule_assignments is None:
+            self._index_rules()
+        return self._scalar_rule_assignments
+
+    @property
+    def initial_assignments(self):
+        """ Get the initial assignments
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of the symbols of initial assignments to initial assignments
+        """
+        if self._initial_assignments is None:
+            self._index_initial_assignments()
+        return self._initial_assignments
+
+    @property
+    def initial_assignment_assignments(self):
+        """ Get the classifications of the initial assignments
+
+        Returns:
+            :obj:`list` of :obj:`SbmlAssignment`: classifications of the initial assignments
+        """
+        if self._initial_assignment_assignments is None:
+            self._index_initial_assignments()
+        return self._initial_assignment_assignments
+
+    def _index_rules(self):
+        """ Index and classify the scalar rules in a single pass so that readers of parameters and variables
+        don't have to read their variables or mathematical expressions again
+        """
+        self._rules = {}
+        self._scalar_rule_assignments = []
+        for rule_sbml in self.model_sbml.getListOfRules():
+            if rule_sbml.isScalar():
+                var_id = rule_sbml.getVariable()
+                self._rules.setdefault(var_id, rule_sbml)
+                self._scalar_rule_assignments.append(self._classify_assignment(rule_sbml, var_id))
+
+    def _index_initial_assignments(self):
+        """ Index and classify the initial assignments in a single pass so that readers of parameters and
+        variables don't have to read their symbols or mathematical expressions again
+        """
+        self._initial_assignments = {}
+        self._initial_assignment_assignments = []
+        for init_assignment_sbml in self.model_sbml.getListOfInitialAssignments():
+            symbol_id = init_assignment_sbml.getSymbol()
+            self._initial_assignments.setdefault(symbol_id, init_assignment_sbml)
+            self._initial_assignment_assignments.append(self._classify_assignment(init_assignment_sbml, symbol_id))
+
+    def _classify_assignment(self, assignment_sbml, target_id):
+        """ Classify a scalar rule or an initial assignment
+
+        Args:
+            assignment_sbml (:obj:`libsbml.Rule` or :obj:`libsbml.InitialAssignment`): rule or initial assignment
+            target_id (:obj:`str`): id of the variable of the rule or the symbol of the initial assignment
+
+        Returns:
+            :obj:`SbmlAssignment`: classification of the rule or initial assignment
+        """
+        type, value = read_constant_from_math(assignment_sbml.getMath())
+        return SbmlAssignment(assignment_sbml, target_id, self.get_element(target_id), type, value)
+
+    @staticmethod
+    def _index_by_id(elements_sbml):
+        """ Index a list of SBML elements by their ids
+
+        Args:
+            elements_sbml (:obj:`libsbml.ListOf`): list of SBML elements
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of the elements to the elements
+        """
+        index = {}
+        for element_sbml in elements_sbml:
+            index.setdefault(element_sbml.getId(), element_sbml)
+        return index
+
+    def get_element(self, id):
+        """ Get an element by its id
+
+        Compartments, species, reactions, and global parameters are resolved from the index. Other elements
+        (e.g., species references) are resolved with :obj:`libsbml.Model.getElementBySId`, which scans the
+        entire model.
+
+        Args:
+            id (:obj:`str`): id
+
+        Returns:
+            :obj:`libsbml.SBase`: element
+        """
+        for index in (self.compartments, self.species, self.parameters, self.reactions):
+            element_sbml = index.get(id, None)
+            if element_sbml is not None:
+                return element_sbml
+        return self.model_sbml.getElementBySId(id)
+
+
+class SbmlUnitDefCache(object):
+    """ Bounded LRU cache of the human-readable representations of unit definitions
+
+    Unit definitions are keyed by their canonical signatures (kinds, exponents, scales,
+    and multipliers of their units) rather than their ids so that the formatting of
+    equivalent units can be shared across elements and models.
+
+    Attributes:
+        maxsize (:obj:`int`): maximum number of unit definitions to cache
+        hits (:obj:`int`): number of lookups which were found in the cache
+        misses (:obj:`int`): number of lookups which were not found in the cache
+        _entries (:obj:`collections.OrderedDict`): dictionary that maps signatures of unit
+            definitions to tuples of their representations by :obj:`libsbml.UnitDefinition.printUnits`
+            and their human-readable representations
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Args:
+            maxsize (:obj:`int`, optional): maximum number of unit definitions to cache
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    @staticmethod
+    def get_signature(unit_def_sbml):
+        """ Get the canonical signature of a unit definition
+
+        Args:
+            unit_def_sbml (:obj:`libsbml.UnitDefinition`): unit definition
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units of the unit definition
+        """
+        signature = []
+        for i_unit in range(unit_def_sbml.getNumUnits()):
+            unit_sbml = unit_def_sbml.getUnit(i_unit)
+            signature.append((unit_sbml.getKind(), unit_sbml.getExponentAsDouble(),
+                              unit_sbml.getScale(), unit_sbml.getMultiplier()))
+        return tuple(signature)
+
+    @staticmethod
+    def get_unit_def(signature):
+        """ Create a unit definition from its canonical signature
+
+        Args:
+            signature (:obj:`tuple`): kinds, exponents, scales, and multipliers of the units of the unit definition
+
+        Returns:
+            :obj:`libsbml.UnitDefinition`: unit definition
+        """
+        unit_def_sbml = libsbml.UnitDefinition(3, 1)
+        for kind, exponent, scale, multiplier in signature:
+            unit_sbml = unit_def_sbml.createUnit()
+            unit_sbml.setKind(kind)
+            unit_sbml.setExponent(exponent)
+            unit_sbml.setScale(scale)
+            unit_sbml.setMultiplier(multiplier)
+        return unit_def_sbml
+
+    def format(self, unit_def_sbml):
+        """ Get the representation of a unit definition, using the cache if possible
+
+        Args:
+            unit_def_sbml (:obj:`libsbml.UnitDefinition`): unit definition
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`str`: representation of the unit definition by :obj:`libsbml.UnitDefinition.printUnits`
+                * :obj:`str`: human-readable representation of the unit definition
+        """
+        return self.format_signature(self.get_signature(unit_def_sbml), unit_def_sbml=unit_def_sbml)
+
+    def format_signature(self, signature, unit_def_sbml=None):
+        """ Get the representation of the unit definition with a canonical signature, using the cache if possible
+
+        Args:
+            signature (:obj:`tuple`): kinds, exponents, scales, and multipliers of the units of the unit definition
+            unit_def_sbml (:obj:`libsbml.UnitDefinition`, optional): unit definition; if :obj:`None`, a unit
+                definition is created from the signature when the signature isn't in the cache
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`str`: representation of the unit definition by :obj:`libsbml.UnitDefinition.printUnits`
+                * :obj:`str`: human-readable representation of the unit definition
+        """
+        entry = self._entries.get(signature, None)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(signature)
+            return entry
+
+        self.misses += 1
+        if unit_def_sbml is None:
+            unit_def_sbml = self.get_unit_def(signature)
+        unit_def_str = unit_def_sbml.printUnits(unit_def_sbml, True)
+        if unit_def_str == 'indeterminable':
+            entry = (unit_def_str, None)
+        else:
+            entry = (unit_def_str, pretty_print_units(unit_def_str.replace(', ', ' * ')))
+
+        self._entries[signature] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get_info(self):
+        """ Get statistics about the cache
+
+        Returns:
+            :obj:`dict`: numbers of hits and misses, the maximum size, and the current size of the cache
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.maxsize,
+            'size': len(self._entries),
+        }
+
+    def clear(self):
+        """ Clear the cache and reset its statistics """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+unit_def_cache = SbmlUnitDefCache()
+
+
 class SbmlBiomodelReader(BiomodelReader):
     """ Read information about SBML-encoded models
 
     Attributes:
         _logger (:obj:`logging.Logger`): logger
+        _index (:obj:`SbmlModelIndex`): index of the elements of the model by their ids
     """
 
     def __init__(self):
         super(SbmlBiomodelReader, self).__init__()
         self._logger = get_logger('sbml')
+        self._index = None
 
     def _read_from_file(self, filename, model):
         """ Read a SBML-encoded model from a file
 
         Args:
-            filename (:obj:`str`): path to a file which defines an SBML-encoded model
+            filename (:obj:`str` or :obj:`bytes`): path to a file which defines an SBML-encoded model, or the
+                contents of the file
 
         Returns:
             :obj:`libsbml.Model`: SBML-encoded model
@@ -64,14 +401,26 @@ class SbmlBiomodelReader(BiomodelReader):
         Raises:
             :obj:`ValueError`: file doesn't exist
         """
-        if not os.path.isfile(filename):
-            raise ValueError('{} does not exist'.format(filename))
-        model.file = RemoteFile(name=os.path.basename(filename), type='application/sbml+xml', size=os.path.getsize(filename))
         reader = libsbml.SBMLReader()
-        doc = reader.readSBMLFromFile(filename)
+        if isinstance(filename, bytes):
+            model.file = RemoteFile(type='application/sbml+xml', size=len(filename))
+            doc = reader.readSBMLFromString(filename.decode())
+        else:
+            if not os.path.isfile(filename):
+                raise ValueError('{} does not exist'.format(filename))
+            model.file = RemoteFile(name=os.path.basename(filename), type='application/sbml+xml', size=os.path.getsize(filename))
+            doc = reader.readSBMLFromFile(filename)
         model_sbml = doc.getModel()
         if not model_sbml:
-            raise ValueError('{} does not contain a valid model'.format(filename))
+            raise ValueError('{} does not contain a valid model'.format(self._filename))
+
+        # the index is built the first time it is needed because only some profiles need it
+        self._index = None
+
+        self.stats.count('species', model_sbml.getNumSpecies())
+        self.stats.count('reactions', model_sbml.getNumReactions())
+        self.stats.count('rules', model_sbml.getNumRules())
+
         return model_sbml
 
     def _read_format(self, model_sbml, model):
@@ -104,12 +453,6 @@ class SbmlBiomodelReader(BiomodelReader):
         model.id = model_sbml.getId() or None
         model.name = model_sbml.getName() or None
 
-        annot_xml = model_sbml.getAnnotation()
-        desc_xml = self._get_xml_child_by_names(annot_xml, [
-            XmlName('rdf', 'RDF'),
-            XmlName('rdf', 'Description'),
-        ])
-
         # modeling framework
         packages = set()
         for i_plugin in range(model_sbml.getNumPlugins()):
@@ -143,8 +486,22 @@ class SbmlBiomodelReader(BiomodelReader):
             framework = BiomodelingFramework.non_spatial_continuous
         model.framework = framework.value
 
-        # taxon
-        taxon_xml = self._get_xml_child_by_names(desc_xml, [
+        return model
+
+    def _read_taxon(self, model_sbml, model):
+        """ Read the taxon of a model
+
+        Args:
+            model_sbml (:obj:`libsbml.Model`): SBML-encoded model
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`Taxon`: taxon of the model, or :obj:`None` if the taxon of the model can't be resolved
+        """
+        annot_xml = model_sbml.getAnnotation()
+        taxon_xml = self._get_xml_child_by_names(annot_xml, [
+            XmlName('rdf', 'RDF'),
+            XmlName('rdf', 'Description'),
             XmlName('bqbiol', 'hasTaxon'),
             XmlName('rdf', 'Bag'),
             XmlName('rdf', 'li'),
@@ -155,15 +512,15 @@ class SbmlBiomodelReader(BiomodelReader):
             match = re.match(r'https?://identifiers.org/taxonomy/(\d+)', taxon_url)
             if match:
                 taxon_id = int(match.group(1))
-                ncbi_taxa = ete3.NCBITaxa()
-                taxon_name = ncbi_taxa.get_taxid_translator([taxon_id]).get(taxon_id, None)
+                taxon_name = get_taxonomy_resolver().get_name(taxon_id)
                 if taxon_name:
                     model.taxon = Taxon(
                         id=taxon_id,
                         name=taxon_name,
                     )
+                    self.stats.count('taxa_resolved')
 
-        return model
+        return model.taxon
 
     def _read_units(self, model_sbml, model):
         """ Read the units of a model
@@ -233,7 +590,7 @@ class SbmlBiomodelReader(BiomodelReader):
 
             value = comp_sbml.getSize()
             parameters[comp_id] = BiomodelParameter(
-                target="/sbml:sbml/sbml:model/sbml:listOfCompartments/sbml:compartment[@id='{}']/@size".format(comp_id),
+                target=XPathTarget(COMPARTMENT_SIZE_TARGET, comp_id),
                 group='Initial compartment sizes',
                 id="init_size_{}".format(comp_id),
                 name='Initial size of {}'.format(comp_name),
@@ -241,7 +598,6 @@ class SbmlBiomodelReader(BiomodelReader):
                 identifiers=[],
                 type=Type.float,
                 value=value,
-                recommended_range=self._calc_recommended_param_range(value),
                 units=self._format_unit_def(comp_sbml.getDerivedUnitDefinition()),
             )
 
@@ -278,13 +634,7 @@ class SbmlBiomodelReader(BiomodelReader):
                     species_initial_units = None
 
             parameters[species_id] = BiomodelParameter(
-                target='/' + '/'.join([
-                    "sbml:sbml",
-                    "sbml:model",
-                    "sbml:listOfSpecies",
-                    "sbml:species[@id='{}']".format(species_id),
-                    "@initial{}".format(species_initial_type),
-                ]),
+                target=XPathTarget(SPECIES_INITIAL_TARGET, species_id, species_initial_type),
                 group='Initial species amounts/concentrations',
                 id="init_{}_{}".format(species_initial_type.lower(), species_id),
                 name='Initial {} of {}'.format(species_initial_type.lower(), species_name),
@@ -292,70 +642,48 @@ class SbmlBiomodelReader(BiomodelReader):
                 identifiers=[],
                 type=Type.float,
                 value=species_initial_val,
-                recommended_range=self._calc_recommended_param_range(species_initial_val),
                 units=species_initial_units,
             )
 
-        # initial assignments
-        for init_assignment_sbml in model_sbml.getListOfInitialAssignments():
-            symbol_id = init_assignment_sbml.getSymbol()
-            symbol_sbml = model_sbml.getElementBySId(symbol_id)
+        index = self._get_index(model_sbml)
 
-            type, init_value = self._read_constant_from_math(init_assignment_sbml.getMath())
-            if not type:
+        # initial assignments
+        for assignment in index.initial_assignment_assignments:
+            if not assignment.type:
                 continue
 
+            symbol_id = assignment.target_id
+            symbol_sbml = assignment.target_sbml
             parameters["init_assignment_{}".format(symbol_id)] = BiomodelParameter(
-                target='/' + '/'.join([
-                    "sbml:sbml",
-                    "sbml:model",
-                    "sbml:listOfInitialAssignments",
-                    "sbml:initialAssignment[@symbol='{}']".format(symbol_id),
-                    "mathml:math",
-                    "mathml:cn",
-                    "text",
-                ]),
+                target=XPathTarget(INITIAL_ASSIGNMENT_VALUE_TARGET, symbol_id),
                 group='Initial assignments',
                 id="init_assignment_{}".format(symbol_id),
                 name='Initial assignment of {}'.format(symbol_sbml.getName() or symbol_id),
                 description=None,
                 identifiers=[],
-                type=type,
-                value=init_value,
-                recommended_range=self._calc_recommended_param_range(init_value),
+                type=assignment.type,
+                value=assignment.value,
                 units=self._format_unit_def(symbol_sbml.getDerivedUnitDefinition()),
             )
 
         # assignment rules
-        for rule_sbml in model_sbml.getListOfRules():
-            if rule_sbml.isScalar():
-                var_id = rule_sbml.getVariable()
-                var_sbml = model_sbml.getElementBySId(var_id)
-
-                type, value = self._read_constant_from_math(rule_sbml.getMath())
-                if not type:
-                    continue
+        for assignment in index.scalar_rule_assignments:
+            if not assignment.type:
+                continue
 
-                parameters["assignment_{}".format(var_id)] = BiomodelParameter(
-                    target='/' + '/'.join([
-                        "sbml:sbml",
-                        "sbml:model",
-                        "sbml:listOfRules",
-                        "sbml:assignmentRule[@variable='{}']".format(var_id),
-                        "mathml:math",
-                        "mathml:cn",
-                        "text",
-                    ]),
-                    group='Assignments',
-                    id="assignment_{}".format(var_id),
-                    name='Assignment of {}'.format(var_sbml.getName() or var_id),
-                    description=None,
-                    identifiers=[],
-                    type=type,
-                    value=value,
-                    recommended_range=self._calc_recommended_param_range(value),
-                    units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
-                )
+            var_id = assignment.target_id
+            var_sbml = assignment.target_sbml
+            parameters["assignment_{}".format(var_id)] = BiomodelParameter(
+                target=XPathTarget(ASSIGNMENT_RULE_VALUE_TARGET, var_id),
+                group='Assignments',
+                id="assignment_{}".format(var_id),
+                name='Assignment of {}'.format(var_sbml.getName() or var_id),
+                description=None,
+                identifiers=[],
+                type=assignment.type,
+                value=assignment.value,
+                units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
+            )
 
         # fbc package
         plugin_sbml = model_sbml.getPlugin('fbc')
@@ -371,15 +699,7 @@ class SbmlBiomodelReader(BiomodelReader):
                 rxn_name = rxn_sbml.getName() or rxn_id
                 value = flux_obj_sbml.getCoefficient()
                 parameters[species_id] = BiomodelParameter(
-                    target='/' + '/'.join([
-                        "sbml:sbml",
-                        "sbml:model",
-                        "fbc:listOfObjectives",
-                        "fbc:objective[@fbc:id='{}']".format(obj_id),
-                        "fbc:listOfFluxObjectives",
-                        "fbc:fluxObjective[@fbc:reaction='{}']".format(rxn_id),
-                        "@fbc:coefficient",
-                    ]),
+                    target=XPathTarget(FLUX_OBJECTIVE_COEFFICIENT_TARGET, obj_id, rxn_id),
                     group='Flux objective coefficients',
                     id="{}/{}".format(obj_id, rxn_id),
                     name='Coefficient of {} of {}'.format(obj_name, rxn_name),
@@ -387,7 +707,6 @@ class SbmlBiomodelReader(BiomodelReader):
                     identifiers=[],
                     type=Type.float,
                     value=value,
-                    recommended_range=self._calc_recommended_param_range(value),
                     units='dimensionless',
                 )
 
@@ -403,13 +722,7 @@ class SbmlBiomodelReader(BiomodelReader):
                     max_level = max(1, init_level)
 
                 parameters[species_id] = BiomodelParameter(
-                    target='/' + '/'.join([
-                        "sbml:sbml",
-                        "sbml:model",
-                        "qual:listOfQualitativeSpecies",
-                        "qual:qualitativeSpecies[@qual:id='{}']".format(species_id),
-                        "@qual:initialLevel",
-                    ]),
+                    target=XPathTarget(QUALITATIVE_SPECIES_INITIAL_LEVEL_TARGET, species_id),
                     group='Initial species levels',
                     id='init_level_' + species_id,
                     name='Initial level of {}'.format(species_sbml.getName() or species_id),
@@ -422,16 +735,14 @@ class SbmlBiomodelReader(BiomodelReader):
                 )
 
         # ignore parameters set via assignment rules and initial assignments
-        for rule_sbml in model_sbml.getListOfRules():
-            if rule_sbml.isScalar():
-                param_id = rule_sbml.getVariable()
-                if param_id in parameters:
-                    parameters.pop(param_id)
+        for param_id in index.rules.keys():
+            parameters.pop(param_id, None)
+
+        for param_id in index.initial_assignments.keys():
+            parameters.pop(param_id, None)
 
-        for init_assign_sbml in model_sbml.getListOfInitialAssignments():
-            param_id = init_assign_sbml.getSymbol()
-            if param_id in parameters:
-                parameters.pop(param_id)
+        # recommended ranges
+        self._set_recommended_param_ranges(parameters.values())
 
         # return parameters
         model.parameters = parameters.values()
@@ -465,44 +776,21 @@ class SbmlBiomodelReader(BiomodelReader):
             identifiers=[],
             type=Type.float,
             value=value,
-            recommended_range=self._calc_recommended_param_range(value),
             units=self._format_unit_def(param_sbml.getDerivedUnitDefinition()),
         )
 
         if rxn_sbml:
             if int(model.format.version[1]) >= 3:
-                target = [
-                    "sbml:sbml",
-                    "sbml:model",
-                    "sbml:listOfReactions",
-                    "{}:{}[@id='{}']".format(rxn_sbml.getPrefix() or 'sbml', rxn_sbml.getElementName(), rxn_id),
-                    "sbml:kineticLaw",
-                    "sbml:listOfLocalParameters",
-                    "sbml:{}[@id='{}']".format(param_sbml.getElementName(), param.id),
-                    "@value",
-                ]
+                template = LOCAL_PARAMETER_VALUE_TARGET
             else:
-                target = [
-                    "sbml:sbml",
-                    "sbml:model",
-                    "sbml:listOfReactions",
-                    "{}:{}[@id='{}']".format(rxn_sbml.getPrefix() or 'sbml', rxn_sbml.getElementName(), rxn_id),
-                    "sbml:kineticLaw",
-                    "sbml:listOfParameters",
-                    "sbml:{}[@id='{}']".format(param_sbml.getElementName(), param.id),
-                    "@value",
-                ]
+                template = KINETIC_LAW_PARAMETER_VALUE_TARGET
+            target = XPathTarget(template, rxn_sbml.getPrefix() or 'sbml', rxn_sbml.getElementName(), rxn_id,
+                                 param_sbml.getElementName(), param.id)
             group = '{} rate constants'.format(rxn_name or rxn_id)
         else:
-            target = [
-                "sbml:sbml",
-                "sbml:model",
-                "sbml:listOfParameters",
-                "sbml:parameter[@id='{}']".format(param.id),
-                "@value",
-            ]
+            target = XPathTarget(PARAMETER_VALUE_TARGET, param.id)
             group = 'Other global parameters'
-        param.target = '/' + '/'.join(target)
+        param.target = target
         param.group = group
 
         if rxn_id:
@@ -550,7 +838,7 @@ class SbmlBiomodelReader(BiomodelReader):
             assert obj_id
 
             vars.append(BiomodelVariable(
-                target="/sbml:sbml/sbml:model/fbc:listOfObjectives/fbc:objective[@fbc:id='{}']".format(obj_id),
+                target=XPathTarget(OBJECTIVE_TARGET, obj_id),
                 group='Objectives',
                 id=obj_id,
                 name=obj_sbml.getName() or obj_id,
@@ -564,8 +852,7 @@ class SbmlBiomodelReader(BiomodelReader):
             for rxn_sbml in model_sbml.getListOfReactions():
                 rxn_id = rxn_sbml.getId()
                 vars.append(BiomodelVariable(
-                    target="/sbml:sbml/sbml:model/sbml:listOfReactions/{}:{}[@id='{}']".format(
-                        rxn_sbml.getPrefix() or 'sbml', rxn_sbml.getElementName(), rxn_id),
+                    target=XPathTarget(REACTION_TARGET, rxn_sbml.getPrefix() or 'sbml', rxn_sbml.getElementName(), rxn_id),
                     group='Reaction fluxes',
                     id=rxn_id,
                     name=rxn_sbml.getName() or None,
@@ -581,38 +868,34 @@ class SbmlBiomodelReader(BiomodelReader):
                 vars.append(self._read_variable(model_sbml, species_sbml, model))
 
             # compartments, parameters set via assignment rules
-            for rule_sbml in model_sbml.getListOfRules():
-                type, _ = self._read_constant_from_math(rule_sbml.getMath())
-                if type:
+            for assignment in self._get_index(model_sbml).scalar_rule_assignments:
+                if assignment.type:
                     continue
 
-                if rule_sbml.isScalar():
-                    var_id = rule_sbml.getVariable()
-                    var_sbml = model_sbml.getElementBySId(var_id)
-                    if isinstance(var_sbml, libsbml.Parameter):
-                        vars.append(BiomodelVariable(
-                            target=("/sbml:sbml/sbml:model/sbml:listOfParameters"
-                                    "/sbml:parameter[@id='{}']").format(var_id),
-                            group='Other',
-                            id=var_id,
-                            name=var_sbml.getName() or None,
-                            description=None,
-                            identifiers=[],
-                            type=Type.float,
-                            units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
-                        ))
-                    elif isinstance(var_sbml, libsbml.Compartment):
-                        vars.append(BiomodelVariable(
-                            target=("/sbml:sbml/sbml:model/sbml:listOfCompartments"
-                                    "/sbml:compartment[@id='{}']").format(var_id),
-                            group='Compartment sizes',
-                            id=var_id,
-                            name=var_sbml.getName() or None,
-                            description=None,
-                            identifiers=[],
-                            type=Type.float,
-                            units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
-                        ))
+                var_id = assignment.target_id
+                var_sbml = assignment.target_sbml
+                if isinstance(var_sbml, libsbml.Parameter):
+                    vars.append(BiomodelVariable(
+                        target=XPathTarget(PARAMETER_TARGET, var_id),
+                        group='Other',
+                        id=var_id,
+                        name=var_sbml.getName() or None,
+                        description=None,
+                        identifiers=[],
+                        type=Type.float,
+                        units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
+                    ))
+                elif isinstance(var_sbml, libsbml.Compartment):
+                    vars.append(BiomodelVariable(
+                        target=XPathTarget(COMPARTMENT_TARGET, var_id),
+                        group='Compartment sizes',
+                        id=var_id,
+                        name=var_sbml.getName() or None,
+                        description=None,
+                        identifiers=[],
+                        type=Type.float,
+                        units=self._format_unit_def(var_sbml.getDerivedUnitDefinition()),
+                    ))
 
             # qualitative species of qual package
             qual_plugin = model_sbml.getPlugin('qual')
@@ -621,8 +904,7 @@ class SbmlBiomodelReader(BiomodelReader):
                     species_id = species_sbml.getId()
 
                     vars.append(BiomodelVariable(
-                        target=("/sbml:sbml/sbml:model/qual:listOfQualitativeSpecies"
-                                "/qual:qualitativeSpecies[@qual:id='{}']").format(species_id),
+                        target=XPathTarget(QUALITATIVE_SPECIES_TARGET, species_id),
                         group='Species levels',
                         id=species_id,
                         name=species_sbml.getName() or None,
@@ -652,7 +934,7 @@ class SbmlBiomodelReader(BiomodelReader):
         assert id
 
         var = BiomodelVariable(
-            target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='{}']".format(id),
+            target=XPathTarget(SPECIES_TARGET, id),
             group='Species amounts/concentrations',
             id=id,
             name=species_sbml.getName() or None,
@@ -664,32 +946,30 @@ class SbmlBiomodelReader(BiomodelReader):
 
         return var
 
-    def _read_constant_from_math(self, math_sbml):
-        """Read the constant value of a mathematical expression
+    def _get_index(self, model_sbml):
+        """ Get the index of the elements of a model, building it if the model hasn't been indexed
 
         Args:
-            math_sbml (:obj:`libsbml.ASTNode`): mathematical expression
+            model_sbml (:obj:`libsbml.Model`): SBML-encoded model
 
         Returns:
-            :obj:`tuple`:
+            :obj:`SbmlModelIndex`: index of the elements of the model
+        """
+        if self._index is None or self._index.model_sbml is not model_sbml:
+            self._index = SbmlModelIndex(model_sbml)
+        return self._index
 
-                * :obj:`Type`: type
-                * :obj:`int` or :obj:`float`: value
-        """
-        math_type = math_sbml.getType()
-        if math_type in [libsbml.AST_INTEGER]:
-            type = Type.integer
-            value = math_sbml.getInteger()
-            return (type, value)
-        elif math_type in [libsbml.AST_REAL, libsbml.AST_REAL_E]:
-            type = Type.float
-            value = math_sbml.getReal()
-            return (type, value)
-        elif math_type in [libsbml.AST_RATIONAL]:
-            # todo: support rational numbers
-            return (None, None)
-        else:
-            return (None, None)
+    def _get_element(self, model_sbml, id):
+        """ Get an element of a model by its id
+
+        Args:
+            model_sbml (:obj:`libsbml.Model`): SBML-encoded model
+            id (:obj:`str`): id
+
+        Returns:
+            :obj:`libsbml.SBase`: element
+        """
+        return self._get_index(model_sbml).get_element(id)
 
     def _get_compartment(self, model_sbml, comp_id):
         """ Get a compartment
@@ -701,9 +981,7 @@ class SbmlBiomodelReader(BiomodelReader):
         Returns:
             :obj:`libsbml.Compartment`: compartment
         """
-        for comp_sbml in model_sbml.getListOfCompartments():
-            if comp_sbml.getId() == comp_id:
-                return comp_sbml
+        return self._get_index(model_sbml).compartments.get(comp_id, None)
 
     def _get_reaction(self, model_sbml, rxn_id):
         """ Get a reaction
@@ -715,9 +993,7 @@ class SbmlBiomodelReader(BiomodelReader):
         Returns:
             :obj:`libsbml.Reaction`: reaction
         """
-        for rxn_sbml in model_sbml.getListOfReactions():
-            if rxn_sbml.getId() == rxn_id:
-                return rxn_sbml
+        return self._get_index(model_sbml).reactions.get(rxn_id, None)
 
     def _format_unit_def(self, unit_def_sbml):
         """ Get a human-readable representation of a unit definition
@@ -731,32 +1007,28 @@ class SbmlBiomodelReader(BiomodelReader):
         if not unit_def_sbml:
             return None
 
-        unit_def_str = unit_def_sbml.printUnits(unit_def_sbml, True)
+        unit_def_str, units = unit_def_cache.format(unit_def_sbml)
+        self.stats.count('units_formatted')
         if unit_def_str == 'indeterminable':
             self._logger.log(logging.ERROR, '{}: unit definition {} is invalid'.format(self._filename, unit_def_sbml.getId()))
             return None
 
-        return pretty_print_units(unit_def_str.replace(', ', ' * '))
+        return units
 
-    def _calc_recommended_param_range(self, value, zero_fold=10., non_zero_fold=10.):
-        """ Calculate a recommended range for the value of a parameter
+    def _set_recommended_param_ranges(self, parameters, zero_fold=10., non_zero_fold=10.):
+        """ Calculate recommended ranges for the values of the numeric parameters that don't have recommended ranges
 
         Args:
-            value (:obj:`float`): Default value
+            parameters (:obj:`list` of :obj:`BiomodelParameter`): parameters
+            zero_fold (:obj:`float`, optional): maximum recommended value for parameters whose default values are zero
             non_zero_fold (:obj:`float`, optional): Multiplicative factor, :math:`f`, for the recommended minimum and maximum
                 values relative to the default value, :math:`d`, producing the recommend range :math:`d / f - d * f`.
-
-        Returns:
-            :obj:`list` of :obj:`float`: recommended minimum and maximum values of the parameter
         """
-        if value == 0:
-            return [0., zero_fold]
-
-        else:
-            return [
-                value * non_zero_fold ** -1,
-                value * non_zero_fold,
-            ]
+        parameters = [param for param in parameters if param.recommended_range is None and param.value is not None]
+        mins, maxs = calc_recommended_param_ranges([param.value for param in parameters],
+                                                   zero_fold=zero_fold, non_zero_fold=non_zero_fold)
+        for param, min_value, max_value in zip(parameters, mins.tolist(), maxs.tolist()):
+            param.recommended_range = [min_value, max_value]
 
     @classmethod
     def _get_xml_child_by_names(cls, node, names):
@@ -815,6 +1087,34 @@ class SbmlBiomodelReader(BiomodelReader):
 MINERVA_ENDPOINT = 'https://minerva-dev.lcsb.uni.lu/minerva/api/convert/image/{}:{}'
 
 
+def read_constant_from_math(math_sbml):
+    """Read the constant value of a mathematical expression
+
+    Args:
+        math_sbml (:obj:`libsbml.ASTNode`): mathematical expression
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`Type`: type
+            * :obj:`int` or :obj:`float`: value
+    """
+    math_type = math_sbml.getType()
+    if math_type in [libsbml.AST_INTEGER]:
+        type = Type.integer
+        value = math_sbml.getInteger()
+        return (type, value)
+    elif math_type in [libsbml.AST_REAL, libsbml.AST_REAL_E]:
+        type = Type.float
+        value = math_sbml.getReal()
+        return (type, value)
+    elif math_type in [libsbml.AST_RATIONAL]:
+        # todo: support rational numbers
+        return (None, None)
+    else:
+        return (None, None)
+
+
 def visualize_biomodel(model_filename, img_filename, requests_session=None, remove_layouts=True, remove_units=True):
     """ Use `MINERVA <https://minerva.pages.uni.lu/>`_ to visualize a model and save the visualization to a PNG file.
 
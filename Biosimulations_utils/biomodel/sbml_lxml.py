@@ -0,0 +1,1030 @@
+""" Utilities for reading the parameters and variables of SBML-encoded models by streaming them with lxml
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-05
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from ..data_model import RemoteFile, Taxon, Type
+from ..taxonomy import get_taxonomy_resolver
+from ..utils import pretty_print_units, read_source
+from .core import BiomodelReaderStats
+from .data_model import BiomodelFormat, BiomodelingFramework, BiomodelParameter, BiomodelVariable, XPathTarget
+from .sbml import (SbmlBiomodelReader, XmlName, unit_def_cache,
+                   ASSIGNMENT_RULE_VALUE_TARGET, COMPARTMENT_SIZE_TARGET, COMPARTMENT_TARGET, INITIAL_ASSIGNMENT_VALUE_TARGET,
+                   KINETIC_LAW_PARAMETER_VALUE_TARGET, LOCAL_PARAMETER_VALUE_TARGET, PARAMETER_TARGET, PARAMETER_VALUE_TARGET,
+                   SPECIES_INITIAL_TARGET, SPECIES_TARGET)
+from lxml import etree
+import copy
+import io
+import libsbml
+import logging
+import math
+import os
+import re
+
+__all__ = ['LxmlSbmlBiomodelReader', 'LibsbmlRequiredError']
+
+MATHML_NS = 'http://www.w3.org/1998/Math/MathML'
+
+# SBML packages which don't affect the parameters or variables of models
+SUPPORTED_PACKAGES = ('comp', 'layout', 'render')
+
+# predefined units of SBML Level 2
+L2_PREDEFINED_UNITS = {
+    'substance': ((libsbml.UNIT_KIND_MOLE, 1., 0, 1.),),
+    'volume': ((libsbml.UNIT_KIND_LITRE, 1., 0, 1.),),
+    'area': ((libsbml.UNIT_KIND_METRE, 2., 0, 1.),),
+    'length': ((libsbml.UNIT_KIND_METRE, 1., 0, 1.),),
+    'time': ((libsbml.UNIT_KIND_SECOND, 1., 0, 1.),),
+}
+
+# MathML elements which are never constant numbers
+NON_CONSTANT_MATHML_ELEMENTS = ('ci', 'apply', 'piecewise', 'lambda', 'csymbol', 'true', 'false', 'pi', 'exponentiale')
+
+
+class LibsbmlRequiredError(Exception):
+    """ A model uses SBML constructs which can only be read with libSBML """
+    pass
+
+
+class LxmlSbmlModel(object):
+    """ Summary of the elements of an SBML-encoded model which are needed to read its parameters and variables
+
+    Attributes:
+        level (:obj:`int`): SBML level
+        version (:obj:`int`): SBML version
+        packages (:obj:`set` of :obj:`str`): names of the SBML packages used by the model
+        attrs (:obj:`dict`): attributes of the model
+        taxon_url (:obj:`str`): URL of the taxon of the model
+        unit_defs (:obj:`dict`): dictionary that maps the ids of unit definitions to their canonical signatures
+        compartments (:obj:`list` of :obj:`dict`): attributes of the compartments
+        species (:obj:`list` of :obj:`dict`): attributes of the species
+        parameters (:obj:`list` of :obj:`dict`): attributes of the global parameters
+        reactions (:obj:`list` of :obj:`dict`): ids, names, prefixes, and local parameters of the reactions
+            which have kinetic laws
+        initial_assignments (:obj:`list` of :obj:`tuple`): symbols and constant values of the initial assignments
+        rules (:obj:`list` of :obj:`tuple`): element names, variables, and constant values of the rules
+        _elements (:obj:`dict`): dictionary that maps the ids of compartments, species, and global parameters
+            to their types and attributes
+    """
+
+    def __init__(self):
+        self.level = None
+        self.version = None
+        self.packages = set()
+        self.attrs = {}
+        self.taxon_url = None
+        self.unit_defs = {}
+        self.compartments = []
+        self.species = []
+        self.parameters = []
+        self.reactions = []
+        self.initial_assignments = []
+        self.rules = []
+        self._elements = None
+
+    def get_element(self, id):
+        """ Get a compartment, species, or global parameter by its id
+
+        Args:
+            id (:obj:`str`): id
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`str`: type of the element (``compartment``, ``species``, or ``parameter``)
+                * :obj:`dict`: attributes of the element
+        """
+        if self._elements is None:
+            self._elements = {}
+            for type, elements in (('compartment', self.compartments), ('species', self.species), ('parameter', self.parameters)):
+                for attrs in elements:
+                    self._elements.setdefault(attrs.get('id', ''), (type, attrs))
+        return self._elements.get(id, (None, None))
+
+
+class LxmlSbmlBiomodelReader(SbmlBiomodelReader):
+    """ Read information about SBML-encoded models by streaming them with lxml
+
+    The reader doesn't construct a document object model. Rather, it streams the elements of a
+    model with :obj:`lxml.etree.iterparse`, keeps the small number of attributes needed to read
+    the parameters and variables of the model, and discards each element after it is read. This
+    keeps the memory required to read large models low.
+
+    The reader supports the core of SBML Level 2 and 3. Models which use constructs which the reader
+    doesn't support, such as the ``fbc``, ``multi``, and ``qual`` packages, are read with libSBML.
+    """
+
+    def run(self, filename, stats=None, profile='full'):
+        """ Read a model from a file, falling back to libSBML if the model uses constructs that aren't supported
+
+        Args:
+            filename (:obj:`str`, :obj:`bytes`, or file-like object): path to a file which defines a model, the
+                contents of the file, or a file-like object from which to read the model
+            stats (:obj:`BiomodelReaderStats`, optional): collector for the time spent in each phase of
+                reading the model and the numbers of elements read
+            profile (:obj:`str`, optional): profile which determines which phases of reading the model
+                are executed (see :obj:`BiomodelReader.PROFILES`)
+
+        Returns:
+            :obj:`Biomodel`: model
+
+        Raises:
+            :obj:`NotImplementedError`: the profile is not supported
+        """
+        if stats is None:
+            stats = BiomodelReaderStats()
+
+        # read file-like objects once so that their contents can be read again with libSBML
+        filename = read_source(filename)
+
+        # record the statistics of the attempt to read the model with lxml separately so that elements
+        # aren't counted twice if the model must be read with libSBML
+        lxml_stats = BiomodelReaderStats()
+        try:
+            model = super(LxmlSbmlBiomodelReader, self).run(filename, stats=lxml_stats, profile=profile)
+        except LibsbmlRequiredError as exception:
+            self._logger.log(logging.INFO, '{}: model was read with libSBML: {}'.format(self._filename, str(exception)))
+            stats.add_time('lxml_attempt', sum(lxml_stats.times.values()))
+            stats.count('libsbml_fallbacks')
+            self.stats = stats
+            return SbmlBiomodelReader().run(filename, stats=stats, profile=profile)
+
+        lxml_stats.replay(stats)
+        self.stats = stats
+        return model
+
+    def _read_from_file(self, filename, model):
+        """ Read the elements of an SBML-encoded model from a file
+
+        Args:
+            filename (:obj:`str` or :obj:`bytes`): path to a file which defines an SBML-encoded model, or the
+                contents of the file
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`LxmlSbmlModel`: summary of the elements of the model
+
+        Raises:
+            :obj:`ValueError`: file doesn't exist
+            :obj:`LibsbmlRequiredError`: if the model must be read with libSBML
+        """
+        if isinstance(filename, bytes):
+            model.file = RemoteFile(type='application/sbml+xml', size=len(filename))
+            filename = io.BytesIO(filename)
+        else:
+            if not os.path.isfile(filename):
+                raise ValueError('{} does not exist'.format(filename))
+            model.file = RemoteFile(name=os.path.basename(filename), type='application/sbml+xml', size=os.path.getsize(filename))
+
+        try:
+            model_lxml = self._stream_model(filename)
+        except etree.XMLSyntaxError as exception:
+            raise LibsbmlRequiredError('file is not valid XML: {}'.format(str(exception)))
+
+        self.stats.count('species', len(model_lxml.species))
+        self.stats.count('reactions', len(model_lxml.reactions))
+        self.stats.count('rules', len(model_lxml.rules))
+
+        return model_lxml
+
+    def _stream_model(self, filename):
+        """ Stream the elements of an SBML-encoded model from a file
+
+        Args:
+            filename (:obj:`str` or file-like object): path to a file which defines an SBML-encoded model, or a
+                binary file-like object
+
+        Returns:
+            :obj:`LxmlSbmlModel`: summary of the elements of the model
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the model must be read with libSBML
+        """
+        model_lxml = LxmlSbmlModel()
+        sbml_ns = None
+        model_elem = None
+        depth = 0
+        for event, elem in etree.iterparse(filename, events=('start', 'end'), huge_tree=True,
+                                           remove_comments=True, remove_pis=True):
+            if event == 'start':
+                if depth == 0:
+                    sbml_ns = self._read_sbml_elem(elem, model_lxml)
+                elif depth == 1 and elem.tag == '{{{}}}model'.format(sbml_ns):
+                    if model_elem is not None:
+                        raise LibsbmlRequiredError('document has multiple models')
+                    model_elem = elem
+                    model_lxml.attrs = dict(elem.attrib)
+                elif etree.QName(elem).localname in ['modelDefinition', 'externalModelDefinition', 'submodel'] \
+                        and 'comp' in model_lxml.packages:
+                    raise LibsbmlRequiredError('model uses the comp package')
+                depth += 1
+                continue
+
+            depth -= 1
+            parent = elem.getparent()
+            if depth == 3 and model_elem is not None and parent.getparent() is model_elem:
+                self._read_elem(elem, parent, sbml_ns, model_lxml)
+            elif depth == 2 and parent is model_elem and elem.tag == '{{{}}}annotation'.format(sbml_ns):
+                self._read_model_annotation(elem, model_lxml)
+
+            # discard elements once they have been read, except the children of annotations which are read at the ends
+            # of the annotations
+            if depth == 2 or (depth == 3 and etree.QName(parent).localname != 'annotation'):
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+        if model_elem is None:
+            raise LibsbmlRequiredError('document does not contain a model')
+
+        return model_lxml
+
+    def _read_sbml_elem(self, elem, model_lxml):
+        """ Read the level, version, and packages of an SBML document
+
+        Args:
+            elem (:obj:`etree._Element`): ``sbml`` element
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`str`: namespace of SBML core
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the document isn't SBML Level 2 or 3 or uses an unsupported package
+        """
+        qname = etree.QName(elem)
+        if qname.localname != 'sbml' or not (qname.namespace or '').startswith('http://www.sbml.org/sbml/level'):
+            raise LibsbmlRequiredError('document is not SBML')
+
+        model_lxml.level = self._parse_value(elem.get('level'), int)
+        model_lxml.version = self._parse_value(elem.get('version'), int)
+        if model_lxml.level not in [2, 3]:
+            raise LibsbmlRequiredError('SBML Level {} is not supported'.format(model_lxml.level))
+
+        if model_lxml.level == 3:
+            for ns in elem.nsmap.values():
+                match = re.match(r'^http://www\.sbml\.org/sbml/level3/version\d+/([^/]+)/version\d+$', ns)
+                if match:
+                    model_lxml.packages.add(match.group(1))
+
+        unsupported_packages = model_lxml.packages.difference(SUPPORTED_PACKAGES)
+        if unsupported_packages:
+            raise LibsbmlRequiredError('model uses the {} package(s)'.format(', '.join(sorted(unsupported_packages))))
+
+        return qname.namespace
+
+    def _read_elem(self, elem, list_elem, sbml_ns, model_lxml):
+        """ Read a child of a list of elements of a model (e.g., a species of the list of species)
+
+        Args:
+            elem (:obj:`etree._Element`): element
+            list_elem (:obj:`etree._Element`): parent list of the element
+            sbml_ns (:obj:`str`): namespace of SBML core
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the element must be read with libSBML
+        """
+        list_qname = etree.QName(list_elem)
+        qname = etree.QName(elem)
+        if list_qname.namespace != sbml_ns or qname.namespace != sbml_ns:
+            return
+
+        if list_qname.localname == 'listOfUnitDefinitions' and qname.localname == 'unitDefinition':
+            model_lxml.unit_defs.setdefault(elem.get('id', ''), self._read_unit_def(elem, sbml_ns, model_lxml))
+
+        elif list_qname.localname == 'listOfCompartments' and qname.localname == 'compartment':
+            model_lxml.compartments.append(dict(elem.attrib))
+
+        elif list_qname.localname == 'listOfSpecies' and qname.localname == 'species':
+            model_lxml.species.append(dict(elem.attrib))
+
+        elif list_qname.localname == 'listOfParameters' and qname.localname == 'parameter':
+            model_lxml.parameters.append(dict(elem.attrib))
+
+        elif list_qname.localname == 'listOfInitialAssignments' and qname.localname == 'initialAssignment':
+            model_lxml.initial_assignments.append((elem.get('symbol', ''), self._read_constant_from_math(elem)))
+
+        elif list_qname.localname == 'listOfRules' and qname.localname in ['assignmentRule', 'rateRule', 'algebraicRule']:
+            model_lxml.rules.append((qname.localname, elem.get('variable', ''), self._read_constant_from_math(elem)))
+
+        elif list_qname.localname == 'listOfReactions' and qname.localname == 'reaction':
+            kin_law_elem = elem.find('{{{}}}kineticLaw'.format(sbml_ns))
+            if kin_law_elem is None:
+                return
+
+            if model_lxml.level >= 3:
+                param_path = '{{{0}}}listOfLocalParameters/{{{0}}}localParameter'.format(sbml_ns)
+            else:
+                param_path = '{{{0}}}listOfParameters/{{{0}}}parameter'.format(sbml_ns)
+
+            model_lxml.reactions.append({
+                'id': elem.get('id', ''),
+                'name': elem.get('name', ''),
+                'prefix': elem.prefix or 'sbml',
+                'element_name': qname.localname,
+                'local_parameters': [
+                    (etree.QName(param_elem).localname, dict(param_elem.attrib))
+                    for param_elem in kin_law_elem.iterfind(param_path)
+                ],
+            })
+
+    def _read_unit_def(self, elem, sbml_ns, model_lxml):
+        """ Read the canonical signature of a unit definition
+
+        Args:
+            elem (:obj:`etree._Element`): ``unitDefinition`` element
+            sbml_ns (:obj:`str`): namespace of SBML core
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units of the unit definition
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the unit definition must be read with libSBML
+        """
+        signature = []
+        for unit_elem in elem.iterfind('{{{0}}}listOfUnits/{{{0}}}unit'.format(sbml_ns)):
+            if 'offset' in unit_elem.attrib:
+                raise LibsbmlRequiredError('units with offsets are not supported')
+            if model_lxml.level >= 3 and any(attr not in unit_elem.attrib for attr in ['exponent', 'scale', 'multiplier']):
+                raise LibsbmlRequiredError('unit definition {} is incomplete'.format(elem.get('id', '')))
+
+            signature.append((
+                self._get_unit_kind(unit_elem.get('kind', ''), model_lxml),
+                self._parse_value(unit_elem.get('exponent', '1'), float),
+                self._parse_value(unit_elem.get('scale', '0'), int),
+                self._parse_value(unit_elem.get('multiplier', '1'), float),
+            ))
+        return tuple(signature)
+
+    def _read_model_annotation(self, elem, model_lxml):
+        """ Read the taxon of a model from its annotation
+
+        Args:
+            elem (:obj:`etree._Element`): ``annotation`` element of the model
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the taxon of the model doesn't have a URL
+        """
+        taxon_elem = self._get_xml_child_by_names(elem, [
+            XmlName('rdf', 'RDF'),
+            XmlName('rdf', 'Description'),
+            XmlName('bqbiol', 'hasTaxon'),
+            XmlName('rdf', 'Bag'),
+            XmlName('rdf', 'li'),
+        ])
+        if taxon_elem is not None:
+            model_lxml.taxon_url = self._get_xml_attr_by_name(taxon_elem, XmlName('rdf', 'resource'))
+            if model_lxml.taxon_url is None:
+                raise LibsbmlRequiredError('taxon does not have a URL')
+
+    def _read_constant_from_math(self, elem):
+        """ Read the constant value of the mathematical expression of an element
+
+        Args:
+            elem (:obj:`etree._Element`): element which has a ``math`` child
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`Type`: type
+                * :obj:`int` or :obj:`float`: value
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the mathematical expression must be read with libSBML
+        """
+        math_elems = elem.findall('{{{}}}math'.format(MATHML_NS))
+        if len(math_elems) != 1:
+            raise LibsbmlRequiredError('element must have one mathematical expression')
+
+        nodes = list(math_elems[0])
+        if len(nodes) != 1 or etree.QName(nodes[0]).namespace != MATHML_NS:
+            raise LibsbmlRequiredError('mathematical expression must have one node')
+        node = nodes[0]
+        node_name = etree.QName(node).localname
+
+        if node_name in NON_CONSTANT_MATHML_ELEMENTS:
+            return (None, None)
+
+        if node_name != 'cn' or node.get('base', '10').strip() != '10':
+            raise LibsbmlRequiredError('{} MathML elements are not supported'.format(node_name))
+
+        node_type = node.get('type', 'real').strip()
+        children = list(node)
+        if node_type == 'integer' and not children:
+            return (Type.integer, self._parse_value(node.text, int))
+
+        elif node_type == 'real' and not children:
+            value = self._parse_value(node.text, float)
+            if math.isinf(value) or math.isnan(value):
+                raise LibsbmlRequiredError('non-finite numbers are not supported')
+            return (Type.float, value)
+
+        elif node_type == 'e-notation' and len(children) == 1 and etree.QName(children[0]).localname == 'sep':
+            mantissa = self._parse_value(node.text, float)
+            exponent = self._parse_value(children[0].tail, int)
+            return (Type.float, mantissa * math.pow(10., exponent))
+
+        elif node_type == 'rational':
+            # todo: support rational numbers
+            return (None, None)
+
+        else:
+            raise LibsbmlRequiredError('{} numbers are not supported'.format(node_type))
+
+    def _read_format(self, model_lxml, model):
+        """ Read the metadata of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`Format`: format of the model
+        """
+        model.format = copy.copy(BiomodelFormat.sbml.value)
+        model.format.version = 'L{}V{}'.format(model_lxml.level, model_lxml.version)
+        return model.format
+
+    def _read_metadata(self, model_lxml, model):
+        """ Read the metadata of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`Biomodel`: model with additional metadata
+        """
+        model.id = model_lxml.attrs.get('id', None) or None
+        model.name = model_lxml.attrs.get('name', None) or None
+
+        # modeling framework
+        model.framework = BiomodelingFramework.non_spatial_continuous.value
+
+        return model
+
+    def _read_taxon(self, model_lxml, model):
+        """ Read the taxon of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`Taxon`: taxon of the model, or :obj:`None` if the taxon of the model can't be resolved
+        """
+        model.taxon = None
+        if model_lxml.taxon_url:
+            match = re.match(r'https?://identifiers.org/taxonomy/(\d+)', model_lxml.taxon_url)
+            if match:
+                taxon_id = int(match.group(1))
+                taxon_name = get_taxonomy_resolver().get_name(taxon_id)
+                if taxon_name:
+                    model.taxon = Taxon(
+                        id=taxon_id,
+                        name=taxon_name,
+                    )
+                    self.stats.count('taxa_resolved')
+
+        return model.taxon
+
+    def _read_units(self, model_lxml, model):
+        """ Read the units of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of units to their definitions
+        """
+        # as with :obj:`SbmlBiomodelReader`, the units of unit definitions are undefined because libSBML
+        # doesn't derive the units of unit definitions
+        units = {}
+        for unit_def_id in model_lxml.unit_defs.keys():
+            units[unit_def_id] = None
+
+        return units
+
+    def _read_parameters(self, model_lxml, model, units):
+        """ Read information about the parameters of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+            units (:obj:`dict`): dictionary that maps the ids of units to their definitions
+
+        Returns:
+            :obj:`list` of :obj:`BiomodelParameter`: information about parameters
+
+        Raises:
+            :obj:`AssertionError`: if a compartment, species, or reaction doesn't have an id
+            :obj:`LibsbmlRequiredError`: if the parameters must be read with libSBML
+        """
+        parameters = {}
+
+        # global parameters
+        for param_attrs in model_lxml.parameters:
+            parameters[param_attrs.get('id', '')] = self._read_parameter(param_attrs, model_lxml, model)
+
+        # local parameters of reactions
+        for rxn in model_lxml.reactions:
+            rxn_id = rxn['id']
+            rxn_name = rxn['name'] or None
+
+            for param_element_name, param_attrs in rxn['local_parameters']:
+                assert rxn_id
+                parameters[(rxn_id, param_attrs.get('id', ''))] = self._read_parameter(
+                    param_attrs, model_lxml, model, rxn=rxn, param_element_name=param_element_name,
+                    rxn_id=rxn_id, rxn_name=rxn_name)
+
+        # compartment sizes
+        for comp_attrs in model_lxml.compartments:
+            # ignore compartments that don't have a set size
+            if 'size' not in comp_attrs:
+                continue
+
+            comp_id = comp_attrs.get('id', '')
+            assert comp_id
+            comp_name = comp_attrs.get('name', '') or comp_id
+
+            value = self._parse_value(comp_attrs['size'], float)
+            parameters[comp_id] = BiomodelParameter(
+                target=XPathTarget(COMPARTMENT_SIZE_TARGET, comp_id),
+                group='Initial compartment sizes',
+                id="init_size_{}".format(comp_id),
+                name='Initial size of {}'.format(comp_name),
+                description=None,
+                identifiers=[],
+                type=Type.float,
+                value=value,
+                units=self._format_units(self._get_compartment_units(comp_attrs, model_lxml)),
+            )
+
+        # initial amounts / concentrations of species
+        model_substance_units = model_lxml.attrs.get('substanceUnits', '') if model_lxml.level >= 3 else ''
+        for species_attrs in model_lxml.species:
+            if not ('initialAmount' in species_attrs or 'initialConcentration' in species_attrs):
+                continue
+
+            species_id = species_attrs.get('id', '')
+            assert species_id
+
+            species_name = species_attrs.get('name', '') or species_id
+
+            species_substance_units = units.get(species_attrs.get('substanceUnits', '') or model_substance_units, None)
+            if not species_substance_units:
+                species_substance_units = species_attrs.get('substanceUnits', '') or model_substance_units
+                self._logger.log(logging.ERROR, '{}: species {} does not have valid units'.format(self._filename, species_id))
+            if 'initialAmount' in species_attrs:
+                species_initial_type = 'Amount'
+                species_initial_val = self._parse_value(species_attrs['initialAmount'], float)
+                species_initial_units = species_substance_units
+            else:
+                species_initial_type = 'Concentration'
+                species_initial_val = self._parse_value(species_attrs['initialConcentration'], float)
+
+                if species_substance_units:
+                    comp_type, comp_attrs = model_lxml.get_element(species_attrs.get('compartment', ''))
+                    if comp_type != 'compartment':
+                        raise LibsbmlRequiredError('compartment of species {} is not defined'.format(species_id))
+                    species_initial_units = pretty_print_units('({}) / ({})'.format(
+                        species_substance_units,
+                        self._format_units(self._get_compartment_units(comp_attrs, model_lxml))
+                    ))
+                else:
+                    species_initial_units = None
+
+            parameters[species_id] = BiomodelParameter(
+                target=XPathTarget(SPECIES_INITIAL_TARGET, species_id, species_initial_type),
+                group='Initial species amounts/concentrations',
+                id="init_{}_{}".format(species_initial_type.lower(), species_id),
+                name='Initial {} of {}'.format(species_initial_type.lower(), species_name),
+                description=None,
+                identifiers=[],
+                type=Type.float,
+                value=species_initial_val,
+                units=species_initial_units,
+            )
+
+        # initial assignments
+        for symbol_id, (type, init_value) in model_lxml.initial_assignments:
+            if not type:
+                continue
+
+            symbol_type, symbol_attrs = model_lxml.get_element(symbol_id)
+            parameters["init_assignment_{}".format(symbol_id)] = BiomodelParameter(
+                target=XPathTarget(INITIAL_ASSIGNMENT_VALUE_TARGET, symbol_id),
+                group='Initial assignments',
+                id="init_assignment_{}".format(symbol_id),
+                name='Initial assignment of {}'.format(symbol_attrs.get('name', '') or symbol_id if symbol_attrs else symbol_id),
+                description=None,
+                identifiers=[],
+                type=type,
+                value=init_value,
+                units=self._format_units(self._get_element_units(symbol_type, symbol_attrs, model_lxml)),
+            )
+
+        # assignment rules
+        for rule_element_name, var_id, (type, value) in model_lxml.rules:
+            if rule_element_name == 'assignmentRule':
+                if not type:
+                    continue
+
+                var_type, var_attrs = model_lxml.get_element(var_id)
+                parameters["assignment_{}".format(var_id)] = BiomodelParameter(
+                    target=XPathTarget(ASSIGNMENT_RULE_VALUE_TARGET, var_id),
+                    group='Assignments',
+                    id="assignment_{}".format(var_id),
+                    name='Assignment of {}'.format(var_attrs.get('name', '') or var_id if var_attrs else var_id),
+                    description=None,
+                    identifiers=[],
+                    type=type,
+                    value=value,
+                    units=self._format_units(self._get_element_units(var_type, var_attrs, model_lxml)),
+                )
+
+        # ignore parameters set via assignment rules and initial assignments
+        for rule_element_name, var_id, _ in model_lxml.rules:
+            if rule_element_name == 'assignmentRule':
+                parameters.pop(var_id, None)
+
+        for symbol_id, _ in model_lxml.initial_assignments:
+            parameters.pop(symbol_id, None)
+
+        # recommended ranges
+        self._set_recommended_param_ranges(parameters.values())
+
+        # return parameters
+        model.parameters = parameters.values()
+        return model.parameters
+
+    def _read_parameter(self, param_attrs, model_lxml, model, rxn=None, param_element_name=None, rxn_id=None, rxn_name=None):
+        """ Read information about a SBML parameter
+
+        Args:
+            param_attrs (:obj:`dict`): attributes of the SBML parameter
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+            rxn (:obj:`dict`, optional): SBML reaction (used by local parameters)
+            param_element_name (:obj:`str`, optional): name of the element of the parameter (used by local parameters)
+            rxn_id (:obj:`str`, optional): id of the parent reaction (used by local parameters)
+            rxn_name (:obj:`str`, optional): name of the parent reaction (used by local parameters)
+
+        Returns:
+            :obj:`BiomodelParameter`: information about the parameter
+
+        Raises:
+            :obj:`AssertionError`: the parameter doesn't have an id
+        """
+        param_id = param_attrs.get('id', '')
+        assert param_id
+
+        if 'value' in param_attrs:
+            value = self._parse_value(param_attrs['value'], float)
+        elif model_lxml.level == 2:
+            value = 0.
+        else:
+            value = float('nan')
+        param = BiomodelParameter(
+            target=None,
+            group=None,
+            id=param_id,
+            name=param_attrs.get('name', '') or param_id,
+            description=None,
+            identifiers=[],
+            type=Type.float,
+            value=value,
+            units=self._format_units(self._resolve_units(param_attrs.get('units', ''), model_lxml)),
+        )
+
+        if rxn:
+            if int(model.format.version[1]) >= 3:
+                template = LOCAL_PARAMETER_VALUE_TARGET
+            else:
+                template = KINETIC_LAW_PARAMETER_VALUE_TARGET
+            target = XPathTarget(template, rxn['prefix'], rxn['element_name'], rxn_id, param_element_name, param.id)
+            group = '{} rate constants'.format(rxn_name or rxn_id)
+        else:
+            target = XPathTarget(PARAMETER_VALUE_TARGET, param.id)
+            group = 'Other global parameters'
+        param.target = target
+        param.group = group
+
+        if rxn_id:
+            param.id = rxn_id + '/' + param.id
+            param.name = (rxn_name or rxn_id) + ': ' + (param.name or param.id)
+
+        return param
+
+    def _read_variables(self, model_lxml, model, units):
+        """ Read the variables of a model
+
+        Args:
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+            model (:obj:`Biomodel`): model
+            units (:obj:`dict`): dictionary that maps the ids of units to their definitions
+
+        Returns:
+            :obj:`list` of :obj:`BiomodelVariable`: information about the variables of the model
+
+        Raises:
+            :obj:`AssertionError`: if a species doesn't have an id
+        """
+        model.variables = vars = []
+
+        # regular species
+        for species_attrs in model_lxml.species:
+            id = species_attrs.get('id', '')
+            assert id
+
+            vars.append(BiomodelVariable(
+                target=XPathTarget(SPECIES_TARGET, id),
+                group='Species amounts/concentrations',
+                id=id,
+                name=species_attrs.get('name', '') or None,
+                description=None,
+                identifiers=[],
+                type=Type.float,
+                units=self._format_units(self._get_species_units(species_attrs, model_lxml)),
+            ))
+
+        # compartments, parameters set via assignment rules
+        for rule_element_name, var_id, (type, _) in model_lxml.rules:
+            if type:
+                continue
+
+            if rule_element_name == 'assignmentRule':
+                var_type, var_attrs = model_lxml.get_element(var_id)
+                if var_type == 'parameter':
+                    vars.append(BiomodelVariable(
+                        target=XPathTarget(PARAMETER_TARGET, var_id),
+                        group='Other',
+                        id=var_id,
+                        name=var_attrs.get('name', '') or None,
+                        description=None,
+                        identifiers=[],
+                        type=Type.float,
+                        units=self._format_units(self._resolve_units(var_attrs.get('units', ''), model_lxml)),
+                    ))
+                elif var_type == 'compartment':
+                    vars.append(BiomodelVariable(
+                        target=XPathTarget(COMPARTMENT_TARGET, var_id),
+                        group='Compartment sizes',
+                        id=var_id,
+                        name=var_attrs.get('name', '') or None,
+                        description=None,
+                        identifiers=[],
+                        type=Type.float,
+                        units=self._format_units(self._get_compartment_units(var_attrs, model_lxml)),
+                    ))
+
+        return vars
+
+    def _get_element_units(self, type, attrs, model_lxml):
+        """ Get the canonical signature of the units of a compartment, species, or global parameter
+
+        Args:
+            type (:obj:`str`): type of the element (``compartment``, ``species``, or ``parameter``)
+            attrs (:obj:`dict`): attributes of the element
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units of the element
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the element isn't a compartment, species, or global parameter
+        """
+        if type == 'compartment':
+            return self._get_compartment_units(attrs, model_lxml)
+        elif type == 'species':
+            return self._get_species_units(attrs, model_lxml)
+        elif type == 'parameter':
+            return self._resolve_units(attrs.get('units', ''), model_lxml)
+        else:
+            raise LibsbmlRequiredError('units of elements other than compartments, species, and parameters are not supported')
+
+    def _get_compartment_units(self, attrs, model_lxml):
+        """ Get the canonical signature of the units of a compartment
+
+        Args:
+            attrs (:obj:`dict`): attributes of the compartment
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units of the compartment
+        """
+        if attrs.get('units', ''):
+            return self._resolve_units(attrs['units'], model_lxml)
+
+        if model_lxml.level == 2:
+            dims = self._parse_value(attrs.get('spatialDimensions', '3'), int)
+            if dims == 0:
+                return ((libsbml.UNIT_KIND_DIMENSIONLESS, 1., 0, 1.),)
+            units = {3: 'volume', 2: 'area', 1: 'length'}.get(dims, None)
+            if units is None:
+                raise LibsbmlRequiredError('compartments with {} dimensions are not supported'.format(dims))
+            return self._resolve_units(units, model_lxml)
+
+        dims = self._parse_value(attrs['spatialDimensions'], float) if 'spatialDimensions' in attrs else None
+        units = {3.: 'volumeUnits', 2.: 'areaUnits', 1.: 'lengthUnits'}.get(dims, None)
+        if units is None:
+            return ()
+        return self._resolve_units(model_lxml.attrs.get(units, ''), model_lxml)
+
+    def _get_species_units(self, attrs, model_lxml):
+        """ Get the canonical signature of the units of a species
+
+        Args:
+            attrs (:obj:`dict`): attributes of the species
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units of the species
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the units of the species must be derived with libSBML
+        """
+        if 'spatialSizeUnits' in attrs:
+            raise LibsbmlRequiredError('spatial size units of species are not supported')
+
+        if model_lxml.level == 2:
+            substance_units = attrs.get('substanceUnits', '') or 'substance'
+        else:
+            substance_units = attrs.get('substanceUnits', '') or model_lxml.attrs.get('substanceUnits', '')
+        substance_units = self._resolve_units(substance_units, model_lxml)
+        if not substance_units or self._parse_bool(attrs.get('hasOnlySubstanceUnits', 'false')):
+            return substance_units
+
+        comp_type, comp_attrs = model_lxml.get_element(attrs.get('compartment', ''))
+        if comp_type != 'compartment':
+            raise LibsbmlRequiredError('compartment of species {} is not defined'.format(attrs.get('id', '')))
+
+        if model_lxml.level == 2:
+            dims = self._parse_value(comp_attrs.get('spatialDimensions', '3'), float)
+        elif 'spatialDimensions' in comp_attrs:
+            dims = self._parse_value(comp_attrs['spatialDimensions'], float)
+        elif comp_attrs.get('units', ''):
+            raise LibsbmlRequiredError('compartments with units but without dimensions are not supported')
+        else:
+            return ()
+        if dims == 0:
+            return substance_units
+
+        comp_units = self._get_compartment_units(comp_attrs, model_lxml)
+        if not comp_units:
+            return ()
+        return substance_units + tuple((kind, -exponent, scale, multiplier) for kind, exponent, scale, multiplier in comp_units)
+
+    def _resolve_units(self, units_id, model_lxml):
+        """ Get the canonical signature of units
+
+        Args:
+            units_id (:obj:`str`): id of a unit definition, predefined unit, or base unit
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`tuple`: kinds, exponents, scales, and multipliers of the units
+        """
+        if not units_id:
+            return ()
+        if units_id in model_lxml.unit_defs:
+            return model_lxml.unit_defs[units_id]
+        if model_lxml.level == 2 and units_id in L2_PREDEFINED_UNITS:
+            return L2_PREDEFINED_UNITS[units_id]
+        if libsbml.UnitKind_isValidUnitKindString(units_id, model_lxml.level, model_lxml.version):
+            return ((self._get_unit_kind(units_id, model_lxml), 1., 0, 1.),)
+        return ()
+
+    def _get_unit_kind(self, name, model_lxml):
+        """ Get the libSBML kind of a base unit
+
+        Args:
+            name (:obj:`str`): name of the base unit
+            model_lxml (:obj:`LxmlSbmlModel`): summary of the elements of the model
+
+        Returns:
+            :obj:`int`: libSBML kind of the unit
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the unit isn't a valid base unit
+        """
+        if name in ['meter', 'liter', 'Celsius'] \
+                or not libsbml.UnitKind_isValidUnitKindString(name, model_lxml.level, model_lxml.version):
+            raise LibsbmlRequiredError('unit {} is not supported'.format(name))
+        return libsbml.UnitKind_forName(name)
+
+    def _format_units(self, signature):
+        """ Get a human-readable representation of the units with a canonical signature
+
+        Args:
+            signature (:obj:`tuple`): kinds, exponents, scales, and multipliers of the units
+
+        Returns:
+            :obj:`str`: human-readable string representation of the units
+        """
+        unit_def_str, units = unit_def_cache.format_signature(signature)
+        self.stats.count('units_formatted')
+        if unit_def_str == 'indeterminable':
+            self._logger.log(logging.ERROR, '{}: unit definition is invalid'.format(self._filename))
+            return None
+
+        return units
+
+    @staticmethod
+    def _parse_value(value, type):
+        """ Parse the value of an attribute or MathML node
+
+        Args:
+            value (:obj:`str`): value
+            type (:obj:`type`): type (e.g., :obj:`float`)
+
+        Returns:
+            :obj:`object`: parsed value
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the value is invalid
+        """
+        try:
+            return type(value)
+        except (TypeError, ValueError):
+            raise LibsbmlRequiredError('{} is not a valid {}'.format(value, type.__name__))
+
+    @staticmethod
+    def _parse_bool(value):
+        """ Parse the value of a Boolean attribute
+
+        Args:
+            value (:obj:`str`): value
+
+        Returns:
+            :obj:`bool`: parsed value
+
+        Raises:
+            :obj:`LibsbmlRequiredError`: if the value is invalid
+        """
+        value = value.strip()
+        if value in ['true', '1']:
+            return True
+        if value in ['false', '0']:
+            return False
+        raise LibsbmlRequiredError('{} is not a valid Boolean'.format(value))
+
+    @classmethod
+    def _get_xml_child_by_names(cls, node, names):
+        """ Get the child of an XML element with a prefix and name
+
+        Args:
+            node (:obj:`etree._Element`): XML element
+            names (:obj:`list` of :obj:`XmlName`): names
+
+        Returns:
+            :obj:`etree._Element`: child with prefix and name
+        """
+        for name in names:
+            if node is None:
+                break
+            node = cls._get_xml_child_by_name(node, name)
+        return node
+
+    @classmethod
+    def _get_xml_child_by_name(cls, node, name):
+        """ Get the child of an XML element with a prefix and name
+
+        Args:
+            node (:obj:`etree._Element`): XML element
+            name (:obj:`XmlName`): name
+
+        Returns:
+            :obj:`etree._Element`: child with prefix and name
+        """
+        matching_children = []
+        for child in node:
+            if child.prefix == name.prefix and etree.QName(child).localname == name.name:
+                matching_children.append(child)
+        if len(matching_children) == 1:
+            return matching_children[0]
+        else:
+            return None
+
+    @classmethod
+    def _get_xml_attr_by_name(cls, node, name):
+        """ Get an attribute of an XML element with a prefix and name
+
+        Args:
+            node (:obj:`etree._Element`): XML element
+            name (:obj:`XmlName`): attribute name
+
+        Returns:
+            :obj:`str`: attribute value
+        """
+        ns = node.nsmap.get(name.prefix, None)
+        if ns is None:
+            return None
+        return node.get('{{{}}}{}'.format(ns, name.name), None)
@@ -387,18 +387,19 @@ class BioModelsImporter(object):
             authors = []
             references = []
 
+        # read the model from memory; the model is also saved to the cache for visualizing and simulating it
         model_filename = files_metadata['main'][0]['name']
-        local_path = os.path.join(self._cache_dir, id + '.xml')
-        with open(local_path, 'wb') as file:
-            file.write(self.get_model_file(id, model_filename))
+        model_content = self.get_model_file(id, model_filename)
+        with open(os.path.join(self._cache_dir, id + '.xml'), 'wb') as file:
+            file.write(model_content)
 
-        model = read_biomodel(local_path, format=BiomodelFormat.sbml)
+        model = read_biomodel(model_content, format=BiomodelFormat.sbml)
         model.id = id
         model.name = metadata['name']
         model.file = RemoteFile(
             name=model_filename,
             type='application/sbml+xml',
-            size=os.path.getsize(local_path),
+            size=len(model_content),
         )
         model.description = metadata.get('description', None)
         if model.description:
@@ -443,12 +444,9 @@ class BioModelsImporter(object):
         for file_metadata in files_metadata['additional']:
             if file_metadata['name'].endswith('.sedml'):
                 num_sim_files += 1
-                local_path = os.path.join(self._cache_dir, '{}_{}.sedml'.format(model.id, num_sim_files))
-                with open(local_path, 'wb') as file:
-                    file.write(self.get_model_file(id, file_metadata['name']))
-
                 try:
-                    model_sims, model_viz = read_simulation(local_path, SimulationFormat.sedml)
+                    model_sims, model_viz = read_simulation(self.get_model_file(id, file_metadata['name']),
+                                                            SimulationFormat.sedml)
                 except SimulationIoError:
                     unimportable_sims.append('{}-{}'.format(model.id, num_sim_files))
                     continue
@@ -532,9 +530,6 @@ class BioModelsImporter(object):
 
         if len(sims) == 1:
             sims[0].id = '{}_sim'.format(model.id)
-            os.rename(
-                os.path.join(self._cache_dir, '{}_{}.sedml'.format(model.id, 1)),
-                os.path.join(self._cache_dir, '{}.sedml'.format(model.id)))
 
         if len(vizs) == 1:
             vizs[0].id = '{}_viz'.format(model.id)
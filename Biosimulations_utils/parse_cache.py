@@ -0,0 +1,253 @@
+""" Persistent cache of the results of parsing model and simulation files
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-06
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from ._version import __version__
+from .utils import get_logger
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+__all__ = ['FileCache', 'ParseCache', 'get_parse_cache']
+
+DEFAULT_CACHE_DIRNAME = os.path.expanduser(os.path.join('~', '.cache', 'Biosimulations_utils', 'parse'))
+DEFAULT_MAX_SIZE = 512 * 2 ** 20
+EVICTION_FRACTION = 0.9
+
+
+class FileCache(object):
+    """ Persistent cache whose entries are saved to separate files in a directory
+
+    When the total size of the entries exceeds :obj:`max_size`, the least recently used entries are
+    evicted, as determined by the modification times of their files, which subclasses should update
+    on each hit.
+
+    The total size of the entries is tracked as entries are saved, so that the directory is only
+    scanned when the cache is first written to and when entries must be evicted. Entries are evicted
+    until their total size is at most :obj:`EVICTION_FRACTION` of :obj:`max_size`, so that the
+    directory isn't scanned again on each of the next writes.
+
+    Attributes:
+        dirname (:obj:`str`): path to a directory to save the entries of the cache
+        max_size (:obj:`int`): maximum total size of the entries (bytes)
+        entry_suffix (:obj:`str`): extension of the files of the entries (e.g., `.json`)
+        hits (:obj:`int`): number of lookups which were found in the cache
+        misses (:obj:`int`): number of lookups which were not found in the cache
+        _total_size (:obj:`int`): total size of the entries (bytes), or :obj:`None` if the directory hasn't been scanned
+        _logger (:obj:`logging.Logger`): logger
+    """
+
+    def __init__(self, dirname, max_size, entry_suffix, logger_name):
+        """
+        Args:
+            dirname (:obj:`str`): path to a directory to save the entries of the cache
+            max_size (:obj:`int`): maximum total size of the entries (bytes)
+            entry_suffix (:obj:`str`): extension of the files of the entries (e.g., `.json`)
+            logger_name (:obj:`str`): name of the logger for errors saving entries
+        """
+        self.dirname = dirname
+        self.max_size = max_size
+        self.entry_suffix = entry_suffix
+        self.hits = 0
+        self.misses = 0
+        self._total_size = None
+        self._logger = get_logger(logger_name)
+
+    @staticmethod
+    def _hash_file(hash, filename):
+        """ Update a hash with the contents of a file
+
+        Args:
+            hash (:obj:`hashlib._Hash`): hash
+            filename (:obj:`str` or :obj:`bytes`): path to the file, or the contents of the file
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the file could be read
+        """
+        if isinstance(filename, bytes):
+            hash.update(filename)
+            return True
+
+        try:
+            with open(filename, 'rb') as file:
+                for block in iter(lambda: file.read(2 ** 20), b''):
+                    hash.update(block)
+        except OSError:
+            return False
+        return True
+
+    def set(self, key, contents):
+        """ Save an entry, evicting the least recently used entries if necessary
+
+        Args:
+            key (:obj:`str`): key
+            contents (:obj:`bytes`): contents of the entry
+        """
+        entry_filename = self._get_entry_filename(key)
+        try:
+            if not os.path.isdir(self.dirname):
+                os.makedirs(self.dirname)
+            fid, temp_filename = tempfile.mkstemp(dir=self.dirname, suffix='.tmp')
+            with os.fdopen(fid, 'wb') as file:
+                file.write(contents)
+            try:
+                prev_size = os.path.getsize(entry_filename)
+            except OSError:
+                prev_size = 0
+            os.replace(temp_filename, entry_filename)
+        except OSError as error:
+            self._logger.log(logging.ERROR, 'Cache entry could not be saved: {}'.format(str(error)))
+            return
+
+        if self._total_size is None:
+            self._evict(self.max_size)
+        else:
+            self._total_size += len(contents) - prev_size
+            if self._total_size > self.max_size:
+                self._evict(int(EVICTION_FRACTION * self.max_size))
+
+    def _evict(self, max_size):
+        """ Scan the entries, and evict the least recently used entries until their total size is at most :obj:`max_size`
+
+        Args:
+            max_size (:obj:`int`): maximum total size of the entries after eviction (bytes)
+        """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.dirname):
+            if entry.name.endswith(self.entry_suffix):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, entry_filename in entries:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(entry_filename)
+            except OSError:
+                pass
+            total_size -= size
+
+        self._total_size = total_size
+
+    def _get_entry_filename(self, key):
+        """ Get the path to the file for an entry
+
+        Args:
+            key (:obj:`str`): key
+
+        Returns:
+            :obj:`str`: path to the file for the entry
+        """
+        return os.path.join(self.dirname, key + self.entry_suffix)
+
+    def get_info(self):
+        """ Get statistics about the cache
+
+        Returns:
+            :obj:`dict`: number of hits and misses
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear(self):
+        """ Clear the cache and reset its statistics """
+        self.hits = 0
+        self.misses = 0
+        self._total_size = None
+        if os.path.isdir(self.dirname):
+            for entry in os.scandir(self.dirname):
+                if entry.name.endswith(self.entry_suffix):
+                    os.remove(entry.path)
+
+
+class ParseCache(FileCache):
+    """ Persistent cache of the JSON representations of the results of parsing files
+
+    Entries are keyed on the SHA-256 hash of the contents of the parsed file, the options used
+    to parse the file, and the version of this package, so that entries are invalidated whenever
+    a file changes or the package is upgraded. Each entry is saved to a separate JSON file.
+    """
+
+    def __init__(self, dirname=DEFAULT_CACHE_DIRNAME, max_size=DEFAULT_MAX_SIZE):
+        """
+        Args:
+            dirname (:obj:`str`, optional): path to a directory to save the entries of the cache
+            max_size (:obj:`int`, optional): maximum total size of the entries (bytes)
+        """
+        super(ParseCache, self).__init__(dirname, max_size, '.json', 'parse_cache')
+
+    def get_key(self, filename, **options):
+        """ Get the key for the result of parsing a file
+
+        Args:
+            filename (:obj:`str` or :obj:`bytes`): path to the file, or the contents of the file
+            **options: options used to parse the file (e.g., format, engine)
+
+        Returns:
+            :obj:`str`: key, or :obj:`None` if the file can't be read
+        """
+        hash = hashlib.sha256()
+        if not self._hash_file(hash, filename):
+            return None
+        hash.update(json.dumps(options, sort_keys=True).encode())
+        hash.update(__version__.encode())
+        return hash.hexdigest()
+
+    def get(self, key):
+        """ Get the JSON representation of a result
+
+        Args:
+            key (:obj:`str`): key
+
+        Returns:
+            :obj:`object`: JSON representation of the result, or :obj:`None` if the result isn't in the cache
+        """
+        entry_filename = self._get_entry_filename(key)
+        try:
+            with open(entry_filename, 'r') as file:
+                val = json.load(file)
+            os.utime(entry_filename)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return val
+
+    def set(self, key, val):
+        """ Save the JSON representation of a result, evicting the least recently used entries if necessary
+
+        Args:
+            key (:obj:`str`): key
+            val (:obj:`object`): JSON representation of the result
+        """
+        super(ParseCache, self).set(key, json.dumps(val).encode())
+
+
+_parse_cache = None
+
+
+def get_parse_cache():
+    """ Get the process-wide parse cache, creating it if necessary
+
+    Returns:
+        :obj:`ParseCache`: parse cache
+    """
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
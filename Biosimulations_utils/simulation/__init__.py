@@ -6,11 +6,17 @@
 :License: MIT
 """
 
-from .data_model import SimulationFormat
-from ..visualization.data_model import Visualization  # noqa: F401
+from .core import SimulationIoDiagnostic, SimulationIoError, SimulationIoWarning
+from .data_model import Simulation, SimulationFormat
+from ..parse_cache import get_parse_cache
+from ..visualization.data_model import Visualization
 from .sedml import SedMlSimulationWriter, SedMlSimulationReader
+from .sedml_lxml import LxmlSedMlSimulationReader
+from ..utils import read_source
+import concurrent.futures
+import warnings
 
-__all__ = ['write_simulation', 'read_simulation']
+__all__ = ['write_simulation', 'write_simulations', 'read_simulation', 'read_simulations', 'iter_simulations']
 
 
 def write_simulation(sim, filename, format=SimulationFormat.sedml, visualization=None, **format_opts):
@@ -18,10 +24,12 @@ def write_simulation(sim, filename, format=SimulationFormat.sedml, visualization
 
     Args:
         sim (:obj:`dict`): Simulation experiment
-        filename (:obj:`str`): Path to save simulation experiment in SED-ML format
+        filename (:obj:`str` or file-like object): Path to save simulation experiment in SED-ML format, or a binary
+            or text file-like object (e.g., :obj:`io.BytesIO`) to write it to
         visualization (:obj:`Visualization`, optional): visualization
         format (:obj:`SimulationFormat`, optional): simulation experiment format
-        format_opts (:obj:`dict`, optional): options to the simulation experiment format (e.g., level, version)
+        format_opts (:obj:`dict`, optional): options to the simulation experiment format (e.g., level, version,
+            error checking mode)
 
     Raises:
         :obj:`NotImplementedError`: the format is not supported
@@ -33,24 +41,236 @@ def write_simulation(sim, filename, format=SimulationFormat.sedml, visualization
     return Writer().run(sim, filename, visualization=visualization, **format_opts)
 
 
-def read_simulation(filename, format=SimulationFormat.sedml):
-    """ Read a simulation experiment from a file
+def write_simulations(sims, filename, format=SimulationFormat.sedml, **format_opts):
+    """ Write multiple simulation experiments (e.g., the members of an ensemble or the points of a parameter scan)
+    to a single file
+
+    Models and simulations which are shared by the simulation experiments are written once.
+
+    Args:
+        sims (:obj:`list` of :obj:`Simulation`): Simulation experiments
+        filename (:obj:`str` or file-like object): Path to save simulation experiments, or a binary or text
+            file-like object to write them to
+        format (:obj:`SimulationFormat`, optional): simulation experiment format
+        format_opts (:obj:`dict`, optional): options to the simulation experiment format (e.g., level, version,
+            error checking mode)
+
+    Raises:
+        :obj:`NotImplementedError`: the format is not supported
+    """
+    if format == SimulationFormat.sedml:
+        Writer = SedMlSimulationWriter
+    else:
+        raise NotImplementedError("Simulation experiment format {} is not supported".format(format.name))
+    return Writer().run_multiple(sims, filename, **format_opts)
+
+
+def read_simulation(filename, format=SimulationFormat.sedml, cache=None, rebuild_cache=False, profile='full'):
+    """ Read a simulation experiment from a file, or from its contents in memory
 
     Args:
-        filename (:obj:`str`): path to save simulation
+        filename (:obj:`str`, :obj:`bytes`, or file-like object): path to a simulation experiment, the contents of
+            the file, or a file-like object from which to read the simulation experiment
         format (:obj:`SimulationFormat`, optional): simulation experiment format
+        cache (:obj:`bool` or :obj:`ParseCache`, optional): if :obj:`True`, get the simulation experiment from the
+            process-wide parse cache if it has already been read, or save it to the cache; if a :obj:`ParseCache`,
+            use that cache; if :obj:`None` or :obj:`False`, bypass the cache
+        rebuild_cache (:obj:`bool`, optional): if :obj:`True`, read the simulation experiment even if it is in the
+            cache and replace the cached simulation experiment
+        profile (:obj:`str`, optional): profile which determines which parts of the simulation experiment are read
+
+            * ``full``: read the simulations and visualization
+            * ``tasks_only``: read the simulations, including their models, but not the visualization
 
     Returns:
         :obj:`tuple`
 
             * :obj:`list` of :obj:`Simulation`: simulations
-            * :obj:`Visualization`: visualization
+            * :obj:`Visualization`: visualization, or :obj:`None` if the profile doesn't include the visualization
 
     Raises:
-        :obj:`NotImplementedError`: the format is not supported
+        :obj:`NotImplementedError`: the format or profile is not supported
+    """
+    if format == SimulationFormat.sedml:
+        Reader = SedMlSimulationReader
+    else:
+        raise NotImplementedError("Simulation experiment format {} is not supported".format(format.name))
+    if profile not in Reader.PROFILES:
+        raise NotImplementedError("Profile {} is not supported".format(profile))
+
+    filename = read_source(filename)
+    if not cache:
+        return Reader().run(filename, profile=profile)
+
+    if cache is True:
+        cache = get_parse_cache()
+    key = cache.get_key(filename, type='simulation', format=format.name, profile=profile)
+    if key is not None and not rebuild_cache:
+        val = cache.get(key)
+        if val is not None:
+            sims = [Simulation.from_json(sim) for sim in val['simulations']]
+            viz = Visualization.from_json(val['visualization']) if val['visualization'] else None
+            return (sims, viz)
+
+    sims, viz = Reader().run(filename, profile=profile)
+    if key is not None:
+        cache.set(key, {
+            'simulations': [sim.to_json() for sim in sims],
+            'visualization': viz.to_json() if viz else None,
+        })
+    return (sims, viz)
+
+
+def read_simulations(filenames, format=SimulationFormat.sedml, workers=None, ordered=True, profile='full', counts=None):
+    """ Read multiple simulation experiments (e.g., a mirror of a model repository), optionally in parallel with
+    a pool of processes
+
+    Rather than being reported as warnings, the problems which are encountered while reading each simulation
+    experiment are returned as diagnostics. Because libSED-ML objects can't be pickled, the workers return the
+    JSON representations of the simulations and visualizations, which are then converted back to
+    :obj:`Simulation` and :obj:`Visualization` objects.
+
+    Args:
+        filenames (:obj:`list` of :obj:`str`): paths to simulation experiments
+        format (:obj:`SimulationFormat`, optional): simulation experiment format
+        workers (:obj:`int`, optional): number of processes to read the simulation experiments with; if :obj:`None`
+            or 1, the simulation experiments are read sequentially in the current process
+        ordered (:obj:`bool`, optional): if :obj:`True`, yield the simulation experiments in the order of
+            :obj:`filenames`; otherwise, yield the simulation experiments as they are read
+        profile (:obj:`str`, optional): profile which determines which parts of the simulation experiments are read
+            (see :obj:`read_simulation`)
+        counts (:obj:`collections.Counter`, optional): collector for aggregate counts of the files read (``files``),
+            the files which couldn't be read (``errors``), the simulations read (``simulations``), and the
+            diagnostics of each category (e.g., ``unsupported_task``)
+
+    Yields:
+        :obj:`tuple`:
+
+            * :obj:`str`: path to the simulation experiment
+            * :obj:`list` of :obj:`Simulation`: simulations, or :obj:`None` if the simulation experiment couldn't be read
+            * :obj:`Visualization`: visualization, or :obj:`None` if the simulation experiment doesn't have a
+              visualization, the profile doesn't include the visualization, or the simulation experiment couldn't be read
+            * :obj:`list` of :obj:`SimulationIoDiagnostic`: problems encountered while reading the simulation experiment
+            * :obj:`Exception`: :obj:`SimulationIoError` or :obj:`ValueError` raised while reading the simulation
+              experiment, or :obj:`None` if the simulation experiment was read
+
+    Raises:
+        :obj:`NotImplementedError`: the format or profile is not supported
     """
     if format == SimulationFormat.sedml:
         Reader = SedMlSimulationReader
     else:
         raise NotImplementedError("Simulation experiment format {} is not supported".format(format.name))
-    return Reader().run(filename)
+    if profile not in Reader.PROFILES:
+        raise NotImplementedError("Profile {} is not supported".format(profile))
+
+    if not workers or workers == 1:
+        for filename in filenames:
+            yield _read_simulation_from_json(*_read_simulation_to_json(filename, format, profile), counts=counts)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_simulation_to_json, filename, format, profile) for filename in filenames]
+        if not ordered:
+            futures = concurrent.futures.as_completed(futures)
+
+        for future in futures:
+            yield _read_simulation_from_json(*future.result(), counts=counts)
+
+
+def _read_simulation_to_json(filename, format, profile='full'):
+    """ Read a simulation experiment into JSON representations of its simulations, visualization, and diagnostics
+    so that they can be returned from a worker process
+
+    Args:
+        filename (:obj:`str`): path to the simulation experiment
+        format (:obj:`SimulationFormat`): simulation experiment format
+        profile (:obj:`str`, optional): profile which determines which parts of the simulation experiment are read
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: path to the simulation experiment
+            * :obj:`list` of :obj:`dict`: JSON representations of the simulations, or :obj:`None` if the simulation
+              experiment couldn't be read
+            * :obj:`dict`: JSON representation of the visualization, or :obj:`None`
+            * :obj:`list` of :obj:`dict`: JSON representations of the diagnostics
+            * :obj:`Exception`: :obj:`SimulationIoError` or :obj:`ValueError` raised while reading the simulation
+              experiment, or :obj:`None` if the simulation experiment was read
+    """
+    reader = SedMlSimulationReader()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', SimulationIoWarning)
+        try:
+            sims, viz = reader.run(filename, profile=profile)
+            sims = [sim.to_json() for sim in sims]
+            viz = viz.to_json() if viz else None
+            exception = None
+        except (SimulationIoError, ValueError) as caught_exception:
+            sims = viz = None
+            exception = caught_exception
+    return (filename, sims, viz, [diagnostic.to_json() for diagnostic in reader.diagnostics], exception)
+
+
+def _read_simulation_from_json(filename, sims, viz, diagnostics, exception, counts=None):
+    """ Convert the JSON representations returned by :obj:`_read_simulation_to_json` back to objects
+
+    Args:
+        filename (:obj:`str`): path to the simulation experiment
+        sims (:obj:`list` of :obj:`dict`): JSON representations of the simulations, or :obj:`None`
+        viz (:obj:`dict`): JSON representation of the visualization, or :obj:`None`
+        diagnostics (:obj:`list` of :obj:`dict`): JSON representations of the diagnostics
+        exception (:obj:`Exception`): exception raised while reading the simulation experiment, or :obj:`None`
+        counts (:obj:`collections.Counter`, optional): collector for aggregate counts (see :obj:`read_simulations`)
+
+    Returns:
+        :obj:`tuple`: path to the simulation experiment, simulations, visualization, diagnostics, and exception
+    """
+    if sims is not None:
+        sims = [Simulation.from_json(sim) for sim in sims]
+    if viz is not None:
+        viz = Visualization.from_json(viz)
+    diagnostics = [SimulationIoDiagnostic.from_json(diagnostic) for diagnostic in diagnostics]
+
+    if counts is not None:
+        counts['files'] += 1
+        if exception is not None:
+            counts['errors'] += 1
+        else:
+            counts['simulations'] += len(sims)
+        for diagnostic in diagnostics:
+            counts[diagnostic.category.value] += 1
+
+    return (filename, sims, viz, diagnostics, exception)
+
+
+def iter_simulations(filename, format=SimulationFormat.sedml, read_visualization=False):
+    """ Iterate over the simulations of a simulation experiment, one task at a time
+
+    Unlike :obj:`read_simulation`, the simulations are read incrementally and aren't retained, so that
+    simulation experiments with large numbers of tasks can be read with little memory.
+
+    Args:
+        filename (:obj:`str`, :obj:`bytes`, or file-like object): path to the simulation experiment, the contents of
+            the file, or a file-like object from which to read the simulation experiment
+        format (:obj:`SimulationFormat`, optional): simulation experiment format
+        read_visualization (:obj:`bool`, optional): if :obj:`True`, also read the visualization of the simulation
+            experiment. This requires the simulations to be retained until the iteration is complete.
+
+    Yields:
+        :obj:`Simulation`: simulation of each task
+
+    Returns:
+        :obj:`Visualization`: visualization, or :obj:`None` if the visualization wasn't requested. The visualization
+            is the return value of the generator (e.g., ``viz = yield from iter_simulations(filename, read_visualization=True)``).
+
+    Raises:
+        :obj:`NotImplementedError`: the format is not supported
+    """
+    if format == SimulationFormat.sedml:
+        Reader = LxmlSedMlSimulationReader
+    else:
+        raise NotImplementedError("Simulation experiment format {} is not supported".format(format.name))
+
+    viz = yield from Reader().iter(filename, read_visualization=read_visualization)
+    return viz
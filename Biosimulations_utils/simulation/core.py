@@ -7,8 +7,10 @@
 """
 
 import abc
+import enum
 
-__all__ = ['SimulationWriter', 'SimulationReader', 'SimulationIoError', 'SimulationIoWarning']
+__all__ = ['SimulationWriter', 'SimulationReader', 'SimulationIoError', 'SimulationIoWarning',
+           'SimulationIoDiagnosticCategory', 'SimulationIoDiagnostic']
 
 
 class SimulationWriter(abc.ABC):
@@ -29,3 +31,85 @@ class SimulationIoError(Exception):
 class SimulationIoWarning(UserWarning):
     """ Simulation IO warning """
     pass
+
+
+class SimulationIoDiagnosticCategory(str, enum.Enum):
+    """ Category of a problem encountered while reading a simulation experiment """
+    unsupported_task = 'unsupported_task'
+    unsupported_output = 'unsupported_output'
+    duplicate_id = 'duplicate_id'
+    unresolved_reference = 'unresolved_reference'
+    incompatible_axes = 'incompatible_axes'
+
+
+class SimulationIoDiagnostic(object):
+    """ Problem encountered while reading a simulation experiment, such as an element which isn't supported
+    and was skipped
+
+    Attributes:
+        category (:obj:`SimulationIoDiagnosticCategory`): category
+        obj_id (:obj:`str`): id of the object of the problem (e.g., task, data generator, output)
+        message (:obj:`str`): message
+    """
+
+    def __init__(self, category=None, obj_id=None, message=None):
+        """
+        Args:
+            category (:obj:`SimulationIoDiagnosticCategory`, optional): category
+            obj_id (:obj:`str`, optional): id of the object of the problem (e.g., task, data generator, output)
+            message (:obj:`str`, optional): message
+        """
+        self.category = category
+        self.obj_id = obj_id
+        self.message = message
+
+    def __eq__(self, other):
+        """ Determine if two diagnostics are semantically equal
+
+        Args:
+            other (:obj:`SimulationIoDiagnostic`): other diagnostic
+
+        Returns:
+            :obj:`bool`
+        """
+        return other.__class__ == self.__class__ \
+            and self.category == other.category \
+            and self.obj_id == other.obj_id \
+            and self.message == other.message
+
+    def __repr__(self):
+        """ Get a string representation of the diagnostic
+
+        Returns:
+            :obj:`str`
+        """
+        return '<SimulationIoDiagnostic {} {}: {}>'.format(self.category.value if self.category else None,
+                                                           self.obj_id, self.message)
+
+    def to_json(self):
+        """ Export to JSON
+
+        Returns:
+            :obj:`dict`
+        """
+        return {
+            'category': self.category.value if self.category else None,
+            'objId': self.obj_id,
+            'message': self.message,
+        }
+
+    @classmethod
+    def from_json(cls, val):
+        """ Create diagnostic from JSON
+
+        Args:
+            val (:obj:`dict`)
+
+        Returns:
+            :obj:`SimulationIoDiagnostic`
+        """
+        return cls(
+            category=SimulationIoDiagnosticCategory(val['category']) if val.get('category', None) else None,
+            obj_id=val.get('objId', None),
+            message=val.get('message', None),
+        )
@@ -0,0 +1,124 @@
+""" Persistent, content-addressed cache of the variants of models generated for the model changes of simulations
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .._version import __version__
+from ..parse_cache import FileCache
+import hashlib
+import json
+import os
+import shutil
+
+__all__ = ['ModelVariantCache', 'get_model_variant_cache']
+
+DEFAULT_CACHE_DIRNAME = os.path.expanduser(os.path.join('~', '.cache', 'Biosimulations_utils', 'model-variants'))
+DEFAULT_MAX_SIZE = 2 ** 30
+
+
+class ModelVariantCache(FileCache):
+    """ Persistent, content-addressed cache of the variants of models generated for the model changes of simulations
+
+    Entries are keyed on the SHA-256 hash of the contents of the source model and a digest of the
+    changes applied to it. The changes are canonicalized by target, so that the order in which the
+    changes are listed doesn't matter. The digest also covers the options used to generate the variant
+    and the version of this package. Each entry is saved to a separate file.
+
+    Entries are materialized at the paths requested by lookups as hard links to the entries, or as copies
+    of the entries when hard links can't be created (e.g., across file systems). Because hard links share
+    their contents with the entries, materialized variants should not be modified in place.
+
+    Evicting an entry doesn't remove the variants materialized from it.
+    """
+
+    def __init__(self, dirname=DEFAULT_CACHE_DIRNAME, max_size=DEFAULT_MAX_SIZE):
+        """
+        Args:
+            dirname (:obj:`str`, optional): path to a directory to save the entries of the cache
+            max_size (:obj:`int`, optional): maximum total size of the entries (bytes)
+        """
+        super(ModelVariantCache, self).__init__(dirname, max_size, '.xml', 'model_variant_cache')
+
+    def get_key(self, model_filename, changes, **options):
+        """ Get the key for a variant of a model
+
+        Args:
+            model_filename (:obj:`str` or :obj:`bytes`): path to the source model, or the contents of the model
+            changes (:obj:`list` of :obj:`tuple`): targets and string representations of the values of the changes
+                to the model. If multiple changes have the same target, the last change takes precedence.
+            **options: options used to generate the variant (e.g., pretty printing)
+
+        Returns:
+            :obj:`str`: key, or :obj:`None` if the model can't be read
+        """
+        model_hash = hashlib.sha256()
+        if not self._hash_file(model_hash, model_filename):
+            return None
+
+        changes_hash = hashlib.sha256()
+        changes_hash.update(json.dumps(sorted(dict(changes).items())).encode())
+        changes_hash.update(json.dumps(options, sort_keys=True).encode())
+        changes_hash.update(__version__.encode())
+
+        return '{}-{}'.format(model_hash.hexdigest(), changes_hash.hexdigest())
+
+    def get(self, key, out_filename=None):
+        """ Get a variant
+
+        Args:
+            key (:obj:`str`): key
+            out_filename (:obj:`str`, optional): path to materialize the variant at; if :obj:`None`, the path to the
+                entry is returned, which must not be modified
+
+        Returns:
+            :obj:`str`: path to the variant, or :obj:`None` if the variant isn't in the cache
+        """
+        entry_filename = self._get_entry_filename(key)
+        try:
+            os.utime(entry_filename)
+            if out_filename is not None:
+                self._materialize(entry_filename, out_filename)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry_filename if out_filename is None else out_filename
+
+    @staticmethod
+    def _materialize(entry_filename, out_filename):
+        """ Materialize an entry at a path as a hard link to the entry, or as a copy of the entry
+
+        Args:
+            entry_filename (:obj:`str`): path to the entry
+            out_filename (:obj:`str`): path to materialize the entry at
+
+        Raises:
+            :obj:`OSError`: the entry couldn't be materialized
+        """
+        # remove existing files rather than writing through them, which could modify other entries which they link to
+        if os.path.lexists(out_filename):
+            os.remove(out_filename)
+
+        try:
+            os.link(entry_filename, out_filename)
+        except OSError:
+            shutil.copyfile(entry_filename, out_filename)
+
+
+_model_variant_cache = None
+
+
+def get_model_variant_cache():
+    """ Get the process-wide model variant cache, creating it if necessary
+
+    Returns:
+        :obj:`ModelVariantCache`: model variant cache
+    """
+    global _model_variant_cache
+    if _model_variant_cache is None:
+        _model_variant_cache = ModelVariantCache()
+    return _model_variant_cache
@@ -6,20 +6,27 @@
 :License: MIT
 """
 
-from .core import SimulationWriter, SimulationReader, SimulationIoError, SimulationIoWarning
+from .core import (SimulationWriter, SimulationReader, SimulationIoError, SimulationIoWarning,
+                   SimulationIoDiagnostic, SimulationIoDiagnosticCategory)
 from .data_model import (Simulation, TimecourseSimulation, SteadyStateSimulation,  # noqa: F401
                          Algorithm, AlgorithmParameter, ParameterChange, SimulationResult,
                          SimulationFormat)
+from .model_variant_cache import get_model_variant_cache
+from .target_resolver import XmlTargetResolver
 from ..chart.data_model import Chart, ChartDataField, ChartDataFieldShape, ChartDataFieldType
 from ..data_model import Format, JournalReference, License, OntologyTerm, Person, RemoteFile
 from ..biomodel.data_model import Biomodel, BiomodelParameter, BiomodelVariable, BiomodelFormat
 from ..visualization.data_model import Visualization, VisualizationLayoutElement, VisualizationDataField
-from ..utils import assert_exception, get_enum_format_by_attr, get_logger
+from ..utils import assert_exception, get_enum_format_by_attr, get_logger, get_source_name, read_source
 from lxml import etree
 from xml.sax import saxutils
+import collections
 import copy
 import dateutil.parser
 import enum
+import functools
+import io
+import json
 import libsedml
 import logging
 import os
@@ -29,46 +36,79 @@ __all__ = [
     'SedMlSimulationWriter',
     'SedMlSimulationReader',
     'modify_xml_model_for_simulation',
+    'ModelVariantGenerator',
 ]
 
+# namespaces of the RDF annotations of SED objects
+ANNOTATION_NAMESPACES = collections.OrderedDict([
+    ('rdf', 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'),
+    ('dc', 'http://purl.org/dc/elements/1.1/'),
+    ('dcterms', 'http://purl.org/dc/terms/'),
+    ('vcard', 'http://www.w3.org/2001/vcard-rdf/3.0#'),
+    ('bibo', 'http://purl.org/ontology/bibo/'),
+])
+
 
 class SedMlSimulationWriter(SimulationWriter):
     """ SED-ML writer
 
+    Errors can be checked in two modes
+
+    * ``eager``: check the return code of each libSED-ML setter and the error log of the document after each setter
+    * ``deferred``: check the return code of each libSED-ML setter, and check the error log of the document once
+      after each top-level element (e.g., model, simulation, task, report) is added to the document. This is
+      faster for documents with large numbers of data generators.
+
     Attributes:
         _num_meta_id (:obj:`int`): number of assigned meta ids
+        _data_gen_ids (:obj:`set` of :obj:`str`): ids of the data generators added to the document
+        _data_set_ids (:obj:`set` of :obj:`str`): ids of the data sets added to the document
+        _error_checking (:obj:`str`): error checking mode (``eager`` or ``deferred``)
     """
 
-    def run(self, sim, filename, level=1, version=3, visualization=None):
+    ERROR_CHECKING_MODES = ('eager', 'deferred')
+
+    def run(self, sim, filename, level=1, version=3, visualization=None, error_checking='eager'):
         """
         Args:
             sim (:obj:`Simulation`): Simulation experiment
-            filename (:obj:`str`): Path to save simulation experiment in SED-ML format
+            filename (:obj:`str` or file-like object): Path to save simulation experiment in SED-ML format, or a
+                binary or text file-like object to write it to
             level (:obj:`int`, optional): SED-ML level
             version (:obj:`int`, optional): SED-ML version
             visualization (:obj:`Visualization`, optional): visualization
+            error_checking (:obj:`str`, optional): error checking mode (``eager`` or ``deferred``)
 
         Returns:
             :obj:`libsedml.SedDocument`: SED document
 
         Raises:
+            :obj:`NotImplementedError`: the error checking mode is not supported
             :obj:`ValueError`: the SED-ML version of the simulation and the desired output version are different
         """
         if sim.format.id != 'SED-ML' or sim.format.version != 'L{}V{}'.format(level, version):
             raise ValueError('Format must be SED-ML L{}V{}'.format(level, version))
 
         self._num_meta_id = 0
+        self._data_gen_ids = set()
+        self._data_set_ids = set()
+        self._init_error_checking(error_checking)
 
         doc_sed = self._create_doc(level, version)
         self._add_metadata_to_obj(sim, doc_sed, doc_sed)
+        self._check_error_log(doc_sed, doc_sed)
 
         model_sed = self._add_model_to_doc(sim.model, doc_sed)
         self._add_parameter_changes_to_model(sim.model_parameter_changes, doc_sed, model_sed)
+        self._check_error_log(doc_sed, model_sed)
 
         sim_sed = self._add_sim_to_doc(sim, doc_sed)
         alg_sed = self._add_algorithm_to_sim(sim.algorithm, doc_sed, sim_sed)
         self._add_param_changes_to_alg(sim.algorithm_parameter_changes, doc_sed, alg_sed)
+        self._check_error_log(doc_sed, sim_sed)
+
         task_sed = self._add_sim_task_to_doc(sim.id, sim.name, doc_sed, model_sed, sim_sed)
+        self._check_error_log(doc_sed, task_sed)
 
         report_sed = self._add_report_to_doc(sim.id, sim.name, doc_sed)
         time_gen_sed = self._add_data_gen_to_doc('time', 'time', doc_sed)
@@ -76,6 +116,7 @@ class SedMlSimulationWriter(SimulationWriter):
         self._add_data_set_to_report('time', 'time', doc_sed, report_sed, time_gen_sed)
 
         self._add_task_results_to_report(sim.model.variables, doc_sed, task_sed, report_sed)
+        self._check_error_log(doc_sed, report_sed)
 
         if visualization:
             self._add_viz_to_doc(visualization, doc_sed)
@@ -84,6 +125,189 @@ class SedMlSimulationWriter(SimulationWriter):
 
         return doc_sed
 
+    def run_multiple(self, sims, filename, level=1, version=3, error_checking='eager'):
+        """ Write multiple simulation experiments (e.g., the members of an ensemble or the points of a parameter
+        scan) to a single SED document
+
+        Models and simulations which have the same content are written once and shared by the tasks of the
+        simulation experiments. Models are compared by their ids, names, sources, languages, and parameter
+        changes, and simulations are compared by their types, time courses, algorithms, and algorithm
+        parameter changes. Each simulation experiment is written to its own task and report. Because the
+        variables of SED data generators refer to individual tasks, data generators are reused for variables
+        of the same task which have the same target.
+
+        The metadata of the document (description, tags, authors, references, and license) is written once, and
+        therefore must be the same for all of the simulation experiments. The dates when the document was created
+        and updated are taken from the first simulation experiment.
+
+        Models with the same id but different content are renamed by appending the lowest integer suffix
+        (``_2``, ``_3``, ...) which doesn't collide with the id of another model. Similarly, the ids of the data
+        generators and data sets, which are formed by prefixing the ids of the variables with the ids of the
+        simulation experiments, are suffixed when they collide (e.g., simulation ``scan`` and variable ``high_S1``,
+        and simulation ``scan_high`` and variable ``S1``).
+
+        Args:
+            sims (:obj:`list` of :obj:`Simulation`): Simulation experiments
+            filename (:obj:`str` or file-like object): Path to save simulation experiments in SED-ML format, or a
+                binary or text file-like object to write them to
+            level (:obj:`int`, optional): SED-ML level
+            version (:obj:`int`, optional): SED-ML version
+            error_checking (:obj:`str`, optional): error checking mode (``eager`` or ``deferred``)
+
+        Returns:
+            :obj:`libsedml.SedDocument`: SED document
+
+        Raises:
+            :obj:`NotImplementedError`: the error checking mode is not supported
+            :obj:`ValueError`: there are no simulation experiments, the ids of the simulation experiments aren't
+                unique, the metadata of the simulation experiments is different, or the SED-ML version of a
+                simulation and the desired output version are different
+        """
+        if not sims:
+            raise ValueError('At least one simulation must be written')
+        for sim in sims:
+            if sim.format.id != 'SED-ML' or sim.format.version != 'L{}V{}'.format(level, version):
+                raise ValueError('Format must be SED-ML L{}V{}'.format(level, version))
+        if len(set(sim.id for sim in sims)) < len(sims):
+            raise ValueError('Simulations must have unique ids')
+        for attr in ['description', 'tags', 'authors', 'references', 'license']:
+            for sim in sims[1:]:
+                if getattr(sim, attr) != getattr(sims[0], attr):
+                    raise ValueError('Simulations must have the same {}: the {} of {} and {} are different'.format(
+                        attr, attr, sims[0].id, sim.id))
+
+        self._num_meta_id = 0
+        self._data_gen_ids = set()
+        self._data_set_ids = set()
+        self._init_error_checking(error_checking)
+
+        doc_sed = self._create_doc(level, version)
+        self._add_metadata_to_obj(sims[0], doc_sed, doc_sed)
+        self._check_error_log(doc_sed, doc_sed)
+
+        key_to_model_sed = {}
+        model_ids = set()
+        key_to_sim_sed = {}
+        for sim in sims:
+            model_key = self._get_model_key(sim)
+            model_sed = key_to_model_sed.get(model_key, None)
+            if model_sed is None:
+                model_sed = self._add_model_to_doc(sim.model, doc_sed)
+                if model_sed.getId() in model_ids:
+                    self._call_libsedml_setter(doc_sed, model_sed, 'setId', self._get_unique_id(model_sed.getId(), model_ids))
+                else:
+                    model_ids.add(model_sed.getId())
+                self._add_parameter_changes_to_model(sim.model_parameter_changes, doc_sed, model_sed)
+                self._check_error_log(doc_sed, model_sed)
+                key_to_model_sed[model_key] = model_sed
+
+            sim_key = self._get_sim_key(sim)
+            sim_sed = key_to_sim_sed.get(sim_key, None)
+            if sim_sed is None:
+                sim_sed = self._add_sim_to_doc(sim, doc_sed)
+                alg_sed = self._add_algorithm_to_sim(sim.algorithm, doc_sed, sim_sed)
+                self._add_param_changes_to_alg(sim.algorithm_parameter_changes, doc_sed, alg_sed)
+                self._check_error_log(doc_sed, sim_sed)
+                key_to_sim_sed[sim_key] = sim_sed
+
+            task_sed = self._add_sim_task_to_doc(sim.id, sim.name, doc_sed, model_sed, sim_sed)
+            self._check_error_log(doc_sed, task_sed)
+
+            report_sed = self._add_report_to_doc(sim.id, sim.name, doc_sed)
+            time_gen_sed = self._add_data_gen_to_doc('{}_time'.format(sim.id), 'time', doc_sed)
+            self._add_var_to_data_gen('time', 'time', 'urn:sedml:symbol:time', doc_sed, time_gen_sed, task_sed)
+            self._add_data_set_to_report('{}_time'.format(sim.id), 'time', doc_sed, report_sed, time_gen_sed)
+
+            self._add_task_results_to_report(sim.model.variables, doc_sed, task_sed, report_sed,
+                                             id_prefix=sim.id + '_', reuse_data_gens=True)
+            self._check_error_log(doc_sed, report_sed)
+
+        self._export_doc(doc_sed, filename)
+
+        return doc_sed
+
+    def _init_error_checking(self, error_checking):
+        """ Set the error checking mode
+
+        Args:
+            error_checking (:obj:`str`): error checking mode (``eager`` or ``deferred``)
+
+        Raises:
+            :obj:`NotImplementedError`: the error checking mode is not supported
+        """
+        if error_checking not in self.ERROR_CHECKING_MODES:
+            raise NotImplementedError("Error checking mode {} is not supported".format(error_checking))
+        self._error_checking = error_checking
+
+    def _check_error_log(self, doc_sed, obj_sed):
+        """ In deferred error checking mode, check the error log of a SED document after a top-level element
+        has been added to the document
+
+        Args:
+            doc_sed (:obj:`libsedml.SedDocument`): SED document
+            obj_sed (:obj:`libsedml.SedBase`): SED object which was added to the document
+
+        Raises:
+            :obj:`ValueError`: if there was a libSED-ML error
+        """
+        if self._error_checking == 'deferred' and doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR):
+            raise ValueError('libsedml error in {}: {}'.format(
+                self._get_obj_description(obj_sed), doc_sed.getErrorLog().toString()))
+
+    @staticmethod
+    def _get_obj_description(obj_sed):
+        """ Get a description of a SED object for error messages
+
+        Args:
+            obj_sed (:obj:`libsedml.SedBase`): SED object
+
+        Returns:
+            :obj:`str`: element name and, if the object has an id, its id
+        """
+        if obj_sed.getId():
+            return "{} '{}'".format(obj_sed.getElementName(), obj_sed.getId())
+        return obj_sed.getElementName()
+
+    @staticmethod
+    def _get_model_key(sim):
+        """ Get a key which identifies the content of the model of a simulation experiment and its parameter changes
+
+        Args:
+            sim (:obj:`Simulation`): simulation experiment
+
+        Returns:
+            :obj:`str`: key
+        """
+        model = sim.model
+        return json.dumps([
+            model.id,
+            model.name,
+            model.file.name if model.file else None,
+            model.format.sed_urn if model.format else None,
+            [change.to_json() for change in sim.model_parameter_changes],
+        ], sort_keys=True)
+
+    @staticmethod
+    def _get_sim_key(sim):
+        """ Get a key which identifies the content of the simulation of a simulation experiment
+
+        Args:
+            sim (:obj:`Simulation`): simulation experiment
+
+        Returns:
+            :obj:`str`: key
+        """
+        if isinstance(sim, TimecourseSimulation):
+            time_course = [sim.start_time, sim.output_start_time, sim.end_time, sim.num_time_points]
+        else:
+            time_course = None
+        return json.dumps([
+            sim.__class__.__name__,
+            time_course,
+            sim.algorithm.to_json() if sim.algorithm else None,
+            [change.to_json() for change in sim.algorithm_parameter_changes],
+        ], sort_keys=True)
+
     def _create_doc(self, level, version):
         """ Create a SED document
 
@@ -95,8 +319,8 @@ class SedMlSimulationWriter(SimulationWriter):
             :obj:`libsedml.SedDocument`: SED document
         """
         doc_sed = libsedml.SedDocument()
-        self._call_libsedml_method(doc_sed, doc_sed, 'setLevel', level)
-        self._call_libsedml_method(doc_sed, doc_sed, 'setVersion', version)
+        self._call_libsedml_setter(doc_sed, doc_sed, 'setLevel', level)
+        self._call_libsedml_setter(doc_sed, doc_sed, 'setVersion', version)
         return doc_sed
 
     def _add_metadata_to_obj(self, obj, doc_sed, obj_sed):
@@ -228,13 +452,13 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         model_sed = doc_sed.createModel()
         if model.id:
-            self._call_libsedml_method(doc_sed, model_sed, 'setId', model.id)
+            self._call_libsedml_setter(doc_sed, model_sed, 'setId', model.id)
         if model.name:
-            self._call_libsedml_method(doc_sed, model_sed, 'setName', model.name)
+            self._call_libsedml_setter(doc_sed, model_sed, 'setName', model.name)
         if model.file and model.file.name:
-            self._call_libsedml_method(doc_sed, model_sed, 'setSource', model.file.name)
+            self._call_libsedml_setter(doc_sed, model_sed, 'setSource', model.file.name)
         if model.format and model.format.sed_urn:
-            self._call_libsedml_method(doc_sed, model_sed, 'setLanguage', model.format.sed_urn)
+            self._call_libsedml_setter(doc_sed, model_sed, 'setLanguage', model.format.sed_urn)
         return model_sed
 
     def _add_parameter_changes_to_model(self, changes, doc_sed, model_sed):
@@ -266,7 +490,7 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         change_sed = model_sed.createChangeAttribute()
 
-        self._call_libsedml_method(doc_sed, change_sed, 'setTarget', change.parameter.target)
+        self._call_libsedml_setter(doc_sed, change_sed, 'setTarget', str(change.parameter.target))
 
         metadata = []
         if change.parameter.id:
@@ -285,7 +509,7 @@ class SedMlSimulationWriter(SimulationWriter):
             self._set_meta_id(doc_sed, change_sed)
             self._add_annotation_to_obj(metadata, doc_sed, change_sed, set(['dc']))
 
-        self._call_libsedml_method(doc_sed, change_sed, 'setNewValue', str(change.value))
+        self._call_libsedml_setter(doc_sed, change_sed, 'setNewValue', str(change.value))
         return change_sed
 
     def _add_sim_to_doc(self, sim, doc_sed):
@@ -300,17 +524,17 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         if isinstance(sim, TimecourseSimulation):
             sim_sed = doc_sed.createUniformTimeCourse()
-            self._call_libsedml_method(doc_sed, sim_sed, 'setInitialTime', sim.start_time)
-            self._call_libsedml_method(doc_sed, sim_sed, 'setOutputStartTime', sim.output_start_time)
-            self._call_libsedml_method(doc_sed, sim_sed, 'setOutputEndTime', sim.end_time)
-            self._call_libsedml_method(doc_sed, sim_sed, 'setNumberOfPoints', sim.num_time_points)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setInitialTime', sim.start_time)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setOutputStartTime', sim.output_start_time)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setOutputEndTime', sim.end_time)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setNumberOfPoints', sim.num_time_points)
         else:
             sim_sed = doc_sed.createSteadyState()
 
         if sim.id:
-            self._call_libsedml_method(doc_sed, sim_sed, 'setId', sim.id)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setId', sim.id)
         if sim.name:
-            self._call_libsedml_method(doc_sed, sim_sed, 'setName', sim.name)
+            self._call_libsedml_setter(doc_sed, sim_sed, 'setName', sim.name)
 
         return sim_sed
 
@@ -327,7 +551,7 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         alg_sed = sim_sed.createAlgorithm()
         if algorithm.kisao_term:
-            self._call_libsedml_method(doc_sed, alg_sed, 'setKisaoID', algorithm.kisao_term.ontology + ':' + algorithm.kisao_term.id)
+            self._call_libsedml_setter(doc_sed, alg_sed, 'setKisaoID', algorithm.kisao_term.ontology + ':' + algorithm.kisao_term.id)
 
         annotations_xml = []
 
@@ -381,7 +605,7 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         param_sed = alg_sed.createAlgorithmParameter()
         if change.parameter.kisao_term:
-            self._call_libsedml_method(doc_sed, param_sed, 'setKisaoID',
+            self._call_libsedml_setter(doc_sed, param_sed, 'setKisaoID',
                                        change.parameter.kisao_term.ontology + ':' + change.parameter.kisao_term.id)
         annotations_xml = []
 
@@ -403,7 +627,7 @@ class SedMlSimulationWriter(SimulationWriter):
             # self._set_meta_id(doc_sed, param_sed)
             self._add_annotation_to_obj(annotations_xml, doc_sed, param_sed, set(['dc']))
 
-        self._call_libsedml_method(doc_sed, param_sed, 'setValue', str(change.value))
+        self._call_libsedml_setter(doc_sed, param_sed, 'setValue', str(change.value))
         return param_sed
 
     def _add_sim_task_to_doc(self, id, name, doc_sed, model_sed, sim_sed):
@@ -421,11 +645,11 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         task_sed = doc_sed.createTask()
         if id:
-            self._call_libsedml_method(doc_sed, task_sed, 'setId', id)
+            self._call_libsedml_setter(doc_sed, task_sed, 'setId', id)
         if name:
-            self._call_libsedml_method(doc_sed, task_sed, 'setName', name)
-        self._call_libsedml_method(doc_sed, task_sed, 'setModelReference', model_sed.getId())
-        self._call_libsedml_method(doc_sed, task_sed, 'setSimulationReference', sim_sed.getId())
+            self._call_libsedml_setter(doc_sed, task_sed, 'setName', name)
+        self._call_libsedml_setter(doc_sed, task_sed, 'setModelReference', model_sed.getId())
+        self._call_libsedml_setter(doc_sed, task_sed, 'setSimulationReference', sim_sed.getId())
         return task_sed
 
     def _add_report_to_doc(self, id, name, doc_sed):
@@ -440,14 +664,36 @@ class SedMlSimulationWriter(SimulationWriter):
             :obj:`libsedml.SedReport`: SED report
         """
         report_sed = doc_sed.createReport()
-        self._call_libsedml_method(doc_sed, report_sed, 'setId', id)
+        self._call_libsedml_setter(doc_sed, report_sed, 'setId', id)
         if name:
-            self._call_libsedml_method(doc_sed, report_sed, 'setName', name)
+            self._call_libsedml_setter(doc_sed, report_sed, 'setName', name)
         return report_sed
 
+    @staticmethod
+    def _get_unique_id(id, ids):
+        """ Get an id which is different from the ids which have already been issued by appending the lowest
+        integer suffix (``_2``, ``_3``, ...) which doesn't collide with another id, and record the id as issued
+
+        Args:
+            id (:obj:`str`): desired id
+            ids (:obj:`set` of :obj:`str`): ids which have already been issued
+
+        Returns:
+            :obj:`str`: unique id
+        """
+        unique_id = id
+        i_id = 2
+        while unique_id in ids:
+            unique_id = '{}_{}'.format(id, i_id)
+            i_id += 1
+        ids.add(unique_id)
+        return unique_id
+
     def _add_data_gen_to_doc(self, id, name, doc_sed):
         """ Add a data generator to a SED document
 
+        If the id has already been used by another data generator, the id is suffixed to make it unique.
+
         Args:
             id (:obj:`str`): id
             name (:obj:`str`): name
@@ -457,8 +703,8 @@ class SedMlSimulationWriter(SimulationWriter):
             :obj:`libsedml.SedDataGenerator`: SED data generator
         """
         data_gen_sed = doc_sed.createDataGenerator()
-        self._call_libsedml_method(doc_sed, data_gen_sed, 'setId', id)
-        self._call_libsedml_method(doc_sed, data_gen_sed, 'setName', name)
+        self._call_libsedml_setter(doc_sed, data_gen_sed, 'setId', self._get_unique_id(id, self._data_gen_ids))
+        self._call_libsedml_setter(doc_sed, data_gen_sed, 'setName', name)
         return data_gen_sed
 
     def _add_var_to_data_gen(self, id, name, symbol, doc_sed, data_gen_sed, task_sed):
@@ -476,17 +722,19 @@ class SedMlSimulationWriter(SimulationWriter):
             :obj:`libsedml.SedVariable`: SED variable
         """
         var_sed = data_gen_sed.createVariable()
-        self._call_libsedml_method(doc_sed, var_sed, 'setId', id)
-        self._call_libsedml_method(doc_sed, var_sed, 'setName', name)
-        self._call_libsedml_method(doc_sed, var_sed, 'setTaskReference', task_sed.getId())
+        self._call_libsedml_setter(doc_sed, var_sed, 'setId', id)
+        self._call_libsedml_setter(doc_sed, var_sed, 'setName', name)
+        self._call_libsedml_setter(doc_sed, var_sed, 'setTaskReference', task_sed.getId())
         if symbol:
-            self._call_libsedml_method(doc_sed, var_sed, 'setSymbol', symbol)
-        self._call_libsedml_method(doc_sed, data_gen_sed, 'setMath', libsedml.parseFormula(var_sed.getId()))
+            self._call_libsedml_setter(doc_sed, var_sed, 'setSymbol', symbol)
+        self._call_libsedml_setter(doc_sed, data_gen_sed, 'setMath', libsedml.parseFormula(var_sed.getId()))
         return var_sed
 
     def _add_data_set_to_report(self, id, name, doc_sed, report_sed, data_gen_sed):
         """ Add a dataset to a SED report
 
+        If the id has already been used by another data set, the id is suffixed to make it unique.
+
         Args:
             id (:obj:`str`): id
             name (:obj:`str`): name
@@ -498,12 +746,12 @@ class SedMlSimulationWriter(SimulationWriter):
             :obj:`libsedml.SedDataSet`: SED data set
         """
         dataset_sed = report_sed.createDataSet()
-        self._call_libsedml_method(doc_sed, dataset_sed, 'setId', id)
-        self._call_libsedml_method(doc_sed, dataset_sed, 'setLabel', name)
-        self._call_libsedml_method(doc_sed, dataset_sed, 'setDataReference', data_gen_sed.getId())
+        self._call_libsedml_setter(doc_sed, dataset_sed, 'setId', self._get_unique_id(id, self._data_set_ids))
+        self._call_libsedml_setter(doc_sed, dataset_sed, 'setLabel', name)
+        self._call_libsedml_setter(doc_sed, dataset_sed, 'setDataReference', data_gen_sed.getId())
         return dataset_sed
 
-    def _add_task_results_to_report(self, vars, doc_sed, task_sed, report_sed):
+    def _add_task_results_to_report(self, vars, doc_sed, task_sed, report_sed, id_prefix='', reuse_data_gens=False):
         """ Add simulation predictions to a SED report
 
         Args:
@@ -511,22 +759,30 @@ class SedMlSimulationWriter(SimulationWriter):
             doc_sed (:obj:`libsedml.SedDocument`): SED document
             task_sed (:obj:`libsedml.SedTask`): SED task
             report_sed (:obj:`libsedml.SedReport`): SED report
+            id_prefix (:obj:`str`, optional): prefix for the ids of the data generators and data sets
+            reuse_data_gens (:obj:`bool`, optional): if :obj:`True`, use a single data generator for
+                variables which have the same target
 
         Returns:
             :obj:`list` of :obj:`dict`: list of dictionary of data generators and variables for each
                 simulation prediction
         """
         seds = []
+        target_to_sed = {}
         for var in vars:
             id = var.id
-            data_gen_sed = self._add_data_gen_to_doc(id, id, doc_sed)
-            var_sed = self._add_var_to_data_gen(id, id, None, doc_sed, data_gen_sed, task_sed)
-            self._call_libsedml_method(doc_sed, var_sed, 'setTarget', var.target)
-            self._add_data_set_to_report(id, id, doc_sed, report_sed, data_gen_sed)
-            seds.append({
-                'data_gen': data_gen_sed,
-                'var': var_sed,
-            })
+            target = str(var.target)
+            sed = target_to_sed.get(target, None) if reuse_data_gens else None
+            if sed is None:
+                data_gen_sed = self._add_data_gen_to_doc(id_prefix + id, id, doc_sed)
+                var_sed = self._add_var_to_data_gen(id, id, None, doc_sed, data_gen_sed, task_sed)
+                self._call_libsedml_setter(doc_sed, var_sed, 'setTarget', target)
+                sed = target_to_sed[target] = {
+                    'data_gen': data_gen_sed,
+                    'var': var_sed,
+                }
+            self._add_data_set_to_report(id_prefix + id, id, doc_sed, report_sed, sed['data_gen'])
+            seds.append(sed)
         return seds
 
     def _add_viz_to_doc(self, visualization, doc_sed):
@@ -589,8 +845,18 @@ class SedMlSimulationWriter(SimulationWriter):
 
         Args:
             doc_sed (:obj:`libsedml.SedDocument`): SED document
-            filename (:obj:`str`): path to save document in XML format
+            filename (:obj:`str` or file-like object): path to save document in XML format, or a binary or
+                text file-like object to write it to
         """
+        # write the SED document to a file-like object
+        if hasattr(filename, 'write'):
+            xml = libsedml.writeSedMLToString(doc_sed)
+            if isinstance(filename, io.TextIOBase):
+                filename.write(xml)
+            else:
+                filename.write(xml.encode())
+            return
+
         # save the SED document to a file
         libsedml.writeSedML(doc_sed, filename)
 
@@ -601,7 +867,7 @@ class SedMlSimulationWriter(SimulationWriter):
             obj_sed (:obj:`libsedml.SedBase`): SED object
         """
         self._num_meta_id += 1
-        self._call_libsedml_method(doc_sed, obj_sed, 'setMetaId', '_{:08d}'.format(self._num_meta_id))
+        self._call_libsedml_setter(doc_sed, obj_sed, 'setMetaId', '_{:08d}'.format(self._num_meta_id))
 
     def _add_annotation_to_obj(self, nodes, doc_sed, obj_sed, namespaces):
         """ Add annotation to a SED object
@@ -620,32 +886,59 @@ class SedMlSimulationWriter(SimulationWriter):
                 about_xml = ''
 
             namespaces.add('rdf')
-            namespaces_xml = []
-            if 'rdf' in namespaces:
-                namespaces_xml.append(' xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"')
-            if 'dc' in namespaces:
-                namespaces_xml.append(' xmlns:dc="http://purl.org/dc/elements/1.1/"')
-            if 'dcterms' in namespaces:
-                namespaces_xml.append(' xmlns:dcterms="http://purl.org/dc/terms/"')
-            if 'vcard' in namespaces:
-                namespaces_xml.append(' xmlns:vcard="http://www.w3.org/2001/vcard-rdf/3.0#"')
-            if 'bibo' in namespaces:
-                namespaces_xml.append(' xmlns:bibo="http://purl.org/ontology/bibo/"')
-
-            self._call_libsedml_method(doc_sed, obj_sed, 'setAnnotation',
-                                       ('<annotation>'
-                                        '  <rdf:RDF{}>'
-                                        '    <rdf:Description{}>'
-                                        '    {}'
-                                        '    </rdf:Description>'
-                                        '  </rdf:RDF>'
-                                        '  </annotation>').format(
-                                           ''.join(namespaces_xml),
-                                           about_xml,
-                                           ''.join(node.encode() for node in nodes)))
+            parts = [
+                '<annotation>'
+                '  <rdf:RDF', self._get_namespaces_xml(frozenset(namespaces)), '>'
+                '    <rdf:Description', about_xml, '>'
+                '    '
+            ]
+            for node in nodes:
+                node.encode_to(parts)
+            parts.append('    </rdf:Description>'
+                         '  </rdf:RDF>'
+                         '  </annotation>')
+
+            self._call_libsedml_setter(doc_sed, obj_sed, 'setAnnotation', ''.join(parts))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_namespaces_xml(namespaces):
+        """ Get the XML declarations of the namespaces of an annotation
+
+        Args:
+            namespaces (:obj:`frozenset` of :obj:`str`): prefixes of the namespaces
+
+        Returns:
+            :obj:`str`: XML declarations of the namespaces
+        """
+        return ''.join(' xmlns:{}="{}"'.format(prefix, uri)
+                       for prefix, uri in ANNOTATION_NAMESPACES.items()
+                       if prefix in namespaces)
+
+    def _call_libsedml_setter(self, doc_sed, obj_sed, method_name, *args, **kwargs):
+        """ Call a method of a SED object and check if there's an error according to the error checking mode
+
+        In deferred mode, only the return code of the method is checked; the error log of the document is
+        checked by :obj:`_check_error_log`.
+
+        Args:
+            doc_sed (:obj:`libsedml.SedDocument`): SED document
+            obj_sed (:obj:`libsedml.SedBase`): SED object
+            method_name (:obj:`str`): method name
+            *args (:obj:`list`): positional arguments to the method
+            **kwargs (:obj:`dict`, optional): keyword arguments to the method
+
+        Returns:
+            :obj:`int`: libsedml return code
+
+        Raises:
+            :obj:`ValueError`: if there was a libSED-ML error
+        """
+        return self._call_libsedml_method(doc_sed, obj_sed, method_name, *args,
+                                          check_error_log=self._error_checking == 'eager', **kwargs)
 
     @staticmethod
-    def _call_libsedml_method(doc_sed, obj_sed, method_name, *args, **kwargs):
+    def _call_libsedml_method(doc_sed, obj_sed, method_name, *args, check_error_log=True, **kwargs):
         """ Call a method of a SED object and check if there's an error
 
         Args:
@@ -653,6 +946,8 @@ class SedMlSimulationWriter(SimulationWriter):
             obj_sed (:obj:`libsedml.SedBase`): SED object
             method_name (:obj:`str`): method name
             *args (:obj:`list`): positional arguments to the method
+            check_error_log (:obj:`bool`, optional): if :obj:`True`, check the error log of the document in
+                addition to the return code of the method
             **kwargs (:obj:`dict`, optional): keyword arguments to the method
 
         Returns:
@@ -663,141 +958,297 @@ class SedMlSimulationWriter(SimulationWriter):
         """
         method = getattr(obj_sed, method_name)
         return_val = method(*args, **kwargs)
-        if return_val != 0 or doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR):
+        if return_val != 0:
+            raise ValueError('libsedml error: {} of {} failed with code {}: {}'.format(
+                method_name, SedMlSimulationWriter._get_obj_description(obj_sed), return_val, doc_sed.getErrorLog().toString()))
+        if check_error_log and doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR):
             raise ValueError('libsedml error: {}'.format(doc_sed.getErrorLog().toString()))
         return return_val
 
 
+class SedMlDocumentSpecs(object):
+    """ Decoded models, simulations, and metadata of a SED document, which are shared by the tasks of the document
+
+    Attributes:
+        models (:obj:`dict`): dictionary that maps the ids of SED models to simulations whose models and model
+            parameter changes were read from the SED models
+        default_model (:obj:`Simulation`): model used for tasks whose model references are invalid, or :obj:`None`
+        sims (:obj:`dict`): dictionary that maps the ids of SED simulations to the simulations read from them
+        default_sim (:obj:`Simulation`): simulation used for tasks whose simulation references are invalid, or :obj:`None`
+        metadata (:obj:`Simulation`): simulation whose metadata was read from the document
+        task_id_to_vars (:obj:`dict`): dictionary that maps the ids of tasks to lists of the ids and targets of the model
+            variables which their data generators record
+    """
+
+    def __init__(self):
+        self.models = {}
+        self.default_model = None
+        self.sims = {}
+        self.default_sim = None
+        self.metadata = None
+        self.task_id_to_vars = {}
+
+
 class SedMlSimulationReader(SimulationReader):
     """ SED-ML reader
 
+    Documents can be read with profiles which skip the parts of documents that some callers don't need
+
+    * ``full``: read the simulations of the tasks and the visualization of the document
+    * ``tasks_only``: read the simulations of the tasks, including their models, but not the data
+      generators or visualization of the document
+
+    Problems with documents which the reader works around, such as elements which aren't supported, are
+    recorded as diagnostics, reported as instances of :obj:`SimulationIoWarning`, and logged.
+
     Attributes:
+        diagnostics (:obj:`list` of :obj:`SimulationIoDiagnostic`): problems encountered while reading the last document
         _filename (:obj:`str`): Path to save simulation experiment in SED-ML format
         _logger (:obj:`logging.Logger`): logger
+        _annotation_parser (:obj:`etree.XMLParser`): parser for the annotations of SED objects
+        _annotation_wrapper (:obj:`str`): template for wrapping annotations into elements which declare the
+            namespaces of :obj:`ANNOTATION_NAMESPACES`
     """
 
+    PROFILES = ('full', 'tasks_only')
+
     def __init__(self):
+        self.diagnostics = []
         self._logger = get_logger('sedml')
+        self._annotation_parser = etree.XMLParser(remove_comments=True, remove_pis=True)
+        self._annotation_wrapper = '<annotations{}>{{}}</annotations>'.format(''.join(
+            ' xmlns:{}="{}"'.format(prefix, uri) for prefix, uri in ANNOTATION_NAMESPACES.items()))
 
-    def run(self, filename):
+    def run(self, filename, profile='full'):
         """ Base class for reading a simulation experiment from a SED document
 
         Args:
-            filename (:obj:`str`): path to SED-ML document that describes a simulation experiment
+            filename (:obj:`str`, :obj:`bytes`, or file-like object): path to SED-ML document that describes a
+                simulation experiment, the contents of the document, or a file-like object from which to read it
+            profile (:obj:`str`, optional): profile which determines which parts of the document are read
+                (see :obj:`PROFILES`)
 
         Returns:
             :obj:`tuple`:
 
                 * :obj:`list` of :obj:`Simulation`: simulations
-                * :obj:`Visualization`: visualization
+                * :obj:`Visualization`: visualization, or :obj:`None` if the profile doesn't include
+                  visualizations
 
         Raises:
+            :obj:`NotImplementedError`: the profile is not supported
             :obj:`SimulationIoError`: if any of the following conditions are met
 
                 * The SED document contains changes other than instances of SedChangeAttribute
                 * The models or simulations don't have unique ids
                 * A model or simulation references cannot be resolved
         """
-        self._filename = filename
+        if profile not in self.PROFILES:
+            raise NotImplementedError("Profile {} is not supported".format(profile))
+        read_visualization = profile == 'full'
 
-        doc_sed = libsedml.readSedMLFromFile(filename)
+        filename = read_source(filename)
+        self._filename = get_source_name(filename)
+        self.diagnostics = []
+
+        if isinstance(filename, bytes):
+            doc_sed = libsedml.readSedMLFromString(filename.decode())
+        else:
+            doc_sed = libsedml.readSedMLFromFile(filename)
         if doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR):
             raise SimulationIoError('libsedml error: {}'.format(doc_sed.getErrorLog().toString()))
 
-        models_sed = {}
-        default_model_sed = None
-        default_model = None
+        # decode the models, simulations, and metadata once; tasks which share them receive copies
+        specs = self._read_specs(doc_sed)
+        specs.task_id_to_vars = self._index_model_variables(doc_sed)
+
+        # read a simulation for each task
+        sims = []
+        task_id_to_sim = {}
+        task_id_target_to_var = {}
+        for task_sed in doc_sed.getListOfTasks():
+            if not isinstance(task_sed, libsedml.SedTask):
+                self._warn_unsupported_task(task_sed.__class__.__name__, task_sed.getId())
+                continue
+
+            sim = self._read_task(task_sed.getId(), task_sed.getName(), task_sed.getModelReference(),
+                                  task_sed.getSimulationReference(), specs)
+            sims.append(sim)
+            if read_visualization:
+                self._index_task_sim(task_sed.getId(), sim, task_id_to_sim, task_id_target_to_var)
+
+        if not read_visualization:
+            return (sims, None)
+
+        # data generators
+        data_gen_id_to_task_id, data_gen_id_to_var_target, time_data_gen_ids = self._index_data_generators(doc_sed)
+
+        # visualizations (Output > Plot2D)
+        viz = self._read_visualization(doc_sed.getListOfOutputs(), data_gen_id_to_task_id, data_gen_id_to_var_target,
+                                       time_data_gen_ids, task_id_to_sim, task_id_target_to_var)
+
+        # return simulations and visualizations
+        return (sims, viz)
+
+    def _read_specs(self, doc_sed):
+        """ Decode the models, simulations, and metadata of a SED document
+
+        Args:
+            doc_sed (:obj:`libsedml.SedDocument`): SED document
+
+        Returns:
+            :obj:`SedMlDocumentSpecs`: decoded models, simulations, and metadata
+
+        Raises:
+            :obj:`SimulationIoError`: if the document contains changes other than attribute changes, or
+                the models or simulations don't have unique ids
+        """
+        specs = SedMlDocumentSpecs()
+
         for i_model, model_sed in enumerate(doc_sed.getListOfModels()):
             for change_sed in model_sed.getListOfChanges():
                 assert_exception(isinstance(change_sed, libsedml.SedChangeAttribute),
-                                 SimulationIoError("Changes in {} must be attribute changes".format(filename)))
-            assert_exception(model_sed.getId() not in models_sed, SimulationIoError("Models in {} must have unique ids".format(filename)))
-            models_sed[model_sed.getId()] = model_sed
+                                 SimulationIoError("Changes in {} must be attribute changes".format(self._filename)))
+            assert_exception(model_sed.getId() not in specs.models,
+                             SimulationIoError("Models in {} must have unique ids".format(self._filename)))
 
             model = Simulation()
             self._read_model(model_sed, model)
+            specs.models[model_sed.getId()] = model
             if i_model == 0:
-                default_model_sed = model_sed
-                default_model = model
-            elif model != default_model:
-                default_model_sed = None
-                default_model = None
-
-        sims_sed = {}
-        default_sim_sed = None
-        default_sim = None
-        for sim_sed in doc_sed.getListOfSimulations():
-            assert_exception(sim_sed.getId() not in sims_sed, SimulationIoError("Simulations in {} must have unique ids".format(filename)))
-            sims_sed[sim_sed.getId()] = sim_sed
+                specs.default_model = model
+            elif model != specs.default_model:
+                specs.default_model = None
+
+        for i_sim, sim_sed in enumerate(doc_sed.getListOfSimulations()):
+            assert_exception(sim_sed.getId() not in specs.sims,
+                             SimulationIoError("Simulations in {} must have unique ids".format(self._filename)))
 
             sim = self._create_sim(sim_sed)
-            self._read_sim(sim_sed, filename, sim)
-            if i_model == 0:
-                default_sim_sed = sim_sed
-                default_sim = sim
-            elif sim != default_sim:
-                default_sim_sed = None
-                default_sim = None
+            self._read_sim(sim_sed, self._filename, sim)
+            specs.sims[sim_sed.getId()] = sim
+            if i_sim == 0:
+                specs.default_sim = sim
+            elif sim != specs.default_sim:
+                specs.default_sim = None
 
-        # initialize simulation experiment with metadata
-        sims = []
-        task_id_to_sim = {}
-        for task_sed in doc_sed.getListOfTasks():
-            if not isinstance(task_sed, libsedml.SedTask):
-                warnings.warn(
-                    '{} {} of {} is not supported'.format(
-                        task_sed.__class__.__name__, task_sed.getId(), os.path.basename(filename)),
-                    SimulationIoWarning)
-                continue
+        specs.metadata = Simulation()
+        self._read_metadata(doc_sed, specs.metadata)
 
-            # simulation
-            sim_sed = sims_sed.get(task_sed.getSimulationReference(), default_sim_sed)
-            if not sim_sed:
-                sim_sed = default_sim_sed
-                self._logger.log(logging.ERROR, '{}: simulation reference {} is invalid'.format(
-                    self._filename, task_sed.getSimulationReference()))
-            assert_exception(sim_sed is not None, SimulationIoError("Simulation {} in {} cannot be determined".format(
-                task_sed.getSimulationReference(), filename)))
+        return specs
 
-            sim = self._create_sim(sim_sed)
-            sim.id = task_sed.getId() or None
-            sim.name = task_sed.getName() or None
-            self._read_sim(sim_sed, filename, sim)
-
-            # model
-            model_sed = models_sed.get(task_sed.getModelReference(), None)
-            if not model_sed:
-                model_sed = default_model_sed
-                self._logger.log(logging.ERROR, '{}: model reference {} is invalid'.format(self._filename, task_sed.getModelReference()))
-            assert_exception(model_sed is not None, SimulationIoError("Model {} in {} cannot be determined".format(
-                task_sed.getModelReference(), filename)))
-            self._read_model(model_sed, sim)
-            self._read_model_variables(task_sed, sim)
-
-            # metadata
-            self._read_metadata(doc_sed, sim)
-
-            # append simulation to list of simulations
-            sims.append(sim)
-            task_id = task_sed.getId()
-            if task_id in task_id_to_sim:
-                warnings.warn('Tasks of {} must have unique ids'.format(os.path.basename(filename)), SimulationIoWarning)
-                self._logger.log(logging.ERROR, '{}: task id {} is not unique'.format(self._filename, task_id))
-                task_id_to_sim[task_id] = None
-            else:
-                task_id_to_sim[task_id] = sim
+    def _read_task(self, task_id, task_name, model_ref, sim_ref, specs):
+        """ Read a simulation for a SED task
 
-        # data generators
+        Args:
+            task_id (:obj:`str`): id of the task
+            task_name (:obj:`str`): name of the task
+            model_ref (:obj:`str`): id of the model of the task
+            sim_ref (:obj:`str`): id of the simulation of the task
+            specs (:obj:`SedMlDocumentSpecs`): decoded models, simulations, and metadata of the document of the task
+
+        Returns:
+            :obj:`Simulation`: simulation
+
+        Raises:
+            :obj:`SimulationIoError`: if the model or simulation of the task cannot be determined
+        """
+        # simulation
+        decoded_sim = specs.sims.get(sim_ref, specs.default_sim)
+        if not decoded_sim:
+            decoded_sim = specs.default_sim
+            self._logger.log(logging.ERROR, '{}: simulation reference {} is invalid'.format(self._filename, sim_ref))
+        assert_exception(decoded_sim is not None, SimulationIoError("Simulation {} in {} cannot be determined".format(
+            sim_ref, self._filename)))
+
+        sim = self._copy_decoded_sim(decoded_sim)
+        sim.id = task_id or None
+        sim.name = task_name or None
+
+        # model
+        decoded_model = specs.models.get(model_ref, None)
+        if not decoded_model:
+            decoded_model = specs.default_model
+            self._logger.log(logging.ERROR, '{}: model reference {} is invalid'.format(self._filename, model_ref))
+        assert_exception(decoded_model is not None, SimulationIoError("Model {} in {} cannot be determined".format(
+            model_ref, self._filename)))
+        self._copy_decoded_model(decoded_model, sim)
+        self._read_model_variables(task_id, sim, specs.task_id_to_vars)
+
+        # metadata
+        self._copy_metadata(specs.metadata, sim)
+
+        return sim
+
+    def _warn_unsupported_task(self, type, task_id):
+        """ Warn that a type of task is not supported
+
+        Args:
+            type (:obj:`str`): name of the type of the task (e.g., ``SedRepeatedTask``)
+            task_id (:obj:`str`): id of the task
+        """
+        self._report_problem(SimulationIoDiagnosticCategory.unsupported_task, task_id,
+                             '{} {} is not supported'.format(type, task_id),
+                             '{} {} of {} is not supported'.format(type, task_id, os.path.basename(self._filename)))
+
+    def _report_problem(self, category, obj_id, message, warning):
+        """ Record a problem with a document as a diagnostic, report it as a warning, and log it
+
+        Args:
+            category (:obj:`SimulationIoDiagnosticCategory`): category of the problem
+            obj_id (:obj:`str`): id of the object of the problem
+            message (:obj:`str`): description of the problem for the diagnostic and the log
+            warning (:obj:`str`): message of the warning
+        """
+        self.diagnostics.append(SimulationIoDiagnostic(category=category, obj_id=obj_id, message=message))
+        warnings.warn(warning, SimulationIoWarning)
+        self._logger.log(logging.ERROR, '{}: {}'.format(self._filename, message))
+
+    def _index_task_sim(self, task_id, sim, task_id_to_sim, task_id_target_to_var):
+        """ Index the simulation of a task and its model variables, so that the plots of a document can be resolved
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            sim (:obj:`Simulation`): simulation of the task
+            task_id_to_sim (:obj:`dict`): dictionary that maps the ids of tasks to their simulations, or :obj:`None`
+                if their ids are not unique
+            task_id_target_to_var (:obj:`dict`): dictionary that maps pairs of the ids of tasks and the targets of model
+                variables to model variables
+        """
+        if task_id in task_id_to_sim:
+            self._report_problem(SimulationIoDiagnosticCategory.duplicate_id, task_id,
+                                 'task id {} is not unique'.format(task_id),
+                                 'Tasks of {} must have unique ids'.format(os.path.basename(self._filename)))
+            task_id_to_sim[task_id] = None
+        else:
+            task_id_to_sim[task_id] = sim
+            for var in sim.model.variables:
+                task_id_target_to_var.setdefault((task_id, var.target), var)
+
+    def _index_data_generators(self, doc_sed):
+        """ Index the data generators of a SED document which record individual model variables or time
+
+        Args:
+            doc_sed (:obj:`libsedml.SedDocument`): SED document
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`dict`: dictionary that maps the ids of data generators to the ids of their tasks
+                * :obj:`dict`: dictionary that maps the ids of data generators to the targets of their model variables
+                * :obj:`set` of :obj:`str`: ids of the data generators that represent time
+        """
         data_gen_id_to_task_id = {}
         data_gen_id_to_var_target = {}
-        time_data_gen_ids = []
+        time_data_gen_ids = set()
         for data_gen_sed in doc_sed.getListOfDataGenerators():
             if data_gen_sed.getNumParameters() == 0 and data_gen_sed.getNumVariables() == 1 and data_gen_sed.getMath().isCiNumber():
                 var_sed = data_gen_sed.getVariable(0)
                 data_gen_id = data_gen_sed.getId()
                 if data_gen_id in data_gen_id_to_task_id:
-                    warnings.warn('Data generators of {} must have unique ids'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: data generator id {} is not unique'.format(self._filename, data_gen_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.duplicate_id, data_gen_id,
+                                         'data generator id {} is not unique'.format(data_gen_id),
+                                         'Data generators of {} must have unique ids'.format(os.path.basename(self._filename)))
                     data_gen_id_to_task_id[data_gen_id] = None
                     data_gen_id_to_var_target[data_gen_id] = None
                 else:
@@ -805,14 +1256,32 @@ class SedMlSimulationReader(SimulationReader):
                     if var_sed.getTarget():
                         data_gen_id_to_var_target[data_gen_id] = var_sed.getTarget()
                     elif var_sed.getSymbol() == 'urn:sedml:symbol:time':
-                        time_data_gen_ids.append(data_gen_id)
+                        time_data_gen_ids.add(data_gen_id)
+        return data_gen_id_to_task_id, data_gen_id_to_var_target, time_data_gen_ids
 
-        # visualizations (Output > Plot2D)
+    def _read_visualization(self, outputs_sed, data_gen_id_to_task_id, data_gen_id_to_var_target, time_data_gen_ids,
+                            task_id_to_sim, task_id_target_to_var):
+        """ Read a visualization from the 2D plots of a SED document
+
+        Args:
+            outputs_sed (:obj:`libsedml.SedListOfOutputs`): SED outputs
+            data_gen_id_to_task_id (:obj:`dict`): dictionary that maps the ids of data generators to the ids of their tasks
+            data_gen_id_to_var_target (:obj:`dict`): dictionary that maps the ids of data generators to the targets of model variables
+            time_data_gen_ids (:obj:`set` of :obj:`str`): set of ids of data generators that represent time
+            task_id_to_sim (:obj:`dict`): dictionary that maps the ids of tasks to simulations
+            task_id_target_to_var (:obj:`dict`): dictionary that maps pairs of the ids of tasks and the targets of model variables
+                to model variables
+
+        Returns:
+            :obj:`Visualization`: visualization, or :obj:`None` if the document doesn't have any supported plots
+        """
         viz = Visualization()
-        for output_sed in doc_sed.getListOfOutputs():
+        for output_sed in outputs_sed:
             if not isinstance(output_sed, libsedml.SedPlot2D):
-                warnings.warn('{} of {} is not supported'.format(
-                    output_sed.__class__.__name__, os.path.basename(filename)), SimulationIoWarning)
+                self._report_problem(SimulationIoDiagnosticCategory.unsupported_output, output_sed.getId(),
+                                     '{} {} is not supported'.format(output_sed.__class__.__name__, output_sed.getId()),
+                                     '{} of {} is not supported'.format(output_sed.__class__.__name__,
+                                                                        os.path.basename(self._filename)))
                 continue
 
             x_sim_results = []
@@ -824,36 +1293,42 @@ class SedMlSimulationReader(SimulationReader):
                 x_task_id = data_gen_id_to_task_id.get(x_data_gen_id, None)
                 y_task_id = data_gen_id_to_task_id.get(y_data_gen_id, None)
                 if not x_task_id:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: data generator {} cannot be resolved'.format(self._filename, x_data_gen_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, x_data_gen_id,
+                                         'data generator {} cannot be resolved'.format(x_data_gen_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
                 if not y_task_id:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: data generator {} cannot be resolved'.format(self._filename, y_data_gen_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, y_data_gen_id,
+                                         'data generator {} cannot be resolved'.format(y_data_gen_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
 
                 x_sim = task_id_to_sim.get(x_task_id, None)
                 y_sim = task_id_to_sim.get(y_task_id, None)
                 if not x_sim:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: task {} cannot be resolved'.format(self._filename, x_task_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, x_task_id,
+                                         'task {} cannot be resolved'.format(x_task_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
                 if not y_sim:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: task {} cannot be resolved'.format(self._filename, y_task_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, y_task_id,
+                                         'task {} cannot be resolved'.format(y_task_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
 
-                x_var = self._get_model_var_by_data_gen_id(x_data_gen_id, data_gen_id_to_var_target,
-                                                           time_data_gen_ids, x_sim.model.variables)
-                y_var = self._get_model_var_by_data_gen_id(y_data_gen_id, data_gen_id_to_var_target,
-                                                           time_data_gen_ids, y_sim.model.variables)
+                x_var = self._get_model_var_by_data_gen_id(x_data_gen_id, x_task_id, data_gen_id_to_var_target,
+                                                           time_data_gen_ids, task_id_target_to_var)
+                y_var = self._get_model_var_by_data_gen_id(y_data_gen_id, y_task_id, data_gen_id_to_var_target,
+                                                           time_data_gen_ids, task_id_target_to_var)
                 if not x_var:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: data generator {} cannot be resolved'.format(self._filename, x_data_gen_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, x_data_gen_id,
+                                         'data generator {} cannot be resolved'.format(x_data_gen_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
                 if not y_var:
-                    warnings.warn('Unable to interpret curve of {}'.format(os.path.basename(filename)), SimulationIoWarning)
-                    self._logger.log(logging.ERROR, '{}: data generator {} cannot be resolved'.format(self._filename, y_data_gen_id))
+                    self._report_problem(SimulationIoDiagnosticCategory.unresolved_reference, y_data_gen_id,
+                                         'data generator {} cannot be resolved'.format(y_data_gen_id),
+                                         'Unable to interpret curve of {}'.format(os.path.basename(self._filename)))
                     continue
 
                 x_sim_results.append(SimulationResult(simulation=x_sim, variable=x_var))
@@ -863,13 +1338,15 @@ class SedMlSimulationReader(SimulationReader):
                 x_sim_results = x_sim_results[slice(0, 1)]
             elif not all([sim_res.variable.target == 'urn:sedml:symbol:time' for sim_res in x_sim_results]) or \
                     len(set([curve_sed.getLogX() for curve_sed in output_sed.getListOfCurves()])) > 1:
-                warnings.warn('Curves of {} in {} must have the same X axis'.format(output_sed.getId(), filename), SimulationIoWarning)
-                self._logger.log(logging.ERROR, '{}: curves of {} have incompatible X axes'.format(self._filename, output_sed.getId()))
+                self._report_problem(SimulationIoDiagnosticCategory.incompatible_axes, output_sed.getId(),
+                                     'curves of {} have incompatible X axes'.format(output_sed.getId()),
+                                     'Curves of {} in {} must have the same X axis'.format(output_sed.getId(), self._filename))
                 continue
 
             if len(set([curve_sed.getLogY() for curve_sed in output_sed.getListOfCurves()])) > 1:
-                warnings.warn('Curves if {} in {} must have the same Y axis'.format(output_sed.getId(), filename), SimulationIoWarning)
-                self._logger.log(logging.ERROR, '{}: curves of {} have incompatible Y axes'.format(self._filename, output_sed.getId()))
+                self._report_problem(SimulationIoDiagnosticCategory.incompatible_axes, output_sed.getId(),
+                                     'curves of {} have incompatible Y axes'.format(output_sed.getId()),
+                                     'Curves if {} in {} must have the same Y axis'.format(output_sed.getId(), self._filename))
                 continue
 
             if not x_sim_results or not y_sim_results:
@@ -907,8 +1384,7 @@ class SedMlSimulationReader(SimulationReader):
         if not viz.layout:
             viz = None
 
-        # return simulations and visualizations
-        return (sims, viz)
+        return viz
 
     def _read_metadata(self, doc_sed, sim):
         """ Read metadata from a SED document
@@ -984,6 +1460,29 @@ class SedMlSimulationReader(SimulationReader):
         sim.format = copy.copy(SimulationFormat.sedml.value)
         sim.format.version = "L{}V{}".format(doc_sed.getLevel(), doc_sed.getVersion())
 
+    def _copy_metadata(self, metadata, sim):
+        """ Copy metadata read from a SED document to a simulation
+
+        Each simulation gets its own copies of the authors and references, so that they can be modified
+        independently.
+
+        Args:
+            metadata (:obj:`Simulation`): simulation whose metadata was read by :obj:`_read_metadata`
+            sim (:obj:`Simulation`): simulation
+        """
+        if metadata.description is not None:
+            sim.description = metadata.description
+        sim.tags.extend(metadata.tags)
+        sim.authors.extend(copy.copy(author) for author in metadata.authors)
+        sim.references.extend(copy.copy(ref) for ref in metadata.references)
+        if metadata.license is not None:
+            sim.license = metadata.license
+        if metadata.created is not None:
+            sim.created = metadata.created
+        if metadata.updated is not None:
+            sim.updated = metadata.updated
+        sim.format = copy.copy(metadata.format)
+
     def _read_model(self, model_sed, sim):
         """ Read a SED model
 
@@ -1009,24 +1508,57 @@ class SedMlSimulationReader(SimulationReader):
             change = self._get_parameter_change_from_model(change_sed)
             sim.model_parameter_changes.append(change)
 
-    def _read_model_variables(self, task_sed, sim):
-        """ Read model variables from SED data generators
+    def _index_model_variables(self, doc_sed):
+        """ Index the model variables recorded by the data generators of a SED document by their tasks
 
         Args:
-            task_sed (:obj:`libsedml.Sed`): SED task
-            sim (:obj:`Simulation`): simulation
+            doc_sed (:obj:`libsedml.SedDocument`): SED document
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of tasks to lists of the ids and targets of the model variables
+                which their data generators record
         """
-        sim.model.variables = []
-        for data_gen_sed in task_sed.getSedDocument().getListOfDataGenerators():
+        task_id_to_vars = collections.defaultdict(list)
+        for data_gen_sed in doc_sed.getListOfDataGenerators():
             if data_gen_sed.getNumParameters() == 0 and data_gen_sed.getNumVariables() == 1 and data_gen_sed.getMath().isCiNumber():
                 for var_sed in data_gen_sed.getListOfVariables():
-                    if var_sed.getTarget() and var_sed.getTaskReference() == task_sed.getId():
-                        var_id = var_sed.getId()
-                        if var_id != 'time':
-                            sim.model.variables.append(BiomodelVariable(
-                                id=var_id,
-                                target=var_sed.getTarget(),
-                            ))
+                    if var_sed.getTarget() and var_sed.getId() != 'time':
+                        task_id_to_vars[var_sed.getTaskReference()].append((var_sed.getId(), var_sed.getTarget()))
+        return task_id_to_vars
+
+    def _copy_decoded_model(self, decoded, sim):
+        """ Set the model of a simulation to a copy of a decoded SED model
+
+        The format, file, and parameter changes of the model are copied, so that the copies can be
+        modified independently.
+
+        Args:
+            decoded (:obj:`Simulation`): simulation whose model was read by :obj:`_read_model`
+            sim (:obj:`Simulation`): simulation
+        """
+        sim.model = Biomodel(
+            id=decoded.model.id,
+            name=decoded.model.name,
+            format=copy.copy(decoded.model.format),
+            file=copy.copy(decoded.model.file),
+        )
+        sim.model_parameter_changes = [copy.copy(change) for change in decoded.model_parameter_changes]
+
+    def _read_model_variables(self, task_id, sim, task_id_to_vars):
+        """ Read the model variables of a task
+
+        Args:
+            task_id (:obj:`str`): id of the task
+            sim (:obj:`Simulation`): simulation
+            task_id_to_vars (:obj:`dict`): dictionary that maps the ids of tasks to lists of the ids and targets
+                of the model variables which their data generators record (see :obj:`_index_model_variables`)
+        """
+        sim.model.variables = []
+        for var_id, target in task_id_to_vars.get(task_id, []):
+            sim.model.variables.append(BiomodelVariable(
+                id=var_id,
+                target=target,
+            ))
 
     def _create_sim(self, sim_sed):
         """ Create a simulation for a SED simulation
@@ -1047,6 +1579,31 @@ class SedMlSimulationReader(SimulationReader):
         else:
             raise SimulationIoError('Unsupported simulation type: {}'.format(sim_sed.__class__.__name__))
 
+    def _copy_decoded_sim(self, decoded):
+        """ Copy a decoded SED simulation
+
+        The algorithm and algorithm parameter changes of the simulation are copied, so that the copies
+        can be modified independently.
+
+        Args:
+            decoded (:obj:`Simulation`): simulation read by :obj:`_read_sim`
+
+        Returns:
+            :obj:`Simulation`: copy of the simulation
+        """
+        sim = copy.copy(decoded)
+        sim.tags = []
+        sim.identifiers = []
+        sim.references = []
+        sim.authors = []
+        if decoded.algorithm is not None:
+            sim.algorithm = copy.copy(decoded.algorithm)
+            sim.algorithm.ontology_terms = list(decoded.algorithm.ontology_terms)
+            sim.algorithm.parameters = list(decoded.algorithm.parameters)
+            sim.algorithm.modeling_frameworks = list(decoded.algorithm.modeling_frameworks)
+        sim.algorithm_parameter_changes = [copy.copy(change) for change in decoded.algorithm_parameter_changes]
+        return sim
+
     def _read_sim(self, sim_sed, sim_filename, sim):
         """ Read a SED simulation
 
@@ -1056,8 +1613,8 @@ class SedMlSimulationReader(SimulationReader):
             sim (:obj:`Simulation`): simulation
 
         Raises:
-            :obj:`SimulationIoError`: the output start time is less than the start time
-            :obj:`AssertionError`: a KiSAO term uses a different ontology or doesn't have an id
+            :obj:`SimulationIoError`: the output start time is less than the start time, or a KiSAO term uses a
+                different ontology or doesn't have an id
         """
         # time course
         if isinstance(sim_sed, libsedml.SedUniformTimeCourse):
@@ -1082,8 +1639,8 @@ class SedMlSimulationReader(SimulationReader):
         kisao_term_onto_id = alg_sed.getKisaoID()
         if kisao_term_onto_id:
             kisao_term_onto, _, kisao_term_id = kisao_term_onto_id.partition(':')
-            assert kisao_term_onto == 'KISAO'
-            assert kisao_term_id
+            assert_exception(kisao_term_onto == 'KISAO' and kisao_term_id,
+                             SimulationIoError("Invalid KiSAO id {} of algorithm in {}".format(kisao_term_onto_id, sim_filename)))
             kisao_term = OntologyTerm(
                 ontology=kisao_term_onto,
                 id=kisao_term_id,
@@ -1112,8 +1669,9 @@ class SedMlSimulationReader(SimulationReader):
             kisao_term_onto_id = change_sed.getKisaoID()
             if kisao_term_onto_id:
                 kisao_term_onto, _, kisao_term_id = kisao_term_onto_id.partition(':')
-                assert kisao_term_onto == 'KISAO'
-                assert kisao_term_id
+                assert_exception(kisao_term_onto == 'KISAO' and kisao_term_id,
+                                 SimulationIoError("Invalid KiSAO id {} of algorithm parameter in {}".format(
+                                     kisao_term_onto_id, sim_filename)))
                 kisao_term = OntologyTerm(
                     ontology=kisao_term_onto,
                     id=kisao_term_id,
@@ -1158,22 +1716,24 @@ class SedMlSimulationReader(SimulationReader):
             value=self._parse_string(change_sed.getNewValue())
         )
 
-    def _get_model_var_by_data_gen_id(self, data_gen_id, data_gen_id_to_var_target, time_data_gen_ids, variables):
+    def _get_model_var_by_data_gen_id(self, data_gen_id, task_id, data_gen_id_to_var_target, time_data_gen_ids, task_id_target_to_var):
         """ Get a model variable by the data generator which records it
 
         Args:
             data_gen_id (:obj:`str`): id of data generator
+            task_id (:obj:`str`): id of the task of the data generator
             data_gen_id_to_var_target (:obj:`dict`): dictionary that maps the ids of data generators to the targets of model variables
-            time_data_gen_ids (:obj:`list` of :obj:`str`): list of ids of data generators that represent time
-            variables (:obj:`list` of :obj:`BiomodelVariable`): model variables
+            time_data_gen_ids (:obj:`set` of :obj:`str`): set of ids of data generators that represent time
+            task_id_target_to_var (:obj:`dict`): dictionary that maps pairs of the ids of tasks and the targets of model variables
+                to model variables
 
         Returns:
-            :obj:`BiomodelVariable`: variable
+            :obj:`BiomodelVariable`: variable, or :obj:`None` if the variable cannot be resolved
         """
         if data_gen_id in time_data_gen_ids:
             return BiomodelVariable(id='time', target='urn:sedml:symbol:time')
         else:
-            return next(var for var in variables if var.target == data_gen_id_to_var_target[data_gen_id])
+            return task_id_target_to_var.get((task_id, data_gen_id_to_var_target.get(data_gen_id, None)), None)
 
     def _parse_string(self, str_value):
         """ Parse a string to a Boolean, integer, float, or string
@@ -1202,6 +1762,74 @@ class SedMlSimulationReader(SimulationReader):
     def _get_obj_annotation(self, obj_sed):
         """ Get the annotated properies of a SED object
 
+        The annotation is serialized once and decoded with lxml, rather than walked node by node through
+        libSED-ML. Annotations which can't be parsed on their own (e.g., which use namespace prefixes other than
+        those of :obj:`ANNOTATION_NAMESPACES` which are declared by ancestors of the object) are decoded with
+        libSED-ML.
+
+        Args:
+            obj_sed (:obj:`libsedml.SedBase`): SED object
+
+        Returns:
+            :obj:`list` of :obj:`XmlNode`: list of annotations
+        """
+        annotation = obj_sed.getAnnotationString()
+        if not annotation:
+            return []
+
+        try:
+            annotations_elem = etree.fromstring(self._annotation_wrapper.format(annotation), self._annotation_parser)
+        except etree.XMLSyntaxError:
+            return self._get_obj_annotation_from_sed(obj_sed)
+
+        meta_id = obj_sed.getMetaId()
+        nodes = []
+        for annotation_elem in annotations_elem:
+            if annotation_elem.prefix is None and annotation_elem.tag.rpartition('}')[2] == 'annotation':
+                for rdf_elem in annotation_elem:
+                    if rdf_elem.prefix == 'rdf' and rdf_elem.tag.endswith('}RDF'):
+                        for description_elem in rdf_elem:
+                            if description_elem.prefix == 'rdf' and description_elem.tag.endswith('}Description'):
+                                if meta_id and description_elem.get('{{{}}}about'.format(
+                                        description_elem.nsmap['rdf'])) != '#' + meta_id:
+                                    continue
+                                for child_elem in description_elem:
+                                    nodes.append(self._decode_obj_from_elem(child_elem))
+        return nodes
+
+    def _decode_obj_from_elem(self, obj_elem):
+        """ Decode an object from its XML representation
+
+        Args:
+            obj_elem (:obj:`etree._Element`): XML representation of an object
+
+        Returns:
+            :obj:`XmlNode`: object
+        """
+        tag = obj_elem.tag
+        node = XmlNode(
+            prefix=obj_elem.prefix or '',
+            name=tag[tag.find('}') + 1:],
+            type=None,
+            children=None,
+        )
+
+        for key, value in obj_elem.items():
+            if key.endswith('}type') and key == '{{{}}}type'.format(obj_elem.nsmap.get('dc', None)):
+                node.type = value
+
+        if len(obj_elem):
+            node.children = [self._decode_obj_from_elem(child_elem) for child_elem in obj_elem]
+        elif obj_elem.text is not None:
+            node.children = obj_elem.text
+        else:
+            node.children = []
+
+        return node
+
+    def _get_obj_annotation_from_sed(self, obj_sed):
+        """ Get the annotated properies of a SED object by walking its annotation node by node with libSED-ML
+
         Args:
             obj_sed (:obj:`libsedml.SedBase`): SED object
 
@@ -1297,67 +1925,256 @@ class XmlNode(object):
         self.children = children
 
     def encode(self):
+        """ Encode the node into XML
+
+        Returns:
+            :obj:`str`: XML representation of the node
+        """
+        parts = []
+        self.encode_to(parts)
+        return ''.join(parts)
+
+    def encode_to(self, parts):
+        """ Encode the node into XML, appending the fragments of its XML representation to a list
+
+        Args:
+            parts (:obj:`list` of :obj:`str`): fragments of an XML document
+        """
+        tag = self.prefix + ':' + self.name
+        parts.append('<' + tag)
         if self.type:
-            type = ' dc:type="{}"'.format(self.type)
-        else:
-            type = ''
+            parts.append(' dc:type="{}"'.format(self.type))
+        parts.append('>')
 
         if isinstance(self.children, list):
-            value_xml = ''.join(child.encode() for child in self.children)
+            for child in self.children:
+                child.encode_to(parts)
         elif isinstance(self.children, str):
-            value_xml = saxutils.escape(self.children)
+            parts.append(saxutils.escape(self.children))
         else:
-            value_xml = self.children
+            parts.append(str(self.children))
 
-        return ('<{}:{}'
-                '{}>'
-                '{}'
-                '</{}:{}>').format(self.prefix, self.name,
-                                   type, value_xml,
-                                   self.prefix, self.name)
+        parts.append('</' + tag + '>')
 
 
-def modify_xml_model_for_simulation(simulation, in_model_filename, out_model_filename, default_namespace=None, pretty_print=True):
+def modify_xml_model_for_simulation(simulation, in_model_filename, out_model_filename, default_namespace=None, pretty_print=True,
+                                    cache=None):
     """ Modify an XML-encoded model according to the model changes in a simulation
 
+    To generate many variants of the same model (e.g., the points of a parameter scan), use
+    :obj:`ModelVariantGenerator`, which only parses the model once.
+
     Args:
         simulation (:obj:`Simulation`): simulation
         in_model_filename (:obj:`str`): path to model
         out_model_filename (:obj:`str`): path to save modified model
         default_namespace (:obj:`str`, optional): default XML namespace URI (e.g., `sbml`)
         pretty_print (:obj:`bool`, optional): if :obj:`True`, pretty print output
+        cache (:obj:`bool` or :obj:`ModelVariantCache`, optional): if :obj:`True`, get the modified model from the
+            process-wide model variant cache if the same model has already been modified in the same way, or save
+            it to the cache; if a :obj:`ModelVariantCache`, use that cache; if :obj:`None` or :obj:`False`, bypass
+            the cache. Modified models which are retrieved from the cache may be hard links to its entries, and
+            should not be modified in place.
     """
-    # read model
-    et = etree.parse(in_model_filename)
-
-    # get namespaces
-    root = et.getroot()
-    namespaces = root.nsmap
-    if default_namespace:
-        namespaces[default_namespace] = namespaces[None]
-        namespaces.pop(None)
-
-    # apply changes
-    for change in simulation.model_parameter_changes:
-        # get object to change
-        obj_xpath, sep, attr = change.parameter.target.rpartition('/@')
-        if sep != '/@':
-            raise ValueError('target {} is not a valid XPATH to an attribute of a model element'.format(change.parameter.target))
-        objs = et.xpath(obj_xpath, namespaces=namespaces)
-        if len(objs) != 1:
-            raise ValueError('xpath {} must match a single object in {}'.format(obj_xpath, in_model_filename))
-        obj = objs[0]
-
-        # get new value
-        if isinstance(change.value, bool):
-            value = str(change.value).lower()
-        elif isinstance(change.value, (int, float)):
-            value = str(change.value)
-        else:
-            value = change.value
+    if not cache:
+        generator = ModelVariantGenerator(in_model_filename, default_namespace=default_namespace, pretty_print=pretty_print)
+        generator.gen_variant(simulation, out_model_filename)
+        return
+
+    if cache is True:
+        cache = get_model_variant_cache()
+    changes = [(str(change.parameter.target), ModelVariantGenerator._format_value(change.value))
+               for change in simulation.model_parameter_changes]
+    key = cache.get_key(in_model_filename, changes, default_namespace=default_namespace, pretty_print=pretty_print)
+    if key is not None and cache.get(key, out_model_filename) is not None:
+        return
+
+    generator = ModelVariantGenerator(in_model_filename, default_namespace=default_namespace, pretty_print=pretty_print)
+    variant = generator.gen_variant(simulation)
+    if key is not None:
+        cache.set(key, variant)
+
+    # remove existing files rather than writing through them, which could modify cache entries which they link to
+    if os.path.lexists(out_model_filename):
+        os.remove(out_model_filename)
+    with open(out_model_filename, 'wb') as file:
+        file.write(variant)
+
+
+class ModelVariantGenerator(object):
+    """ Generate variants of an XML-encoded model according to the model changes of simulations (e.g., the points
+    of a parameter scan)
+
+    The model is parsed once, and the target of each change is resolved to its element once with
+    :obj:`XmlTargetResolver`. Each variant is
+    generated by setting the values of the targeted attributes of the parsed model and serializing it. Before each
+    variant is generated, the attributes changed for the previous variant are restored, so that each variant only
+    reflects its own changes.
+
+    Attributes:
+        in_model_filename (:obj:`str`): path to model
+        pretty_print (:obj:`bool`): if :obj:`True`, pretty print variants
+        _et (:obj:`etree._ElementTree`): parsed model
+        _namespaces (:obj:`dict`): dictionary that maps prefixes to XML namespace URIs for evaluating targets
+        _resolver (:obj:`XmlTargetResolver`): resolver for the targets of changes
+        _target_to_obj_attr (:obj:`dict`): dictionary that maps targets to their elements and attribute names
+        _orig_values (:obj:`dict`): dictionary that maps pairs of changed elements and attribute names to their
+            original values
+    """
+
+    def __init__(self, in_model_filename, default_namespace=None, pretty_print=True):
+        """
+        Args:
+            in_model_filename (:obj:`str`): path to model
+            default_namespace (:obj:`str`, optional): default XML namespace URI (e.g., `sbml`)
+            pretty_print (:obj:`bool`, optional): if :obj:`True`, pretty print variants; if :obj:`False`,
+                serialize variants without reformatting them, which is faster
+        """
+        self.in_model_filename = in_model_filename
+        self.pretty_print = pretty_print
+
+        # read model
+        self._et = etree.parse(in_model_filename)
+
+        # get namespaces
+        self._namespaces = self._et.getroot().nsmap
+        if default_namespace:
+            self._namespaces[default_namespace] = self._namespaces[None]
+            self._namespaces.pop(None)
+
+        self._resolver = XmlTargetResolver(self._et, self._namespaces)
+        self._target_to_obj_attr = {}
+        self._orig_values = {}
+
+    def gen_variant(self, simulation, out_model_filename=None):
+        """ Generate a variant of the model according to the model changes of a simulation
+
+        Args:
+            simulation (:obj:`Simulation`): simulation
+            out_model_filename (:obj:`str` or file-like object, optional): path to save the variant, or a binary
+                file-like object to write it to
+
+        Returns:
+            :obj:`bytes`: variant, or :obj:`None` if :obj:`out_model_filename` is provided
 
-        # change value
-        obj.set(attr, value)
+        Raises:
+            :obj:`ValueError`: the target of a change isn't an XPath to an attribute of a single element
+        """
+        changes = simulation.model_parameter_changes
+        return self.gen_variant_from_values([change.parameter.target for change in changes],
+                                            [change.value for change in changes],
+                                            out_model_filename=out_model_filename)
+
+    def gen_variants(self, simulations):
+        """ Generate a variant of the model for each of a stream of simulations
 
-    # write model
-    et.write(out_model_filename, xml_declaration=True, encoding="utf-8", standalone=False, pretty_print=pretty_print)
+        Args:
+            simulations (:obj:`iterable` of :obj:`Simulation`): simulations
+
+        Yields:
+            :obj:`bytes`: variant for each simulation
+        """
+        for simulation in simulations:
+            yield self.gen_variant(simulation)
+
+    def gen_variant_from_values(self, targets, values, out_model_filename=None):
+        """ Generate a variant of the model by setting the values of attributes
+
+        Args:
+            targets (:obj:`list` of :obj:`str`): XPaths to attributes of the model (e.g.,
+                ``/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']/@value``)
+            values (:obj:`list`): values of the attributes
+            out_model_filename (:obj:`str` or file-like object, optional): path to save the variant, or a binary
+                file-like object to write it to
+
+        Returns:
+            :obj:`bytes`: variant, or :obj:`None` if :obj:`out_model_filename` is provided
+
+        Raises:
+            :obj:`ValueError`: a target isn't an XPath to an attribute of a single element, or the numbers of
+                targets and values are different
+        """
+        if len(targets) != len(values):
+            raise ValueError('{} values must be provided for the {} targets'.format(len(values), len(targets)))
+
+        # restore the attributes changed for the previous variant
+        for (obj, attr), orig_value in self._orig_values.items():
+            if orig_value is None:
+                obj.attrib.pop(attr, None)
+            else:
+                obj.set(attr, orig_value)
+            if self._is_id_attr(attr):
+                self._resolver.reset()
+
+        # apply changes
+        for target, value in zip(targets, values):
+            obj, attr = self._get_obj_attr(target)
+            if (obj, attr) not in self._orig_values:
+                self._orig_values[(obj, attr)] = obj.get(attr)
+            obj.set(attr, self._format_value(value))
+            if self._is_id_attr(attr):
+                self._resolver.reset()
+
+        # write model
+        if out_model_filename is None:
+            out_file = io.BytesIO()
+            self._et.write(out_file, xml_declaration=True, encoding="utf-8", standalone=False, pretty_print=self.pretty_print)
+            return out_file.getvalue()
+        self._et.write(out_model_filename, xml_declaration=True, encoding="utf-8", standalone=False,
+                       pretty_print=self.pretty_print)
+
+    def _get_obj_attr(self, target):
+        """ Get the element and attribute name which a target refers to
+
+        Args:
+            target (:obj:`str`): XPath to an attribute of an element of the model
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`etree._Element`: element
+                * :obj:`str`: name of the attribute
+
+        Raises:
+            :obj:`ValueError`: the target isn't an XPath to an attribute of a single element
+        """
+        target = str(target)
+        obj_attr = self._target_to_obj_attr.get(target, None)
+        if obj_attr is None:
+            obj_xpath, sep, attr = target.rpartition('/@')
+            if sep != '/@':
+                raise ValueError('target {} is not a valid XPATH to an attribute of a model element'.format(target))
+            objs = self._resolver.resolve(obj_xpath)
+            if len(objs) != 1:
+                raise ValueError('xpath {} must match a single object in {}'.format(obj_xpath, self.in_model_filename))
+            obj_attr = self._target_to_obj_attr[target] = (objs[0], attr)
+        return obj_attr
+
+    @staticmethod
+    def _is_id_attr(attr):
+        """ Determine whether an attribute is an id, which the resolver indexes elements by
+
+        Args:
+            attr (:obj:`str`): name of the attribute
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the attribute is an id
+        """
+        return attr == 'id' or attr.endswith(':id') or attr.endswith('}id')
+
+    @staticmethod
+    def _format_value(value):
+        """ Format the value of an attribute
+
+        Args:
+            value (:obj:`object`): value
+
+        Returns:
+            :obj:`str`: string representation of the value
+        """
+        if isinstance(value, bool):
+            return str(value).lower()
+        elif isinstance(value, (int, float)):
+            return str(value)
+        else:
+            return value
@@ -0,0 +1,253 @@
+""" Utilities for reading the simulations of SED-ML documents one task at a time by streaming them with lxml
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-09
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .core import SimulationIoError, SimulationIoDiagnosticCategory
+from .sedml import SedMlSimulationReader
+from ..utils import get_source_name, read_source
+from lxml import etree
+import collections
+import io
+import libsedml
+import os
+
+__all__ = ['LxmlSedMlSimulationReader']
+
+MATHML_NS = 'http://www.w3.org/1998/Math/MathML'
+
+# children of SED documents which are decoded with libSED-ML
+SPEC_ELEMENTS = ('notes', 'annotation', 'listOfSimulations', 'listOfModels')
+
+
+class LxmlSedMlDocumentIndex(object):
+    """ Summary of the elements of a SED document which are needed to read its simulations one task at a time
+
+    Attributes:
+        skeleton (:obj:`bytes`): SED document which only contains the metadata, models, and simulations of the
+            document, and, optionally, its outputs
+        tasks (:obj:`list` of :obj:`tuple`): element names, ids, names, model references, and simulation
+            references of the tasks
+        task_id_to_vars (:obj:`dict`): dictionary that maps the ids of tasks to lists of the ids and targets of the
+            model variables which their data generators record
+        data_gen_id_to_task_id (:obj:`dict`): dictionary that maps the ids of data generators to the ids of their tasks
+        data_gen_id_to_var_target (:obj:`dict`): dictionary that maps the ids of data generators to the targets of
+            their model variables
+        time_data_gen_ids (:obj:`set` of :obj:`str`): ids of the data generators that represent time
+    """
+
+    def __init__(self):
+        self.skeleton = None
+        self.tasks = []
+        self.task_id_to_vars = collections.defaultdict(list)
+        self.data_gen_id_to_task_id = {}
+        self.data_gen_id_to_var_target = {}
+        self.time_data_gen_ids = set()
+
+
+class LxmlSedMlSimulationReader(SedMlSimulationReader):
+    """ Read the simulations of SED documents one task at a time by streaming them with lxml
+
+    The reader streams a document once with :obj:`lxml.etree.iterparse` to build a small index of its tasks
+    and of the model variables recorded by its data generators, discarding each task and data generator after
+    it is read. The metadata, models, and simulations of the document, which are typically small, are decoded
+    with libSED-ML. The reader then yields a simulation for each task. Unless the visualization of the
+    document is requested, the simulations aren't retained, which keeps the memory required to read documents
+    with large numbers of tasks low.
+
+    Attributes:
+        visualization (:obj:`Visualization`): visualization of the last document that was read, if requested
+    """
+
+    def __init__(self):
+        super(LxmlSedMlSimulationReader, self).__init__()
+        self.visualization = None
+
+    def run(self, filename, profile='full'):
+        """ Read a simulation experiment from a SED document
+
+        Args:
+            filename (:obj:`str`, :obj:`bytes`, or file-like object): path to SED-ML document that describes a
+                simulation experiment, the contents of the document, or a file-like object from which to read it
+            profile (:obj:`str`, optional): profile which determines which parts of the document are read
+                (see :obj:`SedMlSimulationReader.PROFILES`)
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`list` of :obj:`Simulation`: simulations
+                * :obj:`Visualization`: visualization, or :obj:`None` if the profile doesn't include
+                  visualizations
+
+        Raises:
+            :obj:`NotImplementedError`: the profile is not supported
+        """
+        if profile not in self.PROFILES:
+            raise NotImplementedError("Profile {} is not supported".format(profile))
+        sims = list(self.iter(filename, read_visualization=profile == 'full'))
+        return (sims, self.visualization)
+
+    def iter(self, filename, read_visualization=False):
+        """ Iterate over the simulations of a SED document, one task at a time
+
+        Args:
+            filename (:obj:`str`, :obj:`bytes`, or file-like object): path to SED-ML document that describes a
+                simulation experiment, the contents of the document, or a file-like object from which to read it
+            read_visualization (:obj:`bool`, optional): if :obj:`True`, read the visualization of the document.
+                This requires the simulations of the tasks to be retained until the iteration is complete.
+
+        Yields:
+            :obj:`Simulation`: simulation of each task
+
+        Returns:
+            :obj:`Visualization`: visualization, or :obj:`None` if the visualization wasn't requested or the
+                document doesn't have any supported plots. The visualization is also saved to
+                :obj:`visualization`.
+
+        Raises:
+            :obj:`SimulationIoError`: if the document is invalid, or any of the following conditions are met
+
+                * The SED document contains changes other than instances of SedChangeAttribute
+                * The models or simulations don't have unique ids
+                * A model or simulation references cannot be resolved
+        """
+        filename = read_source(filename)
+        self._filename = get_source_name(filename)
+        self.visualization = None
+        self.diagnostics = []
+
+        if isinstance(filename, bytes):
+            filename = io.BytesIO(filename)
+        elif not os.path.isfile(filename):
+            raise SimulationIoError('{} does not exist'.format(filename))
+
+        try:
+            index = self._index_doc(filename, read_visualization)
+        except etree.XMLSyntaxError as exception:
+            raise SimulationIoError('{} is not valid XML: {}'.format(self._filename, str(exception)))
+
+        doc_sed = libsedml.readSedMLFromString(index.skeleton.decode())
+        if doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR):
+            raise SimulationIoError('libsedml error: {}'.format(doc_sed.getErrorLog().toString()))
+
+        specs = self._read_specs(doc_sed)
+        specs.task_id_to_vars = index.task_id_to_vars
+
+        task_id_to_sim = {}
+        task_id_target_to_var = {}
+        for element_name, task_id, task_name, model_ref, sim_ref in index.tasks:
+            if element_name != 'task':
+                self._warn_unsupported_task('Sed' + element_name[0].upper() + element_name[1:], task_id)
+                continue
+
+            sim = self._read_task(task_id, task_name, model_ref, sim_ref, specs)
+            if read_visualization:
+                self._index_task_sim(task_id, sim, task_id_to_sim, task_id_target_to_var)
+            yield sim
+
+        if read_visualization:
+            self.visualization = self._read_visualization(doc_sed.getListOfOutputs(), index.data_gen_id_to_task_id,
+                                                          index.data_gen_id_to_var_target, index.time_data_gen_ids,
+                                                          task_id_to_sim, task_id_target_to_var)
+        return self.visualization
+
+    def _index_doc(self, filename, read_visualization=False):
+        """ Stream the elements of a SED document from a file into an index
+
+        Args:
+            filename (:obj:`str` or file-like object): path to a SED-ML document, or a binary file-like object
+            read_visualization (:obj:`bool`, optional): if :obj:`True`, include the outputs of the document in its skeleton
+
+        Returns:
+            :obj:`LxmlSedMlDocumentIndex`: index of the document
+
+        Raises:
+            :obj:`SimulationIoError`: if the document is not SED-ML
+        """
+        index = LxmlSedMlDocumentIndex()
+        root = None
+        sedml_ns = None
+        depth = 0
+        for event, elem in etree.iterparse(filename, events=('start', 'end'), huge_tree=True,
+                                           remove_comments=True, remove_pis=True):
+            if event == 'start':
+                if depth == 0:
+                    qname = etree.QName(elem)
+                    if qname.localname != 'sedML':
+                        raise SimulationIoError('{} is not a SED-ML document'.format(self._filename))
+                    root = elem
+                    sedml_ns = qname.namespace
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 2:
+                list_name = etree.QName(elem.getparent()).localname
+                if list_name == 'listOfTasks':
+                    index.tasks.append((etree.QName(elem).localname, elem.get('id', ''), elem.get('name', ''),
+                                        elem.get('modelReference', ''), elem.get('simulationReference', '')))
+                elif list_name == 'listOfDataGenerators':
+                    self._index_data_gen_elem(elem, sedml_ns, index)
+                elif list_name != 'listOfOutputs' or read_visualization:
+                    continue
+
+                # discard tasks, data generators, and unneeded outputs once they have been read
+                parent = elem.getparent()
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+            elif depth == 1:
+                name = etree.QName(elem).localname
+                if name not in SPEC_ELEMENTS and not (read_visualization and name == 'listOfOutputs'):
+                    root.remove(elem)
+
+        index.skeleton = etree.tostring(root, xml_declaration=True, encoding='UTF-8')
+        return index
+
+    def _index_data_gen_elem(self, elem, sedml_ns, index):
+        """ Index a data generator which records an individual model variable or time
+
+        Args:
+            elem (:obj:`etree._Element`): ``dataGenerator`` element
+            sedml_ns (:obj:`str`): namespace of SED-ML
+            index (:obj:`LxmlSedMlDocumentIndex`): index of the document
+        """
+        params_elem = elem.find('{{{}}}listOfParameters'.format(sedml_ns))
+        vars_elem = elem.find('{{{}}}listOfVariables'.format(sedml_ns))
+        math_elem = elem.find('{{{}}}math'.format(MATHML_NS))
+        var_elems = vars_elem.findall('{{{}}}variable'.format(sedml_ns)) if vars_elem is not None else []
+        if (params_elem is not None and len(params_elem)) \
+                or len(var_elems) != 1 \
+                or math_elem is None \
+                or len(math_elem) != 1 \
+                or math_elem[0].tag != '{{{}}}ci'.format(MATHML_NS):
+            return
+
+        var_elem = var_elems[0]
+        var_id = var_elem.get('id', '')
+        task_id = var_elem.get('taskReference', '')
+        target = var_elem.get('target', '')
+        symbol = var_elem.get('symbol', '')
+
+        # model variables of tasks
+        if target and var_id != 'time':
+            index.task_id_to_vars[task_id].append((var_id, target))
+
+        # data generators
+        data_gen_id = elem.get('id', '')
+        if data_gen_id in index.data_gen_id_to_task_id:
+            self._report_problem(SimulationIoDiagnosticCategory.duplicate_id, data_gen_id,
+                                 'data generator id {} is not unique'.format(data_gen_id),
+                                 'Data generators of {} must have unique ids'.format(os.path.basename(self._filename)))
+            index.data_gen_id_to_task_id[data_gen_id] = None
+            index.data_gen_id_to_var_target[data_gen_id] = None
+        else:
+            index.data_gen_id_to_task_id[data_gen_id] = task_id
+            if target:
+                index.data_gen_id_to_var_target[data_gen_id] = target
+            elif symbol == 'urn:sedml:symbol:time':
+                index.time_data_gen_ids.add(data_gen_id)
@@ -0,0 +1,179 @@
+""" Utilities for rendering variants of SED-ML documents which differ only in the values of their parameter changes
+(e.g., the points of parameter scans) from templates
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-11
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .sedml import SedMlSimulationWriter
+import copy
+import io
+import re
+
+__all__ = ['SedMlSimulationTemplate']
+
+# characters which libSED-ML escapes in the values of attributes
+ESCAPED_CHARS = re.compile('[&<>"\']')
+
+
+class SedMlSimulationTemplate(object):
+    """ Template for rendering variants of a simulation experiment which differ only in the values of their model
+    parameter changes and algorithm parameter changes
+
+    The simulation experiment is written once with :obj:`SedMlSimulationWriter` with placeholders for the
+    values of its parameter changes, and the resulting document is split into chunks around the placeholders.
+    Variants are rendered by joining the chunks with the new values. The variants are identical to the
+    documents which :obj:`SedMlSimulationWriter` generates for the same simulation experiments. Values which
+    libSED-ML must escape (values which contain ``&``, ``<``, ``>``, ``"``, or ``'``) are rendered with
+    :obj:`SedMlSimulationWriter`.
+
+    Attributes:
+        sim (:obj:`Simulation`): simulation experiment
+        level (:obj:`int`): SED-ML level
+        version (:obj:`int`): SED-ML version
+        visualization (:obj:`Visualization`): visualization
+        _chunks (:obj:`list` of :obj:`bytes`): serialized chunks of the document between the values of the parameter
+            changes
+        _slots (:obj:`list` of :obj:`tuple`): type (``model`` or ``algorithm``) and index of the parameter change for
+            the value between each pair of chunks
+    """
+
+    PLACEHOLDER = '__SEDML_TEMPLATE_VALUE_{}__'
+
+    def __init__(self, sim, level=1, version=3, visualization=None):
+        """
+        Args:
+            sim (:obj:`Simulation`): simulation experiment
+            level (:obj:`int`, optional): SED-ML level
+            version (:obj:`int`, optional): SED-ML version
+            visualization (:obj:`Visualization`, optional): visualization
+
+        Raises:
+            :obj:`ValueError`: the SED-ML version of the simulation and the desired output version are different
+        """
+        self.sim = sim
+        self.level = level
+        self.version = version
+        self.visualization = visualization
+
+        # write the simulation experiment with a placeholder for the value of each parameter change
+        template_sim = copy.copy(sim)
+        template_sim.model_parameter_changes = []
+        template_sim.algorithm_parameter_changes = []
+        placeholder_to_slot = {}
+        for type, changes, template_changes in (
+                ('model', sim.model_parameter_changes, template_sim.model_parameter_changes),
+                ('algorithm', sim.algorithm_parameter_changes, template_sim.algorithm_parameter_changes)):
+            for i_change, change in enumerate(changes):
+                placeholder = self.PLACEHOLDER.format(len(placeholder_to_slot))
+                placeholder_to_slot[placeholder] = (type, i_change)
+                template_change = copy.copy(change)
+                template_change.value = placeholder
+                template_changes.append(template_change)
+
+        xml_file = io.StringIO()
+        SedMlSimulationWriter().run(template_sim, xml_file, level=level, version=version, visualization=visualization)
+        xml = xml_file.getvalue()
+
+        # split the document around the placeholders
+        if placeholder_to_slot:
+            pattern = re.compile('|'.join(re.escape(placeholder) for placeholder in placeholder_to_slot))
+            parts = pattern.split(xml)
+            placeholders = pattern.findall(xml)
+        else:
+            parts = [xml]
+            placeholders = []
+        self._chunks = [part.encode() for part in parts]
+        self._slots = [placeholder_to_slot[placeholder] for placeholder in placeholders]
+
+    def render(self, model_parameter_values=None, algorithm_parameter_values=None):
+        """ Render a variant of the simulation experiment
+
+        Args:
+            model_parameter_values (:obj:`list`, optional): values of the model parameter changes; if :obj:`None`,
+                the values of the simulation experiment are used
+            algorithm_parameter_values (:obj:`list`, optional): values of the algorithm parameter changes; if
+                :obj:`None`, the values of the simulation experiment are used
+
+        Returns:
+            :obj:`bytes`: SED-ML document
+
+        Raises:
+            :obj:`ValueError`: the numbers of values and parameter changes are different
+        """
+        values = {
+            'model': self._get_values(model_parameter_values, self.sim.model_parameter_changes, 'model'),
+            'algorithm': self._get_values(algorithm_parameter_values, self.sim.algorithm_parameter_changes, 'algorithm'),
+        }
+
+        chunks = self._chunks
+        parts = [chunks[0]]
+        for i_slot, (type, i_change) in enumerate(self._slots):
+            value = values[type][i_change]
+            if ESCAPED_CHARS.search(value):
+                return self._render_with_writer(values)
+            parts.append(value.encode())
+            parts.append(chunks[i_slot + 1])
+        return b''.join(parts)
+
+    def write(self, filename, model_parameter_values=None, algorithm_parameter_values=None):
+        """ Render a variant of the simulation experiment and save it to a file
+
+        Args:
+            filename (:obj:`str`): path to save the variant in SED-ML format
+            model_parameter_values (:obj:`list`, optional): values of the model parameter changes; if :obj:`None`,
+                the values of the simulation experiment are used
+            algorithm_parameter_values (:obj:`list`, optional): values of the algorithm parameter changes; if
+                :obj:`None`, the values of the simulation experiment are used
+        """
+        with open(filename, 'wb') as file:
+            file.write(self.render(model_parameter_values=model_parameter_values,
+                                   algorithm_parameter_values=algorithm_parameter_values))
+
+    @staticmethod
+    def _get_values(values, changes, type):
+        """ Get the string representations of the values of parameter changes
+
+        Args:
+            values (:obj:`list`): values of the parameter changes, or :obj:`None` to use the values of the changes
+            changes (:obj:`list` of :obj:`ParameterChange`): parameter changes
+            type (:obj:`str`): type of the parameter changes (``model`` or ``algorithm``)
+
+        Returns:
+            :obj:`list` of :obj:`str`: string representations of the values
+
+        Raises:
+            :obj:`ValueError`: the numbers of values and parameter changes are different
+        """
+        if values is None:
+            return [str(change.value) for change in changes]
+        if len(values) != len(changes):
+            raise ValueError('{} values must be provided for the {} parameter changes'.format(len(changes), type))
+        return [str(value) for value in values]
+
+    def _render_with_writer(self, values):
+        """ Render a variant of the simulation experiment with :obj:`SedMlSimulationWriter`
+
+        Args:
+            values (:obj:`dict`): dictionary that maps the types of parameter changes (``model`` or ``algorithm``)
+                to the string representations of their values
+
+        Returns:
+            :obj:`bytes`: SED-ML document
+        """
+        sim = copy.copy(self.sim)
+        sim.model_parameter_changes = []
+        sim.algorithm_parameter_changes = []
+        for changes, variant_changes, variant_values in (
+                (self.sim.model_parameter_changes, sim.model_parameter_changes, values['model']),
+                (self.sim.algorithm_parameter_changes, sim.algorithm_parameter_changes, values['algorithm'])):
+            for change, value in zip(changes, variant_values):
+                variant_change = copy.copy(change)
+                variant_change.value = value
+                variant_changes.append(variant_change)
+
+        xml_file = io.BytesIO()
+        SedMlSimulationWriter().run(sim, xml_file, level=self.level, version=self.version, visualization=self.visualization)
+        return xml_file.getvalue()
@@ -0,0 +1,207 @@
+""" Utilities for resolving the XPath targets of model changes and variables to the elements of XML-encoded models
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from lxml import etree
+import functools
+import re
+
+__all__ = ['XmlTargetResolver', 'compile_xpath']
+
+XPATH_CACHE_SIZE = 4096
+
+# location steps of XPaths which only select elements by their names and ids
+# (e.g., ``/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']``)
+NAME = r'[A-Za-z_][\w.\-]*'
+ID_STEP = r"/(?:({name}):)?({name})(?:\[@(?:({name}):)?id=(?:'([^']*)'|\"([^\"]*)\")\])?".format(name=NAME)
+ID_STEP_PATTERN = re.compile(ID_STEP)
+ID_PATH_PATTERN = re.compile('(?:{})+'.format(re.sub(r'\((?!\?)', '(?:', ID_STEP)))
+
+
+@functools.lru_cache(maxsize=XPATH_CACHE_SIZE)
+def compile_xpath(xpath, namespaces):
+    """ Compile an XPath
+
+    The compiled XPaths are memoized in a bounded LRU cache.
+
+    Args:
+        xpath (:obj:`str`): XPath
+        namespaces (:obj:`frozenset`): pairs of prefixes and XML namespace URIs
+
+    Returns:
+        :obj:`etree.XPath`: compiled XPath
+    """
+    return etree.XPath(xpath, namespaces=dict(namespaces))
+
+
+@functools.lru_cache(maxsize=XPATH_CACHE_SIZE)
+def parse_id_xpath(xpath):
+    """ Parse an XPath which only selects elements by their names and ids
+
+    Args:
+        xpath (:obj:`str`): XPath
+
+    Returns:
+        :obj:`tuple`: prefix, name, and id predicate of each location step, or :obj:`None` if the XPath has
+            another shape or none of its steps have id predicates. Id predicates are pairs of the prefix of
+            the id attribute and the value of the id, or :obj:`None` for steps without predicates.
+    """
+    if not ID_PATH_PATTERN.fullmatch(xpath):
+        return None
+
+    steps = []
+    for match in ID_STEP_PATTERN.finditer(xpath):
+        prefix, name, id_prefix, id_1, id_2 = match.groups()
+        if id_1 is not None or id_2 is not None:
+            predicate = (id_prefix, id_1 if id_1 is not None else id_2)
+        else:
+            predicate = None
+        steps.append((prefix, name, predicate))
+
+    if all(predicate is None for _, _, predicate in steps):
+        return None
+    return tuple(steps)
+
+
+class XmlTargetResolver(object):
+    """ Resolve XPath targets to the elements of an XML document
+
+    XPaths which only select elements by their names and ids, such as the targets which the SBML
+    reader generates (e.g., ``/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']``),
+    are resolved with an index of the elements of the document by their ids, which is built the first
+    time that such an XPath is resolved. Each of these XPaths is resolved from the elements with the id of
+    its most selective step (e.g., the reaction of a local parameter), whose ancestors and descendants are
+    then matched against the other steps. Other XPaths are evaluated with compiled XPaths, which are
+    memoized across documents with :obj:`compile_xpath`.
+
+    Because the index isn't updated when the document is modified, :obj:`reset` must be called after
+    the ids of elements are changed.
+
+    Attributes:
+        et (:obj:`etree._ElementTree`): XML document
+        namespaces (:obj:`dict`): dictionary that maps prefixes to XML namespace URIs
+        _frozen_namespaces (:obj:`frozenset`): pairs of prefixes and XML namespace URIs
+        _id_to_elements (:obj:`dict`): dictionary that maps pairs of the qualified names of id attributes and ids
+            to the elements which have them, in document order
+    """
+
+    def __init__(self, et, namespaces):
+        """
+        Args:
+            et (:obj:`etree._ElementTree`): XML document
+            namespaces (:obj:`dict`): dictionary that maps prefixes to XML namespace URIs
+        """
+        self.et = et
+        self.namespaces = namespaces
+        self._frozen_namespaces = frozenset(namespaces.items())
+        self._id_to_elements = None
+
+    def resolve(self, xpath):
+        """ Get the elements selected by an XPath
+
+        Args:
+            xpath (:obj:`str`): XPath
+
+        Returns:
+            :obj:`list`: elements selected by the XPath, in document order
+        """
+        elements = self._resolve_by_id(xpath)
+        if elements is None:
+            elements = compile_xpath(xpath, self._frozen_namespaces)(self.et)
+        return elements
+
+    def reset(self):
+        """ Discard the index of the elements of the document by their ids """
+        self._id_to_elements = None
+
+    def _resolve_by_id(self, xpath):
+        """ Get the elements selected by an XPath which only selects elements by their names and ids
+
+        Args:
+            xpath (:obj:`str`): XPath
+
+        Returns:
+            :obj:`list`: elements selected by the XPath, in document order, or :obj:`None` if the XPath has another
+                shape or uses prefixes which aren't defined
+        """
+        steps = parse_id_xpath(xpath)
+        if steps is None or None in self.namespaces:
+            return None
+
+        # get the qualified names of the elements and id attributes of the steps
+        qual_steps = []
+        for prefix, name, predicate in steps:
+            tag = self._get_qual_name(prefix, name)
+            if predicate is not None:
+                id_prefix, id = predicate
+                predicate = (self._get_qual_name(id_prefix, 'id'), id)
+                if predicate[0] is None:
+                    return None
+            if tag is None:
+                return None
+            qual_steps.append((tag, predicate))
+
+        if self._id_to_elements is None:
+            self._index_ids()
+
+        # select the elements with the id of the most selective step whose ancestors match the preceding steps
+        i_pivot = min((i_step for i_step, (_, predicate) in enumerate(qual_steps) if predicate is not None),
+                      key=lambda i_step: len(self._id_to_elements.get(qual_steps[i_step][1], ())))
+        elements = [element for element in self._id_to_elements.get(qual_steps[i_pivot][1], [])
+                    if self._matches_steps(element, qual_steps[0:i_pivot + 1])]
+
+        # select the descendants of these elements which match the following steps
+        for tag, predicate in qual_steps[i_pivot + 1:]:
+            elements = [child
+                        for element in elements
+                        for child in element.iterchildren(tag=tag)
+                        if predicate is None or child.get(predicate[0]) == predicate[1]]
+        return elements
+
+    def _get_qual_name(self, prefix, name):
+        """ Get the qualified name of an element or attribute in Clark notation (``{namespace}name``)
+
+        Args:
+            prefix (:obj:`str`): prefix of the namespace, or :obj:`None`
+            name (:obj:`str`): local name
+
+        Returns:
+            :obj:`str`: qualified name, or :obj:`None` if the prefix isn't defined
+        """
+        if prefix is None:
+            return name
+        namespace = self.namespaces.get(prefix, None)
+        if namespace is None:
+            return None
+        return '{{{}}}{}'.format(namespace, name)
+
+    def _index_ids(self):
+        """ Index the elements of the document by their ids """
+        self._id_to_elements = {}
+        for element in self.et.getroot().iter(tag=etree.Element):
+            for attr, value in element.attrib.items():
+                if attr == 'id' or attr.endswith('}id'):
+                    self._id_to_elements.setdefault((attr, value), []).append(element)
+
+    @staticmethod
+    def _matches_steps(element, qual_steps):
+        """ Determine whether the path from the root of a document to an element matches the location steps of an XPath
+
+        Args:
+            element (:obj:`etree._Element`): element
+            qual_steps (:obj:`list` of :obj:`tuple`): qualified name and id predicate of each location step
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the path matches the location steps
+        """
+        for tag, predicate in reversed(qual_steps):
+            if element is None or element.tag != tag:
+                return False
+            if predicate is not None and element.get(predicate[0]) != predicate[1]:
+                return False
+            element = element.getparent()
+        return element is None
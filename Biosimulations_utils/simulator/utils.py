@@ -58,7 +58,7 @@ def exec_simulations_in_archive(archive_filename, task_executer, out_dir, archiv
             continue
 
         # extract simulations (e.g., SED tasks) from file
-        simulations, _ = read_simulation(os.path.join(archive_tmp_dir, file.filename), format=format)
+        simulations, _ = read_simulation(os.path.join(archive_tmp_dir, file.filename), format=format, profile='tasks_only')
 
         # create directory for outputs of simulations
         if simulations:
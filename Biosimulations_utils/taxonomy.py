@@ -0,0 +1,165 @@
+""" Utilities for resolving the names of taxa in the NCBI Taxonomy database
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-05
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .utils import get_logger
+import atexit
+import ete3
+import json
+import logging
+import os
+import tempfile
+
+__all__ = ['TaxonomyResolver', 'get_taxonomy_resolver']
+
+DEFAULT_CACHE_FILENAME = os.path.expanduser(os.path.join('~', '.cache', 'Biosimulations_utils', 'taxonomy.json'))
+
+
+class TaxonomyResolver(object):
+    """ Resolve the names of taxa from their ids
+
+    Names are first looked up in a persistent cache file. Taxa which are not in the cache
+    are resolved with the NCBI Taxonomy database, which is only opened the first time it
+    is needed. If the database is not available (e.g., because it hasn't been downloaded
+    and there is no network connection), unresolved taxa are reported as :obj:`None`, and the
+    database isn't opened again until the cache is cleared.
+
+    Newly resolved names are saved to the cache file by :obj:`flush`, rather than each time
+    that taxa are resolved. The process-wide resolver is flushed when the process exits.
+
+    Attributes:
+        cache_filename (:obj:`str`): path to a JSON file which caches the names of taxa
+        _names (:obj:`dict`): dictionary that maps the ids of taxa to their names
+        _modified (:obj:`bool`): whether names have been resolved since the cache file was saved
+        _ncbi_taxa (:obj:`ete3.NCBITaxa`): NCBI Taxonomy database
+        _ncbi_taxa_failed (:obj:`bool`): whether the NCBI Taxonomy database could not be opened
+        _logger (:obj:`logging.Logger`): logger
+    """
+
+    def __init__(self, cache_filename=DEFAULT_CACHE_FILENAME):
+        """
+        Args:
+            cache_filename (:obj:`str`, optional): path to a JSON file which caches the names of taxa
+        """
+        self.cache_filename = cache_filename
+        self._names = self._read_cache()
+        self._modified = False
+        self._ncbi_taxa = None
+        self._ncbi_taxa_failed = False
+        self._logger = get_logger('taxonomy')
+
+    def get_name(self, taxid):
+        """ Get the name of a taxon
+
+        Args:
+            taxid (:obj:`int`): id of a taxon
+
+        Returns:
+            :obj:`str`: name of the taxon or :obj:`None` if the taxon could not be resolved
+        """
+        return self.get_names([taxid])[int(taxid)]
+
+    def get_names(self, taxids):
+        """ Get the names of multiple taxa with a single query of the NCBI Taxonomy database
+
+        Args:
+            taxids (:obj:`list` of :obj:`int`): ids of taxa
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of the taxa to their names (or :obj:`None` for
+                taxa which could not be resolved)
+        """
+        taxids = [int(taxid) for taxid in taxids]
+        unresolved_taxids = sorted(set(taxid for taxid in taxids if taxid not in self._names))
+
+        if unresolved_taxids:
+            ncbi_taxa = self._get_ncbi_taxa()
+            if ncbi_taxa is not None:
+                try:
+                    resolved_names = ncbi_taxa.get_taxid_translator(unresolved_taxids)
+                except Exception as error:
+                    self._logger.log(logging.ERROR, 'Taxa could not be resolved: {}'.format(str(error)))
+                    resolved_names = None
+
+                if resolved_names is not None:
+                    for taxid in unresolved_taxids:
+                        self._names[taxid] = resolved_names.get(taxid, None)
+                    self._modified = True
+
+        return {taxid: self._names.get(taxid, None) for taxid in taxids}
+
+    def _get_ncbi_taxa(self):
+        """ Get the NCBI Taxonomy database, opening it if necessary
+
+        Returns:
+            :obj:`ete3.NCBITaxa`: NCBI Taxonomy database or :obj:`None` if the database is not available
+        """
+        if self._ncbi_taxa is None and not self._ncbi_taxa_failed:
+            try:
+                self._ncbi_taxa = ete3.NCBITaxa()
+            except Exception as error:
+                self._ncbi_taxa_failed = True
+                self._logger.log(logging.ERROR, 'NCBI Taxonomy database could not be opened: {}'.format(str(error)))
+        return self._ncbi_taxa
+
+    def _read_cache(self):
+        """ Read the names of taxa from the cache file
+
+        Returns:
+            :obj:`dict`: dictionary that maps the ids of taxa to their names
+        """
+        if not self.cache_filename or not os.path.isfile(self.cache_filename):
+            return {}
+
+        try:
+            with open(self.cache_filename, 'r') as file:
+                names = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return {int(taxid): name for taxid, name in names.items()}
+
+    def flush(self):
+        """ Save the names of the resolved taxa to the cache file, if any taxa have been resolved since it was saved """
+        if not self._modified or not self.cache_filename:
+            return
+
+        dirname = os.path.dirname(self.cache_filename)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fid, temp_filename = tempfile.mkstemp(dir=dirname, suffix='.json')
+            with os.fdopen(fid, 'w') as file:
+                json.dump({str(taxid): name for taxid, name in self._names.items()}, file)
+            os.replace(temp_filename, self.cache_filename)
+        except OSError as error:
+            self._logger.log(logging.ERROR, 'Taxonomy cache could not be saved: {}'.format(str(error)))
+            return
+        self._modified = False
+
+    def clear(self):
+        """ Clear the cache, and allow the NCBI Taxonomy database to be opened again if it could not be opened """
+        self._names = {}
+        self._modified = False
+        self._ncbi_taxa_failed = False
+        if self.cache_filename and os.path.isfile(self.cache_filename):
+            os.remove(self.cache_filename)
+
+
+_taxonomy_resolver = None
+
+
+def get_taxonomy_resolver():
+    """ Get the process-wide taxonomy resolver, creating it if necessary
+
+    Returns:
+        :obj:`TaxonomyResolver`: taxonomy resolver
+    """
+    global _taxonomy_resolver
+    if _taxonomy_resolver is None:
+        _taxonomy_resolver = TaxonomyResolver()
+        atexit.register(_taxonomy_resolver.flush)
+    return _taxonomy_resolver
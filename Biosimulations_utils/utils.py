@@ -6,6 +6,7 @@
 :License: MIT
 """
 
+import functools
 import logging
 import math
 import numpy
@@ -13,7 +14,8 @@ import os
 import PIL
 import pint
 
-__all__ = ['get_enum_format_by_attr', 'unit_registry', 'pretty_print_units', 'crop_image', 'assert_exception', 'get_logger']
+__all__ = ['get_enum_format_by_attr', 'unit_registry', 'pretty_print_units', 'crop_image', 'assert_exception', 'get_logger',
+           'read_source', 'get_source_name']
 
 
 def get_enum_format_by_attr(FormatEnum, attr_name, attr_val):
@@ -34,10 +36,16 @@ def get_enum_format_by_attr(FormatEnum, attr_name, attr_val):
 
 unit_registry = pint.UnitRegistry()
 
+PRETTY_PRINT_UNITS_CACHE_SIZE = 1024
 
+
+@functools.lru_cache(maxsize=PRETTY_PRINT_UNITS_CACHE_SIZE)
 def pretty_print_units(units_str):
     """ Pretty print units
 
+    The results are memoized in a bounded LRU cache. Statistics about the hits and misses
+    of the cache can be obtained with :obj:`pretty_print_units.cache_info`.
+
     Args:
         units_str (:obj:`str`): units
 
@@ -150,6 +158,41 @@ def assert_exception(success, exception):
         raise exception
 
 
+# name used in messages about files which are read from memory
+IN_MEMORY_SOURCE_NAME = '<in-memory>'
+
+
+def read_source(source):
+    """ Read the contents of a file-like object, or pass through a path to a file or the contents of a file
+
+    Args:
+        source (:obj:`str`, :obj:`bytes`, or file-like object): path to a file, contents of a file, or
+            a binary or text file-like object
+
+    Returns:
+        :obj:`str` or :obj:`bytes`: path to the file, or the contents of the file
+    """
+    if hasattr(source, 'read'):
+        source = source.read()
+        if isinstance(source, str):
+            source = source.encode()
+    return source
+
+
+def get_source_name(source):
+    """ Get a name for a path to a file or the contents of a file for use in messages
+
+    Args:
+        source (:obj:`str` or :obj:`bytes`): path to a file or the contents of a file
+
+    Returns:
+        :obj:`str`: path to the file, or :obj:`IN_MEMORY_SOURCE_NAME` for contents
+    """
+    if isinstance(source, str):
+        return source
+    return IN_MEMORY_SOURCE_NAME
+
+
 def get_logger(name='log'):
     """ Get a logger
 
@@ -0,0 +1,114 @@
+""" Benchmark reading COMBINE archives which contain large data files and many result files
+
+Generates an archive with a model, a simulation experiment, a large data file, and many small result
+files, and reports the time required to read the archive with libCOMBINE, which extracts all of its files,
+to open it with :obj:`ZipfileCombineArchive`, and to open it and extract only its simulation experiment.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.archive import open_archive, read_archive, write_archive
+from Biosimulations_utils.archive.data_model import Archive, ArchiveFile
+from Biosimulations_utils.biomodel.data_model import BiomodelFormat
+from Biosimulations_utils.data_model import Format
+from Biosimulations_utils.simulation.data_model import SimulationFormat
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+DEFAULT_DATA_SIZE = 256 * 2 ** 20
+DEFAULT_NUM_RESULTS = 1000
+DEFAULT_NUM_REPEATS = 3
+
+
+def gen_archive(archive_filename, data_size, num_results):
+    """ Generate an archive with a large data file and many result files
+
+    Args:
+        archive_filename (:obj:`str`): path to save the archive
+        data_size (:obj:`int`): size of the data file (bytes)
+        num_results (:obj:`int`): number of result files
+    """
+    csv_format = Format(spec_url='http://purl.org/NET/mediatypes/text/csv')
+    archive = Archive(
+        files=[
+            ArchiveFile(filename='./model.xml', format=BiomodelFormat.sbml.value, description='Model'),
+            ArchiveFile(filename='./sim.sedml', format=SimulationFormat.sedml.value, description='Simulation'),
+            ArchiveFile(filename='./data.csv', format=csv_format),
+        ] + [
+            ArchiveFile(filename='./results/result_{}.csv'.format(i_result), format=csv_format)
+            for i_result in range(num_results)
+        ],
+        description='Archive',
+    )
+    archive.master_file = archive.files[1]
+
+    data_line = b','.join([b'0.123456789'] * 10) + b'\n'
+    contents = {
+        './model.xml': '<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1"/>',
+        './sim.sedml': '<sedML xmlns="http://sed-ml.org/sed-ml/level1/version3" level="1" version="3"/>',
+        './data.csv': (data_line for _ in range(data_size // len(data_line))),
+    }
+    for file in archive.files[3:]:
+        contents[file.filename] = 'time,x\n0,1\n1,2\n'
+    write_archive(archive, None, archive_filename, contents=contents, engine='zipfile')
+
+
+def run(data_size=DEFAULT_DATA_SIZE, num_results=DEFAULT_NUM_RESULTS, num_repeats=DEFAULT_NUM_REPEATS):
+    """ Time reading an archive with libCOMBINE, opening it lazily, and opening it and extracting one file
+
+    Args:
+        data_size (:obj:`int`, optional): size of the data file of the archive (bytes)
+        num_results (:obj:`int`, optional): number of result files of the archive
+        num_repeats (:obj:`int`, optional): number of times to read the archive; the minimum time is reported
+
+    Returns:
+        :obj:`tuple`: times to read the archive with libCOMBINE, to open it, and to open it and extract its
+            simulation experiment (s)
+    """
+    dirname = tempfile.mkdtemp()
+    try:
+        archive_filename = os.path.join(dirname, 'archive.omex')
+        gen_archive(archive_filename, data_size, num_results)
+
+        def read_libcombine(out_dir):
+            read_archive(archive_filename, out_dir)
+
+        def open_lazily(out_dir):
+            with open_archive(archive_filename):
+                pass
+
+        def extract_sim(out_dir):
+            with open_archive(archive_filename) as archive_zip:
+                archive_zip.extract(out_dir, filenames=[archive_zip.archive.master_file.filename])
+
+        durations = []
+        for read in [read_libcombine, open_lazily, extract_sim]:
+            duration = float('inf')
+            for i_repeat in range(num_repeats):
+                out_dir = os.path.join(dirname, '{}-{}'.format(read.__name__, i_repeat))
+                start = time.perf_counter()
+                read(out_dir)
+                duration = min(duration, time.perf_counter() - start)
+            durations.append(duration)
+    finally:
+        shutil.rmtree(dirname)
+
+    print('libCOMBINE (extract all files): {:10.3f} s'.format(durations[0]))
+    print('open:                           {:10.3f} s'.format(durations[1]))
+    print('open and extract simulation:    {:10.3f} s'.format(durations[2]))
+    return tuple(durations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark reading COMBINE archives with large data files and many result files')
+    parser.add_argument('--data-size', type=int, default=DEFAULT_DATA_SIZE, help='size of the data file of the archive (bytes)')
+    parser.add_argument('--num-results', type=int, default=DEFAULT_NUM_RESULTS, help='number of result files of the archive')
+    parser.add_argument('--num-repeats', type=int, default=DEFAULT_NUM_REPEATS, help='number of times to read the archive')
+    args = parser.parse_args()
+    run(data_size=args.data_size, num_results=args.num_results, num_repeats=args.num_repeats)
@@ -0,0 +1,87 @@
+""" Benchmark the generation of variants of models for parameter scans
+
+Generates variants of a model with random values of the parameters changed by a simulation experiment with
+:obj:`modify_xml_model_for_simulation`, which parses the model for each variant, and with
+:obj:`ModelVariantGenerator`, which parses the model once, and reports the number of variants generated
+per second by each.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.simulation import read_simulation
+from Biosimulations_utils.simulation.sedml import ModelVariantGenerator, modify_xml_model_for_simulation
+import argparse
+import copy
+import os
+import random
+import shutil
+import tempfile
+import time
+
+DEFAULT_MODEL_FILENAME = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'BIOMD0000000806.xml')
+DEFAULT_SIMULATION_FILENAME = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures',
+                                           'BIOMD0000000806-with-change-attribute.sedml')
+DEFAULT_NUM_VARIANTS = 1000
+
+
+def run(model_filename=DEFAULT_MODEL_FILENAME, simulation_filename=DEFAULT_SIMULATION_FILENAME,
+        num_variants=DEFAULT_NUM_VARIANTS):
+    """ Time the generation of variants of a model by re-parsing the model and with a generator
+
+    Args:
+        model_filename (:obj:`str`, optional): path to an SBML-encoded model
+        simulation_filename (:obj:`str`, optional): path to a SED-ML document with model changes
+        num_variants (:obj:`int`, optional): number of variants to generate
+
+    Returns:
+        :obj:`tuple`: numbers of variants generated per second by re-parsing the model, and with the generator
+            with and without pretty printing
+    """
+    sims, _ = read_simulation(simulation_filename)
+    sim = sims[0]
+
+    variants = []
+    for _ in range(num_variants):
+        variant = copy.copy(sim)
+        variant.model_parameter_changes = [copy.copy(change) for change in sim.model_parameter_changes]
+        for change in variant.model_parameter_changes:
+            change.value = random.random()
+        variants.append(variant)
+
+    dirname = tempfile.mkdtemp()
+    try:
+        out_model_filename = os.path.join(dirname, 'model.xml')
+
+        # re-parse a fraction of the variants because it is much slower
+        num_reparsed_variants = max(1, num_variants // 10)
+        start = time.perf_counter()
+        for variant in variants[0:num_reparsed_variants]:
+            modify_xml_model_for_simulation(variant, model_filename, out_model_filename, default_namespace='sbml')
+        reparse_rate = num_reparsed_variants / (time.perf_counter() - start)
+
+        generator_rates = []
+        for pretty_print in [True, False]:
+            start = time.perf_counter()
+            generator = ModelVariantGenerator(model_filename, default_namespace='sbml', pretty_print=pretty_print)
+            for variant in variants:
+                generator.gen_variant(variant, out_model_filename)
+            generator_rates.append(num_variants / (time.perf_counter() - start))
+    finally:
+        shutil.rmtree(dirname)
+
+    print('re-parse:                   {:10.0f} variants / s'.format(reparse_rate))
+    print('generator (pretty printed): {:10.0f} variants / s'.format(generator_rates[0]))
+    print('generator:                  {:10.0f} variants / s'.format(generator_rates[1]))
+    return (reparse_rate, *generator_rates)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the generation of variants of models for parameter scans')
+    parser.add_argument('--model', default=DEFAULT_MODEL_FILENAME, help='path to an SBML-encoded model')
+    parser.add_argument('--simulation', default=DEFAULT_SIMULATION_FILENAME, help='path to a SED-ML document with model changes')
+    parser.add_argument('--num-variants', type=int, default=DEFAULT_NUM_VARIANTS, help='number of variants to generate')
+    args = parser.parse_args()
+    run(model_filename=args.model, simulation_filename=args.simulation, num_variants=args.num_variants)
@@ -0,0 +1,153 @@
+""" Benchmark the scaling of the SBML reader with the size of models
+
+Generates synthetic SBML models with increasing numbers of reactions and reports the time
+required to read each model and the peak memory of the process. The time per reaction should
+remain roughly constant as the size of the models increases. Because the peak memory of a process
+never decreases, each engine should be benchmarked in a separate process.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-04
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel import read_biomodel
+from Biosimulations_utils.biomodel.data_model import BiomodelFormat
+import argparse
+import libsbml
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+DEFAULT_NUM_REACTIONS = [1000, 10000, 50000]
+
+
+def gen_model(num_reactions, filename, fbc=False):
+    """ Generate a synthetic SBML model
+
+    The model has one species per reaction, one compartment per 10 reactions, and one
+    assignment rule per 10 reactions. Each reaction has a local parameter. If :obj:`fbc`
+    is :obj:`True`, the model also has a flux objective for each reaction.
+
+    Args:
+        num_reactions (:obj:`int`): number of reactions
+        filename (:obj:`str`): path to save the model
+        fbc (:obj:`bool`, optional): if :obj:`True`, generate a flux balance model
+    """
+    if fbc:
+        ns = libsbml.SBMLNamespaces(3, 1, 'fbc', 2)
+        doc = libsbml.SBMLDocument(ns)
+        doc.setPackageRequired('fbc', False)
+    else:
+        doc = libsbml.SBMLDocument(3, 1)
+    model = doc.createModel()
+    model.setId('model')
+    model.setSubstanceUnits('mole')
+    model.setExtentUnits('mole')
+    model.setTimeUnits('second')
+
+    num_comps = max(1, num_reactions // 10)
+    for i_comp in range(num_comps):
+        comp = model.createCompartment()
+        comp.setId('c_{}'.format(i_comp))
+        comp.setSize(1.)
+        comp.setUnits('litre')
+        comp.setConstant(True)
+
+    for i_rxn in range(num_reactions):
+        species = model.createSpecies()
+        species.setId('s_{}'.format(i_rxn))
+        species.setCompartment('c_{}'.format(i_rxn % num_comps))
+        species.setInitialConcentration(1.)
+        species.setSubstanceUnits('mole')
+        species.setHasOnlySubstanceUnits(False)
+        species.setBoundaryCondition(False)
+        species.setConstant(False)
+
+        rxn = model.createReaction()
+        rxn.setId('r_{}'.format(i_rxn))
+        rxn.setReversible(False)
+        reactant = rxn.createReactant()
+        reactant.setSpecies('s_{}'.format(i_rxn))
+        reactant.setStoichiometry(1.)
+        reactant.setConstant(True)
+        kin_law = rxn.createKineticLaw()
+        param = kin_law.createLocalParameter()
+        param.setId('k')
+        param.setValue(1.)
+        param.setUnits('per_second')
+        kin_law.setMath(libsbml.parseL3Formula('k * s_{}'.format(i_rxn)))
+
+    unit_def = model.createUnitDefinition()
+    unit_def.setId('per_second')
+    unit = unit_def.createUnit()
+    unit.setKind(libsbml.UNIT_KIND_SECOND)
+    unit.setExponent(-1)
+    unit.setScale(0)
+    unit.setMultiplier(1.)
+
+    for i_rule in range(max(1, num_reactions // 10)):
+        param = model.createParameter()
+        param.setId('p_{}'.format(i_rule))
+        param.setConstant(False)
+        param.setUnits('dimensionless')
+        rule = model.createAssignmentRule()
+        rule.setVariable('p_{}'.format(i_rule))
+        rule.setMath(libsbml.parseL3Formula('2 * s_{}'.format(i_rule)))
+
+    if fbc:
+        plugin = model.getPlugin('fbc')
+        plugin.setStrict(False)
+        objective = plugin.createObjective()
+        objective.setId('obj')
+        objective.setType('maximize')
+        plugin.setActiveObjectiveId('obj')
+        for i_rxn in range(num_reactions):
+            flux_obj = objective.createFluxObjective()
+            flux_obj.setReaction('r_{}'.format(i_rxn))
+            flux_obj.setCoefficient(1.)
+
+    libsbml.writeSBMLToFile(doc, filename)
+
+
+def run(num_reactions=None, fbc=False, engine='libsbml'):
+    """ Time the reading of synthetic models of increasing size
+
+    Args:
+        num_reactions (:obj:`list` of :obj:`int`, optional): numbers of reactions of the models to benchmark
+        fbc (:obj:`bool`, optional): if :obj:`True`, benchmark flux balance models
+        engine (:obj:`str`, optional): engine for reading the models (``libsbml`` or ``lxml``)
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: number of reactions, time to read the model (s), time per reaction (µs),
+            and peak memory of the process (MB)
+    """
+    results = []
+    dirname = tempfile.mkdtemp()
+    try:
+        for n_rxns in (num_reactions or DEFAULT_NUM_REACTIONS):
+            filename = os.path.join(dirname, 'model-{}.xml'.format(n_rxns))
+            gen_model(n_rxns, filename, fbc=fbc)
+
+            start = time.perf_counter()
+            read_biomodel(filename, format=BiomodelFormat.sbml, engine=engine)
+            duration = time.perf_counter() - start
+            peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+            results.append((n_rxns, duration, duration / n_rxns * 1e6, peak_memory))
+            print('{:>8d} reactions: {:8.2f} s ({:8.1f} µs / reaction), peak memory: {:8.1f} MB'.format(*results[-1]))
+    finally:
+        shutil.rmtree(dirname)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the scaling of the SBML reader')
+    parser.add_argument('num_reactions', type=int, nargs='*', default=DEFAULT_NUM_REACTIONS,
+                        help='numbers of reactions of the synthetic models')
+    parser.add_argument('--fbc', action='store_true', help='generate flux balance models')
+    parser.add_argument('--engine', choices=['libsbml', 'lxml'], default='libsbml', help='engine for reading the models')
+    args = parser.parse_args()
+    run(args.num_reactions, fbc=args.fbc, engine=args.engine)
@@ -0,0 +1,145 @@
+""" Benchmark the scaling of the SED-ML reader with the number of tasks of documents
+
+Generates synthetic SED-ML documents with increasing numbers of tasks (e.g., parameter scans
+exported as one task per point) and reports the time required to read each document and the peak
+memory of the process. The time per task should remain roughly constant as the number of tasks
+increases. Because the peak memory of a process never decreases, each engine should be benchmarked
+in a separate process.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-08
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.simulation import iter_simulations, read_simulation
+import argparse
+import libsedml
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+DEFAULT_NUM_TASKS = [100, 300, 1000]
+DEFAULT_NUM_VARIABLES = 5
+
+
+def gen_doc(num_tasks, filename, num_variables=DEFAULT_NUM_VARIABLES):
+    """ Generate a synthetic SED-ML document
+
+    The document has one model, one time course simulation, and :obj:`num_tasks` tasks. Each task
+    has one data generator for time and one data generator for each of :obj:`num_variables` species,
+    and one plot of the species over time.
+
+    Args:
+        num_tasks (:obj:`int`): number of tasks
+        filename (:obj:`str`): path to save the document
+        num_variables (:obj:`int`, optional): number of variables recorded by each task
+    """
+    doc = libsedml.SedDocument(1, 3)
+
+    model = doc.createModel()
+    model.setId('model')
+    model.setLanguage('urn:sedml:language:sbml')
+    model.setSource('model.xml')
+
+    sim = doc.createUniformTimeCourse()
+    sim.setId('sim')
+    sim.setInitialTime(0.)
+    sim.setOutputStartTime(0.)
+    sim.setOutputEndTime(10.)
+    sim.setNumberOfPoints(10)
+    alg = sim.createAlgorithm()
+    alg.setKisaoID('KISAO:0000019')
+
+    for i_task in range(num_tasks):
+        task_id = 'task_{}'.format(i_task)
+        task = doc.createTask()
+        task.setId(task_id)
+        task.setModelReference('model')
+        task.setSimulationReference('sim')
+
+        time_data_gen_id = 'time_{}'.format(i_task)
+        data_gen = doc.createDataGenerator()
+        data_gen.setId(time_data_gen_id)
+        var = data_gen.createVariable()
+        var.setId('time')
+        var.setTaskReference(task_id)
+        var.setSymbol('urn:sedml:symbol:time')
+        data_gen.setMath(libsedml.parseFormula('time'))
+
+        plot = doc.createPlot2D()
+        plot.setId('plot_{}'.format(i_task))
+
+        for i_var in range(num_variables):
+            var_id = 'var_{}_{}'.format(i_task, i_var)
+            data_gen_id = 'data_gen_{}_{}'.format(i_task, i_var)
+            data_gen = doc.createDataGenerator()
+            data_gen.setId(data_gen_id)
+            var = data_gen.createVariable()
+            var.setId(var_id)
+            var.setTaskReference(task_id)
+            var.setTarget("/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='s_{}']".format(i_var))
+            data_gen.setMath(libsedml.parseFormula(var_id))
+
+            curve = plot.createCurve()
+            curve.setId('curve_{}_{}'.format(i_task, i_var))
+            curve.setLogX(False)
+            curve.setLogY(False)
+            curve.setXDataReference(time_data_gen_id)
+            curve.setYDataReference(data_gen_id)
+
+    libsedml.writeSedMLToFile(doc, filename)
+
+
+def run(num_tasks=None, num_variables=DEFAULT_NUM_VARIABLES, engine='libsedml'):
+    """ Time the reading of synthetic documents with increasing numbers of tasks
+
+    Args:
+        num_tasks (:obj:`list` of :obj:`int`, optional): numbers of tasks of the documents to benchmark
+        num_variables (:obj:`int`, optional): number of variables recorded by each task
+        engine (:obj:`str`, optional): engine for reading the documents (``libsedml`` to read the documents
+            with :obj:`read_simulation` or ``lxml`` to iterate over their simulations with :obj:`iter_simulations`)
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: number of tasks, time to read the document (s), time per task (ms),
+            and peak memory of the process (MB)
+    """
+    results = []
+    dirname = tempfile.mkdtemp()
+    try:
+        for n_tasks in (num_tasks or DEFAULT_NUM_TASKS):
+            filename = os.path.join(dirname, 'sim-{}.sedml'.format(n_tasks))
+
+            # generate the document in a separate process so that its memory isn't included in the peak memory
+            process = multiprocessing.Process(target=gen_doc, args=(n_tasks, filename), kwargs={'num_variables': num_variables})
+            process.start()
+            process.join()
+
+            start = time.perf_counter()
+            if engine == 'lxml':
+                for _ in iter_simulations(filename):
+                    pass
+            else:
+                read_simulation(filename)
+            duration = time.perf_counter() - start
+            peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+            results.append((n_tasks, duration, duration / n_tasks * 1e3, peak_memory))
+            print('{:>8d} tasks: {:8.2f} s ({:8.2f} ms / task), peak memory: {:8.1f} MB'.format(*results[-1]))
+    finally:
+        shutil.rmtree(dirname)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the scaling of the SED-ML reader')
+    parser.add_argument('num_tasks', type=int, nargs='*', default=DEFAULT_NUM_TASKS,
+                        help='numbers of tasks of the synthetic documents')
+    parser.add_argument('--num-variables', type=int, default=DEFAULT_NUM_VARIABLES,
+                        help='number of variables recorded by each task')
+    parser.add_argument('--engine', choices=['libsedml', 'lxml'], default='libsedml', help='engine for reading the documents')
+    args = parser.parse_args()
+    run(args.num_tasks, num_variables=args.num_variables, engine=args.engine)
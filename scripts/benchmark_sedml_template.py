@@ -0,0 +1,125 @@
+""" Benchmark the rendering of variants of SED-ML documents for parameter scans from templates
+
+Renders variants of a simulation experiment with random values of its model and algorithm parameter changes
+with :obj:`SedMlSimulationTemplate` and with :obj:`SedMlSimulationWriter`, and reports the number of variants
+rendered per second by each.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-11
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel.data_model import Biomodel, BiomodelFormat, BiomodelParameter, BiomodelVariable
+from Biosimulations_utils.data_model import OntologyTerm, RemoteFile
+from Biosimulations_utils.simulation.data_model import (Algorithm, AlgorithmParameter, ParameterChange,
+                                                        SimulationFormat, TimecourseSimulation)
+from Biosimulations_utils.simulation.sedml import SedMlSimulationWriter
+from Biosimulations_utils.simulation.sedml_template import SedMlSimulationTemplate
+import argparse
+import copy
+import io
+import random
+import time
+
+DEFAULT_NUM_VARIANTS = 10000
+DEFAULT_NUM_PARAMETERS = 10
+DEFAULT_NUM_VARIABLES = 10
+
+
+def gen_sim(num_parameters=DEFAULT_NUM_PARAMETERS, num_variables=DEFAULT_NUM_VARIABLES):
+    """ Generate a time course simulation experiment with model parameter changes and algorithm parameter changes
+
+    Args:
+        num_parameters (:obj:`int`, optional): number of model parameter changes
+        num_variables (:obj:`int`, optional): number of variables
+
+    Returns:
+        :obj:`TimecourseSimulation`: simulation experiment
+    """
+    format = copy.copy(SimulationFormat.sedml.value)
+    format.version = 'L1V3'
+    return TimecourseSimulation(
+        id='sim',
+        name='Simulation',
+        format=format,
+        model=Biomodel(
+            id='model',
+            file=RemoteFile(name='model.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='s_{}'.format(i_var),
+                                 target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='s_{}']".format(i_var))
+                for i_var in range(num_variables)
+            ],
+        ),
+        model_parameter_changes=[
+            ParameterChange(
+                parameter=BiomodelParameter(
+                    id='k_{}'.format(i_param),
+                    name='Parameter {}'.format(i_param),
+                    target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k_{}']/@value".format(i_param)),
+                value=1.)
+            for i_param in range(num_parameters)
+        ],
+        start_time=0.,
+        output_start_time=0.,
+        end_time=10.,
+        num_time_points=10,
+        algorithm=Algorithm(id='cvode', kisao_term=OntologyTerm(ontology='KISAO', id='0000019')),
+        algorithm_parameter_changes=[
+            ParameterChange(
+                parameter=AlgorithmParameter(id='rel_tol', name='relative tolerance',
+                                             kisao_term=OntologyTerm(ontology='KISAO', id='0000209')),
+                value=1e-6),
+        ],
+    )
+
+
+def run(num_variants=DEFAULT_NUM_VARIANTS, num_parameters=DEFAULT_NUM_PARAMETERS, num_variables=DEFAULT_NUM_VARIABLES):
+    """ Time the rendering of variants of a simulation experiment with a template and with the writer
+
+    Args:
+        num_variants (:obj:`int`, optional): number of variants to render
+        num_parameters (:obj:`int`, optional): number of model parameter changes
+        num_variables (:obj:`int`, optional): number of variables
+
+    Returns:
+        :obj:`tuple`: numbers of variants rendered per second with the template and with the writer
+    """
+    sim = gen_sim(num_parameters=num_parameters, num_variables=num_variables)
+    values = [([random.random() for _ in range(num_parameters)], [random.random()]) for _ in range(num_variants)]
+
+    start = time.perf_counter()
+    template = SedMlSimulationTemplate(sim)
+    for model_parameter_values, algorithm_parameter_values in values:
+        template.render(model_parameter_values, algorithm_parameter_values)
+    template_rate = num_variants / (time.perf_counter() - start)
+
+    # render a fraction of the variants with the writer because it is much slower
+    num_writer_variants = max(1, num_variants // 100)
+    writer = SedMlSimulationWriter()
+    start = time.perf_counter()
+    for model_parameter_values, algorithm_parameter_values in values[0:num_writer_variants]:
+        variant = copy.copy(sim)
+        variant.model_parameter_changes = [copy.copy(change) for change in sim.model_parameter_changes]
+        variant.algorithm_parameter_changes = [copy.copy(change) for change in sim.algorithm_parameter_changes]
+        for change, value in zip(variant.model_parameter_changes, model_parameter_values):
+            change.value = value
+        for change, value in zip(variant.algorithm_parameter_changes, algorithm_parameter_values):
+            change.value = value
+        writer.run(variant, io.BytesIO())
+    writer_rate = num_writer_variants / (time.perf_counter() - start)
+
+    print('template: {:10.0f} variants / s'.format(template_rate))
+    print('writer:   {:10.0f} variants / s'.format(writer_rate))
+    return (template_rate, writer_rate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the rendering of variants of SED-ML documents from templates')
+    parser.add_argument('--num-variants', type=int, default=DEFAULT_NUM_VARIANTS, help='number of variants to render')
+    parser.add_argument('--num-parameters', type=int, default=DEFAULT_NUM_PARAMETERS, help='number of model parameter changes')
+    parser.add_argument('--num-variables', type=int, default=DEFAULT_NUM_VARIABLES, help='number of variables')
+    args = parser.parse_args()
+    run(num_variants=args.num_variants, num_parameters=args.num_parameters, num_variables=args.num_variables)
@@ -0,0 +1,105 @@
+""" Benchmark the error checking modes of the SED-ML writer with the number of variables of reports
+
+Generates simulation experiments with increasing numbers of model variables, each of which is written
+to its own data generator and data set of a report, and reports the time required to write each
+simulation experiment with each error checking mode of :obj:`SedMlSimulationWriter`.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-10
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel.data_model import Biomodel, BiomodelFormat, BiomodelVariable
+from Biosimulations_utils.data_model import OntologyTerm, RemoteFile
+from Biosimulations_utils.simulation import write_simulation
+from Biosimulations_utils.simulation.data_model import Algorithm, SimulationFormat, TimecourseSimulation
+from Biosimulations_utils.simulation.sedml import SedMlSimulationWriter
+import argparse
+import copy
+import os
+import shutil
+import tempfile
+import time
+
+DEFAULT_NUM_VARIABLES = [1000, 3000, 10000]
+DEFAULT_NUM_REPEATS = 3
+
+
+def gen_sim(num_variables):
+    """ Generate a time course simulation experiment which records a number of variables
+
+    Args:
+        num_variables (:obj:`int`): number of variables
+
+    Returns:
+        :obj:`TimecourseSimulation`: simulation experiment
+    """
+    format = copy.copy(SimulationFormat.sedml.value)
+    format.version = 'L1V3'
+    return TimecourseSimulation(
+        id='sim',
+        name='Simulation',
+        format=format,
+        model=Biomodel(
+            id='model',
+            file=RemoteFile(name='model.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='s_{}'.format(i_var),
+                                 target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='s_{}']".format(i_var))
+                for i_var in range(num_variables)
+            ],
+        ),
+        start_time=0.,
+        output_start_time=0.,
+        end_time=10.,
+        num_time_points=10,
+        algorithm=Algorithm(id='cvode', kisao_term=OntologyTerm(ontology='KISAO', id='0000019')),
+    )
+
+
+def run(num_variables=None, num_repeats=DEFAULT_NUM_REPEATS):
+    """ Time the writing of simulation experiments with increasing numbers of variables with each error checking mode
+
+    Args:
+        num_variables (:obj:`list` of :obj:`int`, optional): numbers of variables of the simulation experiments
+        num_repeats (:obj:`int`, optional): number of times to write each simulation experiment; the minimum time is reported
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: number of variables and the time to write the simulation experiment (s) with
+            each error checking mode
+    """
+    results = []
+    dirname = tempfile.mkdtemp()
+    try:
+        for n_vars in (num_variables or DEFAULT_NUM_VARIABLES):
+            sim = gen_sim(n_vars)
+            filename = os.path.join(dirname, 'sim-{}.sedml'.format(n_vars))
+
+            durations = []
+            for error_checking in SedMlSimulationWriter.ERROR_CHECKING_MODES:
+                duration = float('inf')
+                for _ in range(num_repeats):
+                    start = time.perf_counter()
+                    write_simulation(sim, filename, error_checking=error_checking)
+                    duration = min(duration, time.perf_counter() - start)
+                durations.append(duration)
+
+            results.append((n_vars, *durations))
+            print('{:>8d} variables: {}'.format(n_vars, ', '.join(
+                '{} {:8.3f} s'.format(mode, duration)
+                for mode, duration in zip(SedMlSimulationWriter.ERROR_CHECKING_MODES, durations))))
+    finally:
+        shutil.rmtree(dirname)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the error checking modes of the SED-ML writer')
+    parser.add_argument('num_variables', type=int, nargs='*', default=DEFAULT_NUM_VARIABLES,
+                        help='numbers of variables of the simulation experiments')
+    parser.add_argument('--num-repeats', type=int, default=DEFAULT_NUM_REPEATS,
+                        help='number of times to write each simulation experiment')
+    args = parser.parse_args()
+    run(args.num_variables, num_repeats=args.num_repeats)
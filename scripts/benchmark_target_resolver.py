@@ -0,0 +1,95 @@
+""" Benchmark the resolution of the targets of model changes
+
+Generates an SBML-encoded model with a large number of parameters and local parameters, and reports
+the number of targets of changes to them resolved per second by evaluating each target with
+:obj:`etree._ElementTree.xpath` and with :obj:`XmlTargetResolver`.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel.sbml import PARAMETER_TARGET
+from Biosimulations_utils.simulation.target_resolver import XmlTargetResolver
+from lxml import etree
+import argparse
+import random
+import time
+
+SBML_NS = 'http://www.sbml.org/sbml/level3/version1/core'
+LOCAL_PARAMETER_TARGET = ("/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction[@id='{}']/sbml:kineticLaw"
+                          "/sbml:listOfLocalParameters/sbml:localParameter[@id='{}']")
+DEFAULT_NUM_PARAMETERS = [1000, 3000, 10000]
+
+
+def gen_model(num_parameters):
+    """ Generate an SBML-encoded model with a number of global parameters and the same number of local parameters
+
+    Args:
+        num_parameters (:obj:`int`): number of global parameters
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`etree._ElementTree`: model
+            * :obj:`list` of :obj:`str`: targets of the parameters
+    """
+    sbml = etree.Element('{{{}}}sbml'.format(SBML_NS), nsmap={None: SBML_NS}, level='3', version='1')
+    model = etree.SubElement(sbml, '{{{}}}model'.format(SBML_NS), id='model')
+
+    targets = []
+    params = etree.SubElement(model, '{{{}}}listOfParameters'.format(SBML_NS))
+    for i_param in range(num_parameters):
+        etree.SubElement(params, '{{{}}}parameter'.format(SBML_NS), id='k_{}'.format(i_param), value='1')
+        targets.append(PARAMETER_TARGET.format('k_{}'.format(i_param)))
+
+    rxns = etree.SubElement(model, '{{{}}}listOfReactions'.format(SBML_NS))
+    for i_rxn in range(num_parameters):
+        rxn = etree.SubElement(rxns, '{{{}}}reaction'.format(SBML_NS), id='r_{}'.format(i_rxn))
+        law = etree.SubElement(rxn, '{{{}}}kineticLaw'.format(SBML_NS))
+        local_params = etree.SubElement(law, '{{{}}}listOfLocalParameters'.format(SBML_NS))
+        etree.SubElement(local_params, '{{{}}}localParameter'.format(SBML_NS), id='k', value='1')
+        targets.append(LOCAL_PARAMETER_TARGET.format('r_{}'.format(i_rxn), 'k'))
+
+    return (etree.ElementTree(sbml), targets)
+
+
+def run(num_parameters=None):
+    """ Time the resolution of the targets of changes to each parameter of models with increasing numbers of parameters
+
+    Args:
+        num_parameters (:obj:`list` of :obj:`int`, optional): numbers of global parameters of the models
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: number of changes and the numbers of changes resolved per second with
+            :obj:`etree._ElementTree.xpath` and with :obj:`XmlTargetResolver`
+    """
+    namespaces = {'sbml': SBML_NS}
+    results = []
+    for n_params in (num_parameters or DEFAULT_NUM_PARAMETERS):
+        et, targets = gen_model(n_params)
+        random.shuffle(targets)
+
+        start = time.perf_counter()
+        xpath_objs = [et.xpath(target, namespaces=namespaces) for target in targets]
+        xpath_rate = len(targets) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        resolver = XmlTargetResolver(et, namespaces)
+        resolver_objs = [resolver.resolve(target) for target in targets]
+        resolver_rate = len(targets) / (time.perf_counter() - start)
+
+        assert resolver_objs == xpath_objs
+        results.append((len(targets), xpath_rate, resolver_rate))
+        print('{:>8d} changes: xpath {:10.0f} changes / s, resolver {:10.0f} changes / s'.format(
+            len(targets), xpath_rate, resolver_rate))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the resolution of the targets of model changes')
+    parser.add_argument('num_parameters', type=int, nargs='*', default=DEFAULT_NUM_PARAMETERS,
+                        help='numbers of global parameters of the models')
+    args = parser.parse_args()
+    run(args.num_parameters)
@@ -6,7 +6,8 @@
 :License: MIT
 """
 
-from Biosimulations_utils.archive import write_archive, read_archive
+from Biosimulations_utils.archive import write_archive, read_archive, open_archive
+from Biosimulations_utils.archive.combine_zipfile import ZipfileCombineArchive, ZipfileCombineArchiveWriter
 from Biosimulations_utils.archive.core import ArchiveIoError
 from Biosimulations_utils.archive.data_model import Archive, ArchiveFile, ArchiveFormat
 from Biosimulations_utils.data_model import Format, Person
@@ -15,11 +16,14 @@ from Biosimulations_utils.simulation.data_model import SimulationFormat
 from unittest import mock
 import datetime
 import dateutil.tz
+import glob
+import io
 import libcombine
 import os
 import shutil
 import tempfile
 import unittest
+import zipfile
 
 
 class OmexArchiveTestCase(unittest.TestCase):
@@ -76,6 +80,8 @@ class OmexArchiveTestCase(unittest.TestCase):
         # test error handling
         with self.assertRaisesRegex(NotImplementedError, "is not supported"):
             write_archive(archive, archive_dir1, archive_filename, format=mock.Mock(name='None'))
+        with self.assertRaisesRegex(NotImplementedError, "is not supported"):
+            write_archive(archive, archive_dir1, archive_filename, engine='none')
         with self.assertRaisesRegex(NotImplementedError, "is not supported"):
             read_archive(archive_filename, archive_dir2, format=mock.Mock(name='None'))
 
@@ -113,3 +119,203 @@ class OmexArchiveTestCase(unittest.TestCase):
         archive_dir3 = os.path.join(self.dirname, 'dir3')
         archive_3 = read_archive(archive_filename_2, archive_dir3)
         archive_3.updated > archive_2.updated
+
+    def test_contents_from_memory(self):
+        archive_dir1 = os.path.join(self.dirname, 'dir1')
+        archive_dir2 = os.path.join(self.dirname, 'dir2')
+        archive_filename = os.path.join(self.dirname, 'archive.omex')
+
+        model = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1">'
+            '<model id="case_01" name="case_01">'
+            '</model>'
+            '</sbml>'
+        )
+        sim = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sedML xmlns="http://sed-ml.org/sed-ml/level1/version3" level="1" version="3"/>'
+        )
+
+        os.makedirs(archive_dir1)
+        with open(os.path.join(archive_dir1, 'model.xml'), 'w') as file:
+            file.write(model)
+
+        archive = Archive(
+            files=[
+                ArchiveFile(filename='./model.xml', format=BiomodelFormat.sbml.value),
+                ArchiveFile(filename='./sim.sedml', format=SimulationFormat.sedml.value),
+            ],
+            format=ArchiveFormat.combine.value,
+        )
+        archive.master_file = archive.files[1]
+
+        write_archive(archive, archive_dir1, archive_filename, contents={'./sim.sedml': sim.encode()})
+        self.assertFalse(os.path.isfile(os.path.join(archive_dir1, 'sim.sedml')))
+
+        read_archive(archive_filename, archive_dir2)
+        with open(os.path.join(archive_dir2, 'model.xml'), 'r') as file:
+            self.assertEqual(file.read(), model)
+        with open(os.path.join(archive_dir2, 'sim.sedml'), 'r') as file:
+            self.assertEqual(file.read(), sim)
+
+    def test_zipfile_engine(self):
+        archive_dir1 = os.path.join(self.dirname, 'dir1')
+        archive_filename1 = os.path.join(self.dirname, 'archive1.omex')
+        archive_filename2 = os.path.join(self.dirname, 'archive2.omex')
+
+        os.makedirs(os.path.join(archive_dir1, 'models'))
+        with open(os.path.join(archive_dir1, 'models', 'model.xml'), 'w') as file:
+            file.write('<sbml/>')
+
+        now = datetime.datetime.utcnow().replace(microsecond=0).replace(tzinfo=dateutil.tz.UTC)
+        archive = Archive(
+            files=[
+                ArchiveFile(filename='./models/model.xml', format=BiomodelFormat.sbml.value, description='Description & <notes>',
+                            authors=[Person(first_name='John', last_name='Doe'), Person(last_name='Roe')], created=now, updated=now),
+                ArchiveFile(filename='./sims/sim.sedml', format=SimulationFormat.sedml.value, description='Description1',
+                            authors=[Person(first_name='John')], created=None, updated=now),
+                ArchiveFile(filename='./sims/sim2.sedml', format=None),
+                ArchiveFile(filename='./sims/sim3.sedml', format=Format(spec_url='https://myspec.com'), description='Description3',
+                            created=now, updated=None),
+                ArchiveFile(filename='./sims/sim4.sedml', format=SimulationFormat.sedml.value),
+            ],
+            description='Description',
+            authors=[Person(first_name='John', last_name='Doe')],
+            format=ArchiveFormat.combine.value,
+            created=now,
+            updated=now,
+        )
+        archive.master_file = archive.files[1]
+
+        contents = {
+            './sims/sim.sedml': '<sedML id="sim"/>',
+            './sims/sim2.sedml': b'<sedML id="sim2"/>',
+            './sims/sim3.sedml': io.BytesIO(b'<sedML id="sim3"/>'),
+            './sims/sim4.sedml': (chunk for chunk in [b'<sedML ', 'id="sim4"/>']),
+        }
+        write_archive(archive, archive_dir1, archive_filename1, contents=contents, engine='zipfile')
+
+        archive_2 = read_archive(archive_filename1, os.path.join(self.dirname, 'dir2'))
+        self.assertEqual(archive_2, archive)
+        for filename, expected_content in [('models/model.xml', '<sbml/>'),
+                                           ('sims/sim.sedml', '<sedML id="sim"/>'),
+                                           ('sims/sim2.sedml', '<sedML id="sim2"/>'),
+                                           ('sims/sim3.sedml', '<sedML id="sim3"/>'),
+                                           ('sims/sim4.sedml', '<sedML id="sim4"/>')]:
+            with open(os.path.join(self.dirname, 'dir2', filename), 'r') as file:
+                self.assertEqual(file.read(), expected_content)
+
+        with zipfile.ZipFile(archive_filename1) as zip_file:
+            self.assertEqual(sorted(zip_file.namelist()), [
+                'manifest.xml', 'metadata.rdf', 'models/model.xml',
+                'sims/sim.sedml', 'sims/sim2.sedml', 'sims/sim3.sedml', 'sims/sim4.sedml',
+            ])
+
+        # archives are read the same as archives written with libCOMBINE
+        archive.files[0].description = 'Description'
+        write_archive(archive, archive_dir1, archive_filename1, contents={
+            './sims/sim.sedml': '', './sims/sim2.sedml': '', './sims/sim3.sedml': '', './sims/sim4.sedml': '',
+        }, engine='zipfile')
+        write_archive(archive, archive_dir1, archive_filename2, contents={
+            './sims/sim.sedml': '', './sims/sim2.sedml': '', './sims/sim3.sedml': '', './sims/sim4.sedml': '',
+        }, engine='libcombine')
+        self.assertEqual(read_archive(archive_filename1, os.path.join(self.dirname, 'dir3')),
+                         read_archive(archive_filename2, os.path.join(self.dirname, 'dir4')))
+
+        # archives without metadata
+        archive = Archive(files=[ArchiveFile(filename='./models/model.xml', format=BiomodelFormat.sbml.value)])
+        for obj in [archive] + archive.files:
+            obj.created = obj.updated = None
+        ZipfileCombineArchiveWriter().run(archive, archive_dir1, archive_filename1)
+        with zipfile.ZipFile(archive_filename1) as zip_file:
+            self.assertEqual(sorted(zip_file.namelist()), ['manifest.xml', 'models/model.xml'])
+        archive_2 = read_archive(archive_filename1, os.path.join(self.dirname, 'dir5'))
+        self.assertEqual([file.filename for file in archive_2.files], ['./models/model.xml'])
+        self.assertEqual(archive_2.master_file, None)
+
+    def test_zipfile_reader(self):
+        # archives are described the same as by libCOMBINE
+        for archive_filename in glob.glob(os.path.join('Biosimulations_utils', 'simulator', 'test-cases', '*.omex')):
+            archive = read_archive(archive_filename, os.path.join(self.dirname, 'libcombine'))
+            archive_2 = read_archive(archive_filename, os.path.join(self.dirname, 'zipfile'), engine='zipfile')
+            self.assertEqual(archive_2, archive, archive_filename)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dirname, 'zipfile'))),
+                         sorted(os.listdir(os.path.join(self.dirname, 'libcombine'))))
+
+        # archives with multiple metadata files, metadata files which can't be parsed, and dates in other formats
+        archive_filename = os.path.join(self.dirname, 'archive.omex')
+        with zipfile.ZipFile(archive_filename, 'w') as zip_file:
+            zip_file.writestr('manifest.xml', (
+                '<omexManifest xmlns="http://identifiers.org/combine.specifications/omex-manifest">'
+                '<content location="." format="http://identifiers.org/combine.specifications/omex"/>'
+                '<content location="./model.xml" format="http://identifiers.org/combine.specifications/sbml"/>'
+                '<content location="./sim.sedml" format="http://identifiers.org/combine.specifications/sed-ml" master="true"/>'
+                '<content location="./data.csv"/>'
+                '<content location="./metadata_1.rdf" format="http://identifiers.org/combine.specifications/omex-metadata"/>'
+                '<content location="./metadata_2.rdf" format="http://identifiers.org/combine.specifications/omex-metadata"/>'
+                '<content location="./invalid.rdf" format="http://identifiers.org/combine.specifications/omex-metadata"/>'
+                '</omexManifest>'))
+            zip_file.writestr('model.xml', '<sbml/>')
+            zip_file.writestr('sim.sedml', '<sedML/>')
+            zip_file.writestr('data.csv', '1,2,3')
+            rdf = ('<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dcterms="http://purl.org/dc/terms/"'
+                   ' xmlns:vCard="http://www.w3.org/2006/vcard/ns#">{}</rdf:RDF>')
+            zip_file.writestr('metadata_1.rdf', rdf.format(
+                '<rdf:Description rdf:about="."><dcterms:description>First</dcterms:description></rdf:Description>'
+                '<rdf:Description rdf:about=".">'
+                '<dcterms:description>Second</dcterms:description>'
+                '<dcterms:created rdf:parseType="Resource"><dcterms:W3CDTF>2020-03-01</dcterms:W3CDTF></dcterms:created>'
+                '<dcterms:modified rdf:parseType="Resource"><dcterms:W3CDTF>2020-03-02T01:02:03.5Z</dcterms:W3CDTF></dcterms:modified>'
+                '<dcterms:modified rdf:parseType="Resource"><dcterms:W3CDTF>2020-03-03T01:02:03</dcterms:W3CDTF></dcterms:modified>'
+                '</rdf:Description>'
+                '<rdf:Description rdf:about="./model.xml">'
+                '<dcterms:modified rdf:parseType="Resource"><dcterms:W3CDTF>2020-03-01T01:02:03-04:30</dcterms:W3CDTF></dcterms:modified>'
+                '<dcterms:creator rdf:parseType="Resource"><vCard:hasName rdf:parseType="Resource">'
+                '<vCard:given-name>John</vCard:given-name></vCard:hasName></dcterms:creator>'
+                '</rdf:Description>'
+                '<rdf:Description rdf:about="./data.csv">'
+                '<dcterms:created rdf:parseType="Resource"><dcterms:W3CDTF>2020-03-01</dcterms:W3CDTF></dcterms:created>'
+                '</rdf:Description>'))
+            zip_file.writestr('metadata_2.rdf', rdf.format(
+                '<rdf:Description rdf:about="."><dcterms:description>Third</dcterms:description></rdf:Description>'
+                '<rdf:Description rdf:about="./sim.sedml"><dcterms:description>A &amp; B</dcterms:description></rdf:Description>'))
+            zip_file.writestr('invalid.rdf', '<rdf:RDF & />')
+
+        archive = read_archive(archive_filename, os.path.join(self.dirname, 'libcombine-2'))
+        archive_2 = read_archive(archive_filename, os.path.join(self.dirname, 'zipfile-2'), engine='zipfile', filenames=[])
+        self.assertEqual(archive_2, archive)
+        self.assertEqual(archive_2.description, 'Second')
+        self.assertEqual([file.filename for file in archive_2.files], ['./model.xml', './sim.sedml', './data.csv', './invalid.rdf'])
+        self.assertEqual(archive_2.master_file.filename, './sim.sedml')
+        self.assertFalse(os.path.isdir(os.path.join(self.dirname, 'zipfile-2')))
+
+        # random access to files
+        with open_archive(archive_filename) as archive_zip:
+            self.assertIsInstance(archive_zip, ZipfileCombineArchive)
+            self.assertEqual(archive_zip.archive, archive)
+            self.assertEqual(archive_zip.read('./sim.sedml'), b'<sedML/>')
+            with archive_zip.open('./data.csv') as file:
+                self.assertEqual(file.read(), b'1,2,3')
+
+            archive_zip.extract(os.path.join(self.dirname, 'zipfile-3'), filenames=['./model.xml'])
+            self.assertEqual(os.listdir(os.path.join(self.dirname, 'zipfile-3')), ['model.xml'])
+
+            with self.assertRaises(KeyError):
+                archive_zip.read('./does-not-exist.xml')
+
+        # error handling
+        with self.assertRaisesRegex(ArchiveIoError, "Invalid COMBINE archive"):
+            read_archive('non-existant-file', self.dirname, engine='zipfile')
+
+        with zipfile.ZipFile(archive_filename, 'w') as zip_file:
+            zip_file.writestr('model.xml', '<sbml/>')
+        with self.assertRaisesRegex(ArchiveIoError, "Invalid COMBINE archive"):
+            read_archive(archive_filename, self.dirname, engine='zipfile')
+
+        with self.assertRaisesRegex(NotImplementedError, "is not supported"):
+            read_archive(archive_filename, self.dirname, filenames=['./model.xml'])
+        with self.assertRaisesRegex(NotImplementedError, "is not supported"):
+            read_archive(archive_filename, self.dirname, engine='none')
+        with self.assertRaisesRegex(NotImplementedError, "is not supported"):
+            open_archive(archive_filename, format=mock.Mock(name='None'))
@@ -8,9 +8,13 @@
 
 from Biosimulations_utils.data_model import (Identifier, JournalReference,
                                              License, OntologyTerm, Person, RemoteFile, Taxon, Type)
-from Biosimulations_utils.biomodel.data_model import (Biomodel, BiomodelParameter, BiomodelVariable, BiomodelFormat)
+from Biosimulations_utils.biomodel.data_model import (Biomodel, BiomodelParameter, BiomodelParameterTable,
+                                                      BiomodelVariable, BiomodelFormat, XPathTarget,
+                                                      calc_recommended_param_ranges)
 import datetime
 import dateutil.tz
+import numpy
+import numpy.testing
 import unittest
 
 
@@ -54,3 +58,73 @@ class BiomodelDataModelTestCase(unittest.TestCase):
         var = BiomodelVariable(id='species_1', type=Type.float, identifiers=[Identifier(namespace='a', id='x')])
         self.assertEqual(BiomodelVariable.from_json(var.to_json()), var)
         self.assertEqual(BiomodelVariable.sort_key(var), var.id)
+
+    def test_Parameter_with_XPathTarget(self):
+        param = BiomodelParameter(id='k_1',
+                                  target=XPathTarget("/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='{}']", 'k_1'))
+        self.assertEqual(param.to_json()['target'], "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k_1']")
+        self.assertEqual(BiomodelParameter.from_json(param.to_json()), param)
+
+    def test_XPathTarget(self):
+        template = "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='{}']"
+        target = XPathTarget(template, 'A')
+        self.assertEqual(str(target), "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']")
+        self.assertEqual(repr(target), "XPathTarget(\"/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']\")")
+
+        # templates are shared
+        self.assertIs(XPathTarget(''.join(list(template)), 'B').template, target.template)
+
+        # equality with targets and strings
+        self.assertEqual(target, XPathTarget(template, 'A'))
+        self.assertNotEqual(target, XPathTarget(template, 'B'))
+        self.assertEqual(target, XPathTarget("/sbml:sbml/sbml:model/{}/sbml:species[@id='{}']", 'sbml:listOfSpecies', 'A'))
+        self.assertEqual(target, "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']")
+        self.assertEqual("/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']", target)
+        self.assertNotEqual(target, "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='B']")
+        self.assertNotEqual(target, None)
+
+        # targets and strings can be used interchangeably as keys
+        self.assertEqual({target: 1}.get("/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']"), 1)
+        self.assertEqual({"/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']": 1}.get(target), 1)
+
+    def test_BiomodelParameterTable(self):
+        model = Biomodel(parameters=[
+            BiomodelParameter(id='k_1', target='k_1_target', type=Type.float, value=2., recommended_range=[0.2, 20.]),
+            BiomodelParameter(id='k_2', target='k_2_target', type=Type.float, value=0., recommended_range=[0., 10.]),
+            BiomodelParameter(id='k_3', target='k_3_target', type=Type.integer, value=3, recommended_range=[0, 5]),
+            BiomodelParameter(id='k_4', target='k_4_target', type=Type.string, value='a'),
+            BiomodelParameter(id='k_5'),
+        ])
+
+        table = model.get_parameter_table()
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table.ids.tolist(), ['k_1', 'k_2', 'k_3', 'k_4', 'k_5'])
+        self.assertEqual(table.targets.tolist(), ['k_1_target', 'k_2_target', 'k_3_target', 'k_4_target', None])
+        self.assertEqual([BiomodelParameterTable.TYPES[type] for type in table.types[0:4]],
+                         [Type.float, Type.float, Type.integer, Type.string])
+        self.assertEqual(table.types[4], -1)
+        numpy.testing.assert_array_equal(table.values, [2., 0., 3., numpy.nan, numpy.nan])
+        numpy.testing.assert_array_equal(table.recommended_mins, [0.2, 0., 0., numpy.nan, numpy.nan])
+        numpy.testing.assert_array_equal(table.recommended_maxs, [20., 10., 5., numpy.nan, numpy.nan])
+
+        # recalculate ranges
+        table = model.get_parameter_table(zero_fold=1., non_zero_fold=2.)
+        numpy.testing.assert_array_equal(table.recommended_mins, [1., 0., 1.5, numpy.nan, numpy.nan])
+        numpy.testing.assert_array_equal(table.recommended_maxs, [4., 1., 6., numpy.nan, numpy.nan])
+
+        # subsets
+        subset = table[table.recommended_maxs > 2.]
+        self.assertEqual(subset.ids.tolist(), ['k_1', 'k_3'])
+        numpy.testing.assert_array_equal(subset.values, [2., 3.])
+        self.assertEqual(table[1:2].ids.tolist(), ['k_2'])
+
+        self.assertEqual(len(Biomodel().get_parameter_table()), 0)
+
+    def test_calc_recommended_param_ranges(self):
+        mins, maxs = calc_recommended_param_ranges([0., 2., -3.])
+        numpy.testing.assert_array_almost_equal(mins, [0., 0.2, -0.3])
+        numpy.testing.assert_array_equal(maxs, [10., 20., -30.])
+
+        mins, maxs = calc_recommended_param_ranges([0., 2.], zero_fold=5., non_zero_fold=2.)
+        numpy.testing.assert_array_equal(mins, [0., 1.])
+        numpy.testing.assert_array_equal(maxs, [5., 4.])
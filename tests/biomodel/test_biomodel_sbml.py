@@ -7,12 +7,15 @@
 """
 
 from Biosimulations_utils.data_model import Taxon, Type
-from Biosimulations_utils.biomodel import read_biomodel
-from Biosimulations_utils.biomodel.core import BiomodelIoError
+from Biosimulations_utils.biomodel import read_biomodel, read_biomodels
+from Biosimulations_utils.biomodel.core import BiomodelIoError, BiomodelReaderStats
 from Biosimulations_utils.biomodel.data_model import BiomodelFormat, BiomodelParameter, BiomodelVariable
-from Biosimulations_utils.biomodel.sbml import visualize_biomodel
+from Biosimulations_utils.biomodel.sbml import (SbmlBiomodelReader, SbmlModelIndex, SbmlUnitDefCache,
+                                                read_constant_from_math, unit_def_cache, visualize_biomodel)
+from unittest import mock
 import copy
 import importlib
+import io
 import libsbml
 import os
 import shutil
@@ -289,6 +292,21 @@ class ReadSbmlBiomodelTestCase(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'does not exist'):
             read_biomodel('__non_existant_file__', format=BiomodelFormat.sbml)
 
+    def test_run_from_memory(self):
+        filename = 'tests/fixtures/BIOMD0000000297.xml'
+        model = read_biomodel(filename, format=BiomodelFormat.sbml)
+        with open(filename, 'rb') as file:
+            content = file.read()
+        model.file.name = None
+
+        self.assertEqual(read_biomodel(content, format=BiomodelFormat.sbml), model)
+        self.assertEqual(read_biomodel(io.BytesIO(content), format=BiomodelFormat.sbml), model)
+        self.assertEqual(read_biomodel(io.StringIO(content.decode()), format=BiomodelFormat.sbml), model)
+        self.assertEqual(model.file.size, len(content))
+
+        with self.assertRaisesRegex(ValueError, 'does not contain a valid model'):
+            read_biomodel(b'<sbml/>', format=BiomodelFormat.sbml)
+
     def test_run_comp_package_with_no_composed_models(self):
         filename = 'tests/fixtures/BIOMD0000000613.xml'
         read_biomodel(filename, format=BiomodelFormat.sbml)
@@ -435,6 +453,197 @@ class ReadSbmlBiomodelTestCase(unittest.TestCase):
         param = list(filter(lambda param: param.id == 'lambda_1', model.parameters))[0]
         self.assertEqual(param.units, '1.157 10^-4 1 / second')
 
+    def test_run_profiles(self):
+        for filename in ['tests/fixtures/BIOMD0000000297.xml', 'tests/fixtures/MODEL1904090001.sbml-L3V2.xml']:
+            for engine in ['libsbml', 'lxml']:
+                model = read_biomodel(filename, format=BiomodelFormat.sbml, engine=engine)
+
+                stats = BiomodelReaderStats()
+                metadata = read_biomodel(filename, format=BiomodelFormat.sbml, engine=engine, profile='metadata_only',
+                                         stats=stats)
+                self.assertEqual(metadata.file, model.file)
+                self.assertEqual(metadata.format, model.format)
+                self.assertEqual(metadata.id, model.id)
+                self.assertEqual(metadata.name, model.name)
+                self.assertEqual(metadata.framework, model.framework)
+                self.assertEqual(metadata.taxon, None)
+                self.assertEqual(list(metadata.parameters), [])
+                self.assertEqual(metadata.variables, [])
+                self.assertNotIn('read_units', stats.times)
+                self.assertEqual(stats.counts['units_formatted'], 0)
+                self.assertEqual(stats.counts['taxa_resolved'], 0)
+
+                # rules and initial assignments aren't read
+                with mock.patch.object(SbmlModelIndex, '_index_rules', side_effect=Exception('rules should not be read')):
+                    with mock.patch.object(SbmlModelIndex, '_index_initial_assignments',
+                                           side_effect=Exception('initial assignments should not be read')):
+                        read_biomodel(filename, format=BiomodelFormat.sbml, engine=engine, profile='metadata_only')
+
+                params = read_biomodel(filename, format=BiomodelFormat.sbml, engine=engine, profile='parameters_only')
+                self.assertEqual(params.framework, model.framework)
+                self.assertEqual(params.taxon, None)
+                self.assertEqual(list(params.parameters), list(model.parameters))
+                self.assertEqual(params.variables, [])
+
+        with self.assertRaisesRegex(NotImplementedError, 'Profile unknown is not supported'):
+            read_biomodel(filename, format=BiomodelFormat.sbml, profile='unknown')
+
+
+class ReadSbmlBiomodelsTestCase(unittest.TestCase):
+    FILENAMES = [
+        'tests/fixtures/BIOMD0000000297.xml',
+        '__non_existant_file__',
+        'tests/fixtures/MODEL1904090001-with-model-defs.sbml-L3V2.xml',
+        'tests/fixtures/MODEL1204280027.sbml-L2V4.xml',
+    ]
+
+    def _assert_results(self, results):
+        self.assertEqual([filename for filename, _, _ in results], self.FILENAMES)
+
+        for filename, model, exception in results:
+            if filename in [self.FILENAMES[0], self.FILENAMES[3]]:
+                self.assertEqual(model, read_biomodel(filename, format=BiomodelFormat.sbml))
+                self.assertEqual(exception, None)
+            else:
+                self.assertEqual(model, None)
+
+        self.assertIsInstance(results[1][2], ValueError)
+        self.assertIsInstance(results[2][2], BiomodelIoError)
+        self.assertRegex(str(results[2][2]), 'package is not supported')
+
+    def test_sequential(self):
+        results = list(read_biomodels(self.FILENAMES, format=BiomodelFormat.sbml))
+        self._assert_results(results)
+
+    def test_parallel(self):
+        results = list(read_biomodels(self.FILENAMES, format=BiomodelFormat.sbml, workers=2))
+        self._assert_results(results)
+
+    def test_parallel_unordered(self):
+        results = list(read_biomodels(self.FILENAMES, format=BiomodelFormat.sbml, engine='lxml', workers=2, ordered=False))
+        results.sort(key=lambda result: self.FILENAMES.index(result[0]))
+        self._assert_results(results)
+
+
+class BiomodelReaderStatsTestCase(unittest.TestCase):
+    def test_run(self):
+        filename = 'tests/fixtures/BIOMD0000000297.xml'
+        reader = SbmlBiomodelReader()
+        model = reader.run(filename)
+
+        self.assertEqual(list(reader.stats.times.keys()), [
+            'read_from_file', 'read_format', 'read_metadata', 'read_units', 'read_parameters', 'read_variables',
+        ])
+        for duration in reader.stats.times.values():
+            self.assertGreaterEqual(duration, 0.)
+
+        model_sbml = libsbml.readSBMLFromFile(filename).getModel()
+        self.assertEqual(reader.stats.counts['species'], model_sbml.getNumSpecies())
+        self.assertEqual(reader.stats.counts['reactions'], model_sbml.getNumReactions())
+        self.assertEqual(reader.stats.counts['rules'], model_sbml.getNumRules())
+        self.assertGreater(reader.stats.counts['units_formatted'], 0)
+        self.assertEqual(reader.stats.counts['taxa_resolved'], 1 if model.taxon else 0)
+
+        self.assertEqual(set(reader.stats.to_json().keys()), set(['times', 'counts']))
+
+    def test_read_biomodel_with_collector(self):
+        stats = BiomodelReaderStats()
+        read_biomodel('tests/fixtures/BIOMD0000000297.xml', format=BiomodelFormat.sbml, stats=stats)
+        read_biomodel('tests/fixtures/MODEL1204280027.sbml-L2V4.xml', format=BiomodelFormat.sbml, stats=stats)
+        self.assertEqual(len(stats.times), 6)
+        self.assertEqual(stats.counts['species'], 43)
+
+    def test_custom_collector(self):
+        class Collector(BiomodelReaderStats):
+            def __init__(self):
+                super(Collector, self).__init__()
+                self.events = []
+
+            def add_time(self, phase, duration):
+                self.events.append(phase)
+
+        stats = Collector()
+        read_biomodel('tests/fixtures/BIOMD0000000297.xml', format=BiomodelFormat.sbml, stats=stats)
+        self.assertEqual(stats.events, [
+            'read_from_file', 'read_format', 'read_metadata', 'read_units', 'read_parameters', 'read_variables',
+        ])
+        self.assertEqual(stats.times, {})
+
+    def test_time_phase_which_raises_error(self):
+        stats = BiomodelReaderStats()
+        with self.assertRaises(ValueError):
+            read_biomodel('__non_existant_file__', format=BiomodelFormat.sbml, stats=stats)
+        self.assertEqual(list(stats.times.keys()), ['read_from_file'])
+
+
+class SbmlModelIndexTestCase(unittest.TestCase):
+    def test(self):
+        doc = libsbml.readSBMLFromFile('tests/fixtures/BIOMD0000000075.xml')
+        model_sbml = doc.getModel()
+        index = SbmlModelIndex(model_sbml)
+
+        self.assertEqual(set(index.compartments.keys()), set(comp.getId() for comp in model_sbml.getListOfCompartments()))
+        self.assertEqual(set(index.species.keys()), set(species.getId() for species in model_sbml.getListOfSpecies()))
+        self.assertEqual(set(index.reactions.keys()), set(rxn.getId() for rxn in model_sbml.getListOfReactions()))
+        self.assertEqual(set(index.parameters.keys()), set(param.getId() for param in model_sbml.getListOfParameters()))
+        self.assertEqual(set(index.rules.keys()),
+                         set(rule.getVariable() for rule in model_sbml.getListOfRules() if rule.isScalar()))
+        self.assertEqual(set(index.initial_assignments.keys()),
+                         set(assignment.getSymbol() for assignment in model_sbml.getListOfInitialAssignments()))
+
+        rules_sbml = [rule for rule in model_sbml.getListOfRules() if rule.isScalar()]
+        self.assertEqual([assignment.target_id for assignment in index.scalar_rule_assignments],
+                         [rule.getVariable() for rule in rules_sbml])
+        for assignment in index.scalar_rule_assignments:
+            self.assertEqual(assignment.target_sbml.getId(), assignment.target_id)
+            self.assertEqual((assignment.type, assignment.value), read_constant_from_math(assignment.sbml.getMath()))
+        self.assertEqual([assignment.target_id for assignment in index.initial_assignment_assignments],
+                         [assignment.getSymbol() for assignment in model_sbml.getListOfInitialAssignments()])
+
+        for id in ['Rate_PIP2SynStim_PIP2Syn', model_sbml.getSpecies(0).getId(), model_sbml.getCompartment(0).getId(),
+                   model_sbml.getReaction(0).getId()]:
+            self.assertEqual(index.get_element(id).getId(), id)
+            self.assertEqual(index.get_element(id).getElementName(), model_sbml.getElementBySId(id).getElementName())
+        self.assertEqual(index.get_element('__undefined__'), None)
+
+
+class SbmlUnitDefCacheTestCase(unittest.TestCase):
+    def test(self):
+        cache = SbmlUnitDefCache(maxsize=1)
+
+        unit_def = libsbml.UnitDefinition(3, 1)
+        unit = unit_def.createUnit()
+        unit.setKind(libsbml.UNIT_KIND_MOLE)
+        unit.setExponent(1)
+        unit.setScale(-3)
+        unit.setMultiplier(1.)
+
+        self.assertEqual(cache.format(unit_def), ('(0.001 mole)^1', 'mmole'))
+        self.assertEqual(cache.format(unit_def), ('(0.001 mole)^1', 'mmole'))
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1, 'maxsize': 1, 'size': 1})
+
+        unit_def_2 = libsbml.UnitDefinition(3, 1)
+        unit = unit_def_2.createUnit()
+        unit.setKind(libsbml.UNIT_KIND_SECOND)
+        unit.setExponent(-1)
+        unit.setScale(0)
+        unit.setMultiplier(1.)
+        self.assertEqual(cache.format(unit_def_2), ('(1 second)^-1', '1 / second'))
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 2, 'maxsize': 1, 'size': 1})
+
+        self.assertEqual(cache.format(unit_def), ('(0.001 mole)^1', 'mmole'))
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 3, 'maxsize': 1, 'size': 1})
+
+        cache.clear()
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 0, 'maxsize': 1, 'size': 0})
+
+    def test_shared_across_models(self):
+        unit_def_cache.clear()
+        read_biomodel('tests/fixtures/BIOMD0000000297.xml', format=BiomodelFormat.sbml)
+        info = unit_def_cache.get_info()
+        self.assertGreater(info['hits'], 0)
+        self.assertEqual(info['misses'], info['size'])
+
 
 class VizBiomodelTestCase(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,144 @@
+""" Tests of utilities for reading SBML-encoded models with lxml
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-05
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel import read_biomodel
+from Biosimulations_utils.biomodel.core import BiomodelIoError, BiomodelReaderStats
+from Biosimulations_utils.biomodel.data_model import Biomodel, BiomodelFormat
+from Biosimulations_utils.biomodel.sbml import SbmlBiomodelReader
+from Biosimulations_utils.biomodel.sbml_lxml import LxmlSbmlBiomodelReader, LibsbmlRequiredError
+import glob
+import importlib
+import io
+import libsbml
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class LxmlSbmlBiomodelReaderTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # work around errors from "swig/python detected a memory leak of type 'ASTNodeType_t *', no destructor found."
+        importlib.reload(libsbml)
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_equivalent_to_libsbml(self):
+        filenames = sorted(glob.glob('tests/fixtures/*.xml'))
+        self.assertGreater(len(filenames), 0)
+
+        for filename in filenames:
+            try:
+                model = read_biomodel(filename, format=BiomodelFormat.sbml, engine='libsbml')
+            except BiomodelIoError:
+                with self.assertRaises(BiomodelIoError, msg=filename):
+                    read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml')
+                continue
+
+            model_lxml = read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml')
+            self.assertEqual(model_lxml.to_json(), model.to_json(), msg=filename)
+
+    def test_read_from_memory(self):
+        for filename in [
+            'tests/fixtures/BIOMD0000000297.xml',
+            'tests/fixtures/MODEL1904090001.sbml-L3V2.xml',
+        ]:
+            model = read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml')
+            model.file.name = None
+            with open(filename, 'rb') as file:
+                content = file.read()
+            self.assertEqual(read_biomodel(content, format=BiomodelFormat.sbml, engine='lxml'), model, msg=filename)
+
+            # streams are read once so that models which must be read with libSBML can be read again
+            self.assertEqual(read_biomodel(io.BytesIO(content), format=BiomodelFormat.sbml, engine='lxml'), model, msg=filename)
+
+    def test_stream_core_models(self):
+        for filename in [
+            'tests/fixtures/BIOMD0000000018.sbml-L3V1.xml',
+            'tests/fixtures/BIOMD0000000297.xml',
+            'tests/fixtures/MODEL1204280027.sbml-L2V4.xml',
+        ]:
+            model_lxml = LxmlSbmlBiomodelReader()._read_from_file(filename, Biomodel())
+            self.assertIn(model_lxml.level, [2, 3])
+            self.assertGreater(len(model_lxml.species), 0)
+
+    def test_stats(self):
+        filename = 'tests/fixtures/BIOMD0000000297.xml'
+        reader = SbmlBiomodelReader()
+        reader.run(filename)
+        lxml_reader = LxmlSbmlBiomodelReader()
+        lxml_reader.run(filename)
+
+        self.assertEqual(list(lxml_reader.stats.times.keys()), list(reader.stats.times.keys()))
+        self.assertEqual(lxml_reader.stats.counts, reader.stats.counts)
+
+    def test_fall_back_to_libsbml_for_packages(self):
+        filename = 'tests/fixtures/MODEL1904090001.sbml-L3V2.xml'
+        with self.assertRaisesRegex(LibsbmlRequiredError, 'fbc'):
+            LxmlSbmlBiomodelReader()._read_from_file(filename, Biomodel())
+
+        stats = BiomodelReaderStats()
+        model = read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml', stats=stats)
+        self.assertEqual(set(var.group for var in model.variables), set(['Objectives', 'Reaction fluxes']))
+        self.assertIn('lxml_attempt', stats.times)
+        self.assertEqual(stats.counts['libsbml_fallbacks'], 1)
+        self.assertEqual(stats.counts['reactions'], libsbml.readSBMLFromFile(filename).getModel().getNumReactions())
+
+    def test_fall_back_to_libsbml_for_non_literal_math(self):
+        doc = libsbml.readSBMLFromFile('tests/fixtures/BIOMD0000000018.sbml-L3V1.xml')
+        model_sbml = doc.getModel()
+        param_id = model_sbml.getParameter(0).getId()
+        init_assignment_sbml = model_sbml.createInitialAssignment()
+        init_assignment_sbml.setSymbol(param_id)
+        init_assignment_sbml.setMath(libsbml.parseL3Formula('2 * 123456'))
+        filename = os.path.join(self.dirname, 'model.xml')
+        libsbml.writeSBMLToFile(doc, filename)
+
+        # expressions are read as non-constant values, as with libSBML
+        model_lxml = LxmlSbmlBiomodelReader()._read_from_file(filename, Biomodel())
+        self.assertEqual(model_lxml.initial_assignments[-1], (param_id, (None, None)))
+
+        # numbers in other bases are read with libSBML
+        init_assignment_sbml.setMath(libsbml.parseL3Formula('123456'))
+        libsbml.writeSBMLToFile(doc, filename)
+        with open(filename, 'r') as file:
+            xml = file.read()
+        self.assertIn('<cn type="integer"> 123456 </cn>', xml)
+        with open(filename, 'w') as file:
+            file.write(xml.replace('<cn type="integer"> 123456 </cn>', '<cn type="integer" base="2"> 101 </cn>'))
+
+        with self.assertRaisesRegex(LibsbmlRequiredError, 'not supported'):
+            LxmlSbmlBiomodelReader()._read_from_file(filename, Biomodel())
+
+        model = read_biomodel(filename, format=BiomodelFormat.sbml, engine='libsbml')
+        model_lxml = read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml')
+        self.assertEqual(model_lxml.to_json(), model.to_json())
+
+    def test_fall_back_to_libsbml_for_invalid_xml(self):
+        filename = os.path.join(self.dirname, 'model.xml')
+        with open(filename, 'w') as file:
+            file.write('<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1"><model')
+
+        with self.assertRaises(LibsbmlRequiredError):
+            LxmlSbmlBiomodelReader()._read_from_file(filename, Biomodel())
+
+        with self.assertRaises(ValueError):
+            read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml')
+
+    def test_file_does_not_exist(self):
+        with self.assertRaises(ValueError):
+            read_biomodel('tests/fixtures/does-not-exist', format=BiomodelFormat.sbml, engine='lxml')
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(NotImplementedError):
+            read_biomodel('tests/fixtures/BIOMD0000000297.xml', format=BiomodelFormat.sbml, engine='unknown')
@@ -0,0 +1,142 @@
+""" Tests of the persistent cache of the variants of models
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.simulation import read_simulation
+from Biosimulations_utils.simulation.model_variant_cache import ModelVariantCache, get_model_variant_cache
+from Biosimulations_utils.simulation.sedml import modify_xml_model_for_simulation
+from unittest import mock
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class ModelVariantCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.cache_dirname = os.path.join(self.dirname, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_key(self):
+        cache = ModelVariantCache(dirname=self.cache_dirname)
+
+        filename = os.path.join(self.dirname, 'model.xml')
+        with open(filename, 'w') as file:
+            file.write('a')
+
+        changes = [('/a/@b', '1'), ('/a/@c', '2')]
+        key = cache.get_key(filename, changes, pretty_print=True)
+        self.assertEqual(cache.get_key(filename, changes, pretty_print=True), key)
+        self.assertEqual(cache.get_key(filename, list(reversed(changes)), pretty_print=True), key)
+        self.assertEqual(cache.get_key(filename, [('/a/@b', '0')] + changes, pretty_print=True), key)
+        self.assertEqual(cache.get_key(b'a', changes, pretty_print=True), key)
+        self.assertNotEqual(cache.get_key(filename, [('/a/@b', '1'), ('/a/@c', '3')], pretty_print=True), key)
+        self.assertNotEqual(cache.get_key(filename, changes + [('/a/@b', '0')], pretty_print=True), key)
+        self.assertNotEqual(cache.get_key(filename, changes, pretty_print=False), key)
+        self.assertNotEqual(cache.get_key(b'b', changes, pretty_print=True), key)
+
+        with mock.patch('Biosimulations_utils.simulation.model_variant_cache.__version__', '0.0.0'):
+            self.assertNotEqual(cache.get_key(filename, changes, pretty_print=True), key)
+
+        self.assertEqual(cache.get_key(os.path.join(self.dirname, 'does-not-exist.xml'), changes), None)
+
+    def test_get_set(self):
+        cache = ModelVariantCache(dirname=self.cache_dirname)
+        out_filename = os.path.join(self.dirname, 'variant.xml')
+        self.assertEqual(cache.get('a', out_filename), None)
+        self.assertFalse(os.path.isfile(out_filename))
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 1})
+
+        cache.set('a', b'<model/>')
+        self.assertEqual(cache.get('a', out_filename), out_filename)
+        with open(out_filename, 'rb') as file:
+            self.assertEqual(file.read(), b'<model/>')
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1})
+
+        # existing files are replaced rather than written through
+        cache.set('b', b'<other-model/>')
+        self.assertEqual(cache.get('b', out_filename), out_filename)
+        with open(out_filename, 'rb') as file:
+            self.assertEqual(file.read(), b'<other-model/>')
+        with open(cache.get('a'), 'rb') as file:
+            self.assertEqual(file.read(), b'<model/>')
+
+        # copy entries which can't be linked
+        os.remove(out_filename)
+        with mock.patch('os.link', side_effect=OSError('cross-device link')):
+            self.assertEqual(cache.get('a', out_filename), out_filename)
+        with open(out_filename, 'rb') as file:
+            self.assertEqual(file.read(), b'<model/>')
+
+        cache.clear()
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 1})
+
+    def test_evict(self):
+        cache = ModelVariantCache(dirname=self.cache_dirname, max_size=25)
+        cache.set('a', b'a' * 10)
+        os.utime(cache._get_entry_filename('a'), (0, 0))
+        cache.set('b', b'b' * 10)
+        os.utime(cache._get_entry_filename('b'), (1, 1))
+        self.assertNotEqual(cache.get('a'), None)
+
+        cache.set('c', b'c' * 10)
+        self.assertNotEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('b'), None)
+        self.assertNotEqual(cache.get('c'), None)
+
+    def test_set_error(self):
+        filename = os.path.join(self.dirname, 'file')
+        with open(filename, 'w'):
+            pass
+        cache = ModelVariantCache(dirname=filename)
+        cache.set('a', b'<model/>')
+        self.assertEqual(cache.get('a'), None)
+
+    def test_get_model_variant_cache(self):
+        self.assertIs(get_model_variant_cache(), get_model_variant_cache())
+
+    def test_modify_xml_model_for_simulation(self):
+        in_model_filename = 'tests/fixtures/BIOMD0000000806.xml'
+        simulations, _ = read_simulation('tests/fixtures/BIOMD0000000806-with-change-attribute.sedml')
+        simulation = simulations[0]
+
+        expected_filename = os.path.join(self.dirname, 'expected.xml')
+        modify_xml_model_for_simulation(simulation, in_model_filename, expected_filename, default_namespace='sbml')
+        with open(expected_filename, 'rb') as file:
+            expected = file.read()
+
+        cache = ModelVariantCache(dirname=self.cache_dirname)
+        out_filename = os.path.join(self.dirname, 'model.xml')
+        for _ in range(2):
+            modify_xml_model_for_simulation(simulation, in_model_filename, out_filename, default_namespace='sbml', cache=cache)
+            with open(out_filename, 'rb') as file:
+                self.assertEqual(file.read(), expected)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1})
+
+        # different changes
+        variant = copy.copy(simulation)
+        variant.model_parameter_changes = [copy.copy(change) for change in simulation.model_parameter_changes]
+        variant.model_parameter_changes[0].value = 10.
+        modify_xml_model_for_simulation(variant, in_model_filename, out_filename, default_namespace='sbml', cache=cache)
+        with open(out_filename, 'rb') as file:
+            self.assertNotEqual(file.read(), expected)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 2})
+
+        modify_xml_model_for_simulation(simulation, in_model_filename, out_filename, default_namespace='sbml', cache=cache)
+        with open(out_filename, 'rb') as file:
+            self.assertEqual(file.read(), expected)
+        self.assertEqual(cache.get_info(), {'hits': 2, 'misses': 2})
+
+        # process-wide cache
+        with mock.patch('Biosimulations_utils.simulation.sedml.get_model_variant_cache', return_value=cache):
+            modify_xml_model_for_simulation(simulation, in_model_filename, out_filename, default_namespace='sbml', cache=True)
+        self.assertEqual(cache.get_info(), {'hits': 3, 'misses': 2})
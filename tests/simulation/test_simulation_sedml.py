@@ -10,17 +10,22 @@ from Biosimulations_utils.chart.data_model import Chart, ChartDataField, ChartDa
 from Biosimulations_utils.data_model import OntologyTerm, RemoteFile
 from Biosimulations_utils.biomodel import read_biomodel
 from Biosimulations_utils.biomodel.data_model import Biomodel, BiomodelVariable, BiomodelFormat
-from Biosimulations_utils.simulation import write_simulation, read_simulation, sedml
-from Biosimulations_utils.simulation.core import SimulationIoError, SimulationIoWarning
+from Biosimulations_utils.simulation import write_simulation, write_simulations, read_simulation, read_simulations, sedml
+from Biosimulations_utils.simulation.core import (SimulationIoError, SimulationIoWarning,
+                                                  SimulationIoDiagnostic, SimulationIoDiagnosticCategory)
 from Biosimulations_utils.simulation.data_model import SimulationFormat, TimecourseSimulation, SimulationResult
-from Biosimulations_utils.simulation.sedml import modify_xml_model_for_simulation
+from Biosimulations_utils.simulation.sedml import modify_xml_model_for_simulation, ModelVariantGenerator
 from Biosimulations_utils.visualization.data_model import Visualization, VisualizationLayoutElement, VisualizationDataField
+import collections
+import copy
+import io
 import json
 import libsedml
 import os
 import shutil
 import tempfile
 import unittest
+import warnings
 
 
 class WriteSedMlTestCase(unittest.TestCase):
@@ -73,6 +78,163 @@ class WriteSedMlTestCase(unittest.TestCase):
         with self.assertRaisesRegex(NotImplementedError, 'not supported'):
             read_simulation(None, SimulationFormat.sessl)
 
+    def test_gen_sedml_in_memory(self):
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            id='sbml_model',
+            name='SBML model',
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='species_1', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_1']"),
+            ],
+        )
+        sim_filename = os.path.join(self.dirname, 'simulation.sedml')
+        write_simulation(sim, sim_filename)
+        with open(sim_filename, 'rb') as file:
+            content = file.read()
+
+        binary_file = io.BytesIO()
+        write_simulation(sim, binary_file)
+        self.assertEqual(binary_file.getvalue(), content)
+
+        text_file = io.StringIO()
+        write_simulation(sim, text_file)
+        self.assertEqual(text_file.getvalue(), content.decode())
+
+        self.assertEqual(read_simulation(content), read_simulation(sim_filename))
+        self.assertEqual(read_simulation(io.BytesIO(content)), read_simulation(sim_filename))
+        self.assertEqual(read_simulation(io.StringIO(content.decode())), read_simulation(sim_filename))
+
+    def test_gen_sedml_with_multiple_sims(self):
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            id='sbml_model',
+            name='SBML model',
+            file=RemoteFile(
+                name=os.path.join(self.dirname, 'model.sbml.xml'),
+                type='application/sbml+xml',
+            ),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='species_1', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_1']"),
+                BiomodelVariable(id='species_2', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_2']"),
+            ],
+        )
+        sim.model.format.version = 'L1V3'
+
+        sims = []
+        for i_sim in range(4):
+            sim_i = copy.deepcopy(sim)
+            sim_i.id = 'sim_{}'.format(i_sim + 1)
+            sim_i.name = 'Simulation {}'.format(i_sim + 1)
+            sims.append(sim_i)
+        sims[2].end_time = 2 * sim.end_time
+        sims[3].model_parameter_changes[0].value = 2 * sim.model_parameter_changes[0].value
+
+        sim_filename = os.path.join(self.dirname, 'simulations.sedml')
+        write_simulations(sims, sim_filename, SimulationFormat.sedml, level=1, version=3)
+
+        doc_sed = libsedml.readSedMLFromFile(sim_filename)
+        self.assertEqual(doc_sed.getNumModels(), 2)
+        self.assertEqual(doc_sed.getNumSimulations(), 2)
+        self.assertEqual(doc_sed.getNumTasks(), 4)
+        self.assertEqual(doc_sed.getNumOutputs(), 4)
+        self.assertEqual(doc_sed.getNumDataGenerators(), 4 * 3)
+
+        sims_2, _ = read_simulation(sim_filename, SimulationFormat.sedml)
+        self.assertEqual(len(sims_2), 4)
+        sims[3].model.id = doc_sed.getModel(1).getId()
+        for sim_i, sim_2 in zip(sims, sims_2):
+            self.assertEqual(sim_2, sim_i)
+
+        # data generators are reused for variables with the same target
+        sims[0].model.variables.append(BiomodelVariable(id='species_1_copy', target=sims[0].model.variables[0].target))
+        write_simulations(sims[0:1], sim_filename)
+        doc_sed = libsedml.readSedMLFromFile(sim_filename)
+        self.assertEqual(doc_sed.getNumDataGenerators(), 3)
+        self.assertEqual(doc_sed.getOutput(0).getNumDataSets(), 4)
+
+        with self.assertRaisesRegex(ValueError, 'At least one simulation'):
+            write_simulations([], sim_filename)
+        with self.assertRaisesRegex(ValueError, 'unique ids'):
+            write_simulations([sims[0], sims[0]], sim_filename)
+        with self.assertRaisesRegex(ValueError, 'Format must be'):
+            write_simulations(sims, sim_filename, level=1, version=2)
+        with self.assertRaisesRegex(NotImplementedError, 'not supported'):
+            write_simulations(sims, sim_filename, SimulationFormat.sessl)
+
+        # the metadata of the document must be the same for all of the simulations
+        sims[1].description = 'Other description'
+        with self.assertRaisesRegex(ValueError, 'same description'):
+            write_simulations(sims, sim_filename)
+        sims[1].description = sims[0].description
+        sims[1].authors = sims[1].authors[1:]
+        with self.assertRaisesRegex(ValueError, 'same authors'):
+            write_simulations(sims, sim_filename)
+
+    def test_gen_sedml_with_multiple_sims_colliding_data_gen_ids(self):
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            id='sbml_model',
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+        )
+
+        # the ids of the simulations prefixed to the ids of the variables collide
+        sims = []
+        for sim_id, var_ids in [('scan', ['high_S1', 'high_time']), ('scan_high', ['S1'])]:
+            sim_i = copy.deepcopy(sim)
+            sim_i.id = sim_id
+            sim_i.model.variables = [
+                BiomodelVariable(id=var_id, target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='{}']".format(var_id))
+                for var_id in var_ids
+            ]
+            sims.append(sim_i)
+
+        sim_filename = os.path.join(self.dirname, 'simulations.sedml')
+        write_simulations(sims, sim_filename)
+        doc_sed = libsedml.readSedMLFromFile(sim_filename)
+        self.assertEqual(doc_sed.getErrorLog().getNumFailsWithSeverity(libsedml.LIBSEDML_SEV_ERROR), 0)
+
+        data_gen_ids = [data_gen_sed.getId() for data_gen_sed in doc_sed.getListOfDataGenerators()]
+        self.assertEqual(data_gen_ids, ['scan_time', 'scan_high_S1', 'scan_high_time', 'scan_high_time_2', 'scan_high_S1_2'])
+        data_set_ids = [data_set_sed.getId() for output_sed in doc_sed.getListOfOutputs()
+                        for data_set_sed in output_sed.getListOfDataSets()]
+        self.assertEqual(data_set_ids, data_gen_ids)
+        for output_sed in doc_sed.getListOfOutputs():
+            for data_set_sed in output_sed.getListOfDataSets():
+                self.assertEqual(data_set_sed.getDataReference(), data_set_sed.getId())
+
+        sims_2, _ = read_simulation(sim_filename)
+        self.assertEqual([[var.id for var in sim_2.model.variables] for sim_2 in sims_2],
+                         [[var.id for var in sim_i.model.variables] for sim_i in sims])
+
+    def test_gen_sedml_with_multiple_sims_renamed_models(self):
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+        )
+
+        # models with the same id but different content are renamed without colliding with the ids of other models
+        sims = []
+        for i_sim, model_id in enumerate(['a', 'a_3', 'a', 'a']):
+            sim_i = copy.deepcopy(sim)
+            sim_i.id = 'sim_{}'.format(i_sim + 1)
+            sim_i.model.id = model_id
+            sim_i.model_parameter_changes[0].value = i_sim
+            sims.append(sim_i)
+
+        sim_filename = os.path.join(self.dirname, 'simulations.sedml')
+        write_simulations(sims, sim_filename)
+        doc_sed = libsedml.readSedMLFromFile(sim_filename)
+        self.assertEqual([model_sed.getId() for model_sed in doc_sed.getListOfModels()], ['a', 'a_3', 'a_2', 'a_4'])
+
     def test_gen_sedml_errors(self):
         # Other versions/levels of SED-ML are not supported
         sim = TimecourseSimulation(
@@ -96,6 +258,52 @@ class WriteSedMlTestCase(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'Format must be SED-ML'):
             write_simulation(sim, None, SimulationFormat.sedml, level=1, version=3)
 
+    def test_gen_sedml_with_deferred_error_checking(self):
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            id='sbml_model',
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='species_1', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_1']"),
+                BiomodelVariable(id='species_2', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_2']"),
+            ],
+        )
+
+        eager_filename = os.path.join(self.dirname, 'eager.sedml')
+        deferred_filename = os.path.join(self.dirname, 'deferred.sedml')
+        write_simulation(sim, eager_filename)
+        write_simulation(sim, deferred_filename, error_checking='deferred')
+        with open(eager_filename, 'r') as file:
+            eager_xml = file.read()
+        with open(deferred_filename, 'r') as file:
+            self.assertEqual(file.read(), eager_xml)
+
+        write_simulations([sim], deferred_filename, error_checking='deferred')
+        sims_2, _ = read_simulation(deferred_filename)
+        self.assertEqual(sims_2[0], sim)
+
+        with self.assertRaisesRegex(NotImplementedError, 'not supported'):
+            write_simulation(sim, deferred_filename, error_checking='unknown')
+
+        # errors are reported with the objects which caused them
+        writer = sedml.SedMlSimulationWriter()
+        writer._init_error_checking('deferred')
+        doc = libsedml.SedDocument(1, 3)
+        task = doc.createTask()
+        task.setId('task_1')
+        with self.assertRaisesRegex(ValueError, "setAnnotation of task 'task_1' failed"):
+            writer._call_libsedml_setter(doc, task, 'setAnnotation', '<rdf')
+
+        writer._check_error_log(doc, task)
+        doc = libsedml.readSedMLFromString('<sedML')
+        with self.assertRaisesRegex(ValueError, "libsedml error in sedML"):
+            writer._check_error_log(doc, doc)
+
+        writer._init_error_checking('eager')
+        writer._check_error_log(doc, doc)
+
     def test__get_obj_annotation(self):
         reader = sedml.SedMlSimulationReader()
 
@@ -114,6 +322,39 @@ class WriteSedMlTestCase(unittest.TestCase):
             '</rdf:RDF></annotation>')
         self.assertEqual(reader._get_obj_annotation(doc), [])
 
+        # annotations are decoded with lxml, consistently with libSED-ML
+        doc.setMetaId('_00000001')
+        doc.setAnnotation(
+            '<annotation><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            '<rdf:Description rdf:about="#_00000002"><dc:title>Other object</dc:title></rdf:Description>'
+            '<rdf:Description rdf:about="#_00000001">'
+            '<dc:title>Title &amp; subtitle</dc:title>'
+            '<dc:description dc:type="tags"><rdf:Bag><rdf:li><rdf:value>tag</rdf:value></rdf:li><rdf:li/></rdf:Bag></dc:description>'
+            '</rdf:Description>'
+            '</rdf:RDF></annotation>')
+
+        def to_tuples(nodes):
+            return [(node.prefix, node.name, node.type,
+                     node.children if isinstance(node.children, str) else to_tuples(node.children))
+                    for node in nodes]
+        self.assertEqual(to_tuples(reader._get_obj_annotation(doc)), [
+            ('dc', 'title', None, 'Title & subtitle'),
+            ('dc', 'description', 'tags', [('rdf', 'Bag', None, [
+                ('rdf', 'li', None, [('rdf', 'value', None, 'tag')]),
+                ('rdf', 'li', None, []),
+            ])]),
+        ])
+        self.assertEqual(to_tuples(reader._get_obj_annotation(doc)), to_tuples(reader._get_obj_annotation_from_sed(doc)))
+
+        # annotations which use namespaces declared by ancestors are decoded with libSED-ML
+        doc = libsedml.SedDocument(1, 3)
+        doc.getNamespaces().add('http://example.org/', 'ex')
+        doc.setAnnotation(
+            '<annotation><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+            '<rdf:Description><ex:title>Title</ex:title></rdf:Description>'
+            '</rdf:RDF></annotation>')
+        self.assertEqual(to_tuples(reader._get_obj_annotation(doc)), [('ex', 'title', None, 'Title')])
+
     def test__call_sedml_error(self):
         doc = libsedml.SedDocument()
         with self.assertRaisesRegex(ValueError, 'libsedml error:'):
@@ -242,6 +483,162 @@ class WriteSedMlTestCase(unittest.TestCase):
         self.assertEqual(viz.layout[0].data[1].simulation_results[0].variable.target,
                          "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='f_7']")
 
+    def test_read_tasks_which_share_models_and_sims(self):
+        filename = 'tests/fixtures/BIOMD0000000297-with-duplicate-task-ids.sedml'
+        with self.assertWarnsRegex(SimulationIoWarning, 'must have unique ids'):
+            sims, _ = read_simulation(filename, SimulationFormat.sedml)
+        self.assertEqual(len(sims), 2)
+        self.assertEqual(sims[0], sims[1])
+
+        # models and simulations are decoded once, but each task receives its own copies
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            sim = TimecourseSimulation.from_json(json.load(file))
+        sim.model = Biomodel(
+            id='sbml_model',
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+        )
+        sims = []
+        for i_sim in range(2):
+            sim_i = copy.deepcopy(sim)
+            sim_i.id = 'sim_{}'.format(i_sim + 1)
+            sims.append(sim_i)
+        sim_filename = os.path.join(self.dirname, 'simulations.sedml')
+        doc_sed = write_simulations(sims, sim_filename)
+        self.assertEqual(doc_sed.getNumModels(), 1)
+        self.assertEqual(doc_sed.getNumSimulations(), 1)
+
+        sims, _ = read_simulation(sim_filename)
+        self.assertIsNot(sims[0], sims[1])
+        self.assertIsNot(sims[0].model, sims[1].model)
+        self.assertIsNot(sims[0].model.variables, sims[1].model.variables)
+        self.assertIsNot(sims[0].tags, sims[1].tags)
+        self.assertIsNot(sims[0].model.format, sims[1].model.format)
+        self.assertIsNot(sims[0].model.file, sims[1].model.file)
+        self.assertIsNot(sims[0].algorithm, sims[1].algorithm)
+        for attr in ['model_parameter_changes', 'algorithm_parameter_changes', 'authors', 'references']:
+            self.assertTrue(getattr(sims[0], attr), attr)
+            for obj_0, obj_1 in zip(getattr(sims[0], attr), getattr(sims[1], attr)):
+                self.assertIsNot(obj_0, obj_1)
+
+        sims[0].model.id = 'other_model'
+        sims[0].model.file.name = 'other_model.xml'
+        sims[0].algorithm.name = 'Other algorithm'
+        sims[0].model_parameter_changes[0].value = -1
+        sims[0].authors[0].first_name = 'Other'
+        self.assertNotEqual(sims[1].model.id, 'other_model')
+        self.assertNotEqual(sims[1].model.file.name, 'other_model.xml')
+        self.assertNotEqual(sims[1].algorithm.name, 'Other algorithm')
+        self.assertNotEqual(sims[1].model_parameter_changes[0].value, -1)
+        self.assertNotEqual(sims[1].authors[0].first_name, 'Other')
+
+    def test_read_model_variables(self):
+        filename = 'tests/fixtures/BIOMD0000000297.sedml'
+        sims, _ = read_simulation(filename, SimulationFormat.sedml)
+        self.assertEqual(len(sims[0].model.variables), 15)
+        self.assertNotIn('time', [var.id for var in sims[0].model.variables])
+
+        doc_sed = libsedml.readSedMLFromFile(filename)
+        task_id = doc_sed.getTask(0).getId()
+        reader = sedml.SedMlSimulationReader()
+        task_id_to_vars = reader._index_model_variables(doc_sed)
+        self.assertEqual(list(task_id_to_vars.keys()), [task_id])
+
+        sim = TimecourseSimulation(model=Biomodel())
+        reader._read_model_variables(task_id, sim, task_id_to_vars)
+        self.assertEqual(sim.model.variables, sims[0].model.variables)
+
+        reader._read_model_variables(task_id, sim, {})
+        self.assertEqual(sim.model.variables, [])
+
+    def test_read_profiles(self):
+        filename = 'tests/fixtures/BIOMD0000000297.sedml'
+        sims, viz = read_simulation(filename, SimulationFormat.sedml)
+        self.assertNotEqual(viz, None)
+
+        sims_tasks_only, viz_tasks_only = read_simulation(filename, SimulationFormat.sedml, profile='tasks_only')
+        self.assertEqual(sims_tasks_only, sims)
+        self.assertEqual(viz_tasks_only, None)
+
+        with self.assertRaisesRegex(NotImplementedError, 'Profile unknown is not supported'):
+            read_simulation(filename, SimulationFormat.sedml, profile='unknown')
+
+    def test_read_simulations(self):
+        filenames = [
+            'tests/fixtures/BIOMD0000000803.sedml',
+            'tests/fixtures/Simon2019-with-one-step-sim.sedml',
+            'tests/fixtures/Simon2019.sedml',
+        ]
+
+        counts = collections.Counter()
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            results = list(read_simulations(filenames, counts=counts))
+        self.assertEqual([w for w in caught_warnings if w.category == SimulationIoWarning], [])
+
+        self.assertEqual([result[0] for result in results], filenames)
+        self.assertEqual(results[0][1:3], read_simulation(filenames[0]))
+        self.assertEqual(results[0][3], [
+            SimulationIoDiagnostic(category=SimulationIoDiagnosticCategory.unsupported_task, obj_id='task3',
+                                   message='SedRepeatedTask task3 is not supported'),
+            SimulationIoDiagnostic(category=SimulationIoDiagnosticCategory.unresolved_reference, obj_id='task3',
+                                   message='task task3 cannot be resolved'),
+        ])
+        self.assertEqual(results[0][4], None)
+
+        self.assertEqual(results[1][1:3], (None, None))
+        self.assertIsInstance(results[1][4], SimulationIoError)
+
+        self.assertEqual(results[2][1:3], read_simulation(filenames[2]))
+        self.assertEqual(results[2][3], [])
+
+        self.assertEqual(counts, collections.Counter({
+            'files': 3,
+            'errors': 1,
+            'simulations': len(results[0][1]) + len(results[2][1]),
+            'unsupported_task': 1,
+            'unresolved_reference': 1,
+        }))
+
+        # parallel
+        counts_parallel = collections.Counter()
+        self.assertEqual(list(read_simulations(filenames, workers=2, counts=counts_parallel))[0:1], results[0:1])
+        self.assertEqual(counts_parallel, counts)
+
+        results_unordered = list(read_simulations(filenames, workers=2, ordered=False))
+        self.assertEqual(sorted(result[0] for result in results_unordered), sorted(filenames))
+
+        with self.assertRaisesRegex(NotImplementedError, 'Profile unknown is not supported'):
+            list(read_simulations(filenames, profile='unknown'))
+
+    def test_read_simulations_with_invalid_kisao_id(self):
+        with open('tests/fixtures/BIOMD0000000297.sedml', 'r') as file:
+            xml = file.read()
+        self.assertIn('kisaoID="KISAO:0000019"', xml)
+        invalid_filename = os.path.join(self.dirname, 'invalid-kisao-id.sedml')
+        with open(invalid_filename, 'w') as file:
+            file.write(xml.replace('kisaoID="KISAO:0000019"', 'kisaoID="KISAO_0000019"'))
+
+        with self.assertRaisesRegex(SimulationIoError, 'Invalid KiSAO id KISAO_0000019'):
+            read_simulation(invalid_filename)
+
+        # the error is reported for the file, and the other files are still read
+        filenames = [invalid_filename, 'tests/fixtures/BIOMD0000000297.sedml']
+        for workers in [1, 2]:
+            results = list(read_simulations(filenames, workers=workers))
+            self.assertEqual([result[0] for result in results], filenames)
+            self.assertEqual(results[0][1:3], (None, None))
+            self.assertIsInstance(results[0][4], SimulationIoError)
+            self.assertEqual(results[1][1:3], read_simulation(filenames[1]))
+            self.assertEqual(results[1][4], None)
+
+    def test_diagnostic_json(self):
+        diagnostic = SimulationIoDiagnostic(category=SimulationIoDiagnosticCategory.duplicate_id, obj_id='task_1',
+                                            message='task id task_1 is not unique')
+        self.assertEqual(SimulationIoDiagnostic.from_json(diagnostic.to_json()), diagnostic)
+        self.assertEqual(SimulationIoDiagnostic.from_json(SimulationIoDiagnostic().to_json()), SimulationIoDiagnostic())
+        self.assertIn('duplicate_id', repr(diagnostic))
+
     def test_modify_model_for_simulation(self):
         in_model_filename = 'tests/fixtures/BIOMD0000000806.xml'
         out_model_filename = os.path.join(self.dirname, 'model.xml')
@@ -266,3 +663,44 @@ class WriteSedMlTestCase(unittest.TestCase):
         simulations, _ = read_simulation(simulation_filename)
         with self.assertRaisesRegex(ValueError, 'must match a single object'):
             modify_xml_model_for_simulation(simulations[0], in_model_filename, out_model_filename, default_namespace='sbml')
+
+    def test_model_variant_generator(self):
+        in_model_filename = 'tests/fixtures/BIOMD0000000806.xml'
+        simulations, _ = read_simulation('tests/fixtures/BIOMD0000000806-with-change-attribute.sedml')
+        simulation = simulations[0]
+        change = simulation.model_parameter_changes[0]
+
+        for pretty_print in [True, False]:
+            out_model_filename = os.path.join(self.dirname, 'model.xml')
+            modify_xml_model_for_simulation(simulation, in_model_filename, out_model_filename, default_namespace='sbml',
+                                            pretty_print=pretty_print)
+            with open(out_model_filename, 'rb') as file:
+                expected_variant = file.read()
+
+            generator = ModelVariantGenerator(in_model_filename, default_namespace='sbml', pretty_print=pretty_print)
+            self.assertEqual(generator.gen_variant(simulation), expected_variant)
+            self.assertEqual(list(generator.gen_variants([simulation, simulation])), [expected_variant, expected_variant])
+
+            variant_file = io.BytesIO()
+            self.assertEqual(generator.gen_variant(simulation, variant_file), None)
+            self.assertEqual(variant_file.getvalue(), expected_variant)
+
+        # variants from values
+        variant_filename = os.path.join(self.dirname, 'variant.xml')
+        generator.gen_variant_from_values([change.parameter.target], [2.5], variant_filename)
+        model = read_biomodel(variant_filename, format=BiomodelFormat.sbml)
+        self.assertEqual({p.target: p.value for p in model.parameters}[change.parameter.target], 2.5)
+
+        with self.assertRaisesRegex(ValueError, 'values must be provided'):
+            generator.gen_variant_from_values([change.parameter.target], [])
+
+        # the changes of previous variants are restored
+        orig_variant = generator.gen_variant_from_values([], [])
+        self.assertEqual(orig_variant, ModelVariantGenerator(in_model_filename, default_namespace='sbml', pretty_print=False)
+                         .gen_variant_from_values([], []))
+        self.assertNotEqual(generator.gen_variant(simulation), orig_variant)
+        self.assertEqual(generator.gen_variant_from_values([], []), orig_variant)
+
+        # targets are only resolved once
+        obj_attr = generator._get_obj_attr(change.parameter.target)
+        self.assertIs(generator._get_obj_attr(change.parameter.target), obj_attr)
@@ -0,0 +1,112 @@
+""" Tests of utilities for reading SED-ML documents with lxml
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-09
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.simulation import iter_simulations, read_simulation
+from Biosimulations_utils.simulation.core import SimulationIoError, SimulationIoWarning
+from Biosimulations_utils.simulation.data_model import Simulation
+from Biosimulations_utils.simulation.sedml import SedMlSimulationReader
+from Biosimulations_utils.simulation.sedml_lxml import LxmlSedMlSimulationReader
+from unittest import mock
+import glob
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+
+class LxmlSedMlSimulationReaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_equivalent_to_libsedml(self):
+        filenames = sorted(glob.glob('tests/fixtures/*.sedml'))
+        self.assertGreater(len(filenames), 0)
+
+        for filename in filenames:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', SimulationIoWarning)
+                try:
+                    sims, viz = SedMlSimulationReader().run(filename)
+                except SimulationIoError:
+                    with self.assertRaises(SimulationIoError, msg=filename):
+                        LxmlSedMlSimulationReader().run(filename)
+                    continue
+
+                sims_lxml, viz_lxml = LxmlSedMlSimulationReader().run(filename)
+
+            self.assertEqual([sim.to_json() for sim in sims_lxml], [sim.to_json() for sim in sims], msg=filename)
+            self.assertEqual(viz_lxml.to_json() if viz_lxml else None, viz.to_json() if viz else None, msg=filename)
+
+    def test_iter_simulations(self):
+        filename = 'tests/fixtures/BIOMD0000000803.sedml'
+        sims, viz = read_simulation(filename)
+
+        sims_iter = iter_simulations(filename)
+        sim = next(sims_iter)
+        self.assertIsInstance(sim, Simulation)
+        self.assertEqual(sim, sims[0])
+        self.assertEqual(list(sims_iter), sims[1:])
+
+        # the visualization is the return value of the generator
+        vizs = []
+
+        def iter_sims():
+            viz_lxml = yield from iter_simulations(filename, read_visualization=True)
+            vizs.append(viz_lxml)
+        self.assertEqual(list(iter_sims()), sims)
+        self.assertEqual(vizs, [viz])
+
+    def test_iter_simulations_from_memory(self):
+        filename = 'tests/fixtures/BIOMD0000000297.sedml'
+        sims, viz = read_simulation(filename)
+        with open(filename, 'rb') as file:
+            content = file.read()
+
+        self.assertEqual(list(iter_simulations(content)), sims)
+        self.assertEqual(LxmlSedMlSimulationReader().run(io.BytesIO(content)), (sims, viz))
+
+    def test_skip_visualization(self):
+        filename = 'tests/fixtures/BIOMD0000000297.sedml'
+        reader = LxmlSedMlSimulationReader()
+        with mock.patch.object(LxmlSedMlSimulationReader, '_read_visualization', side_effect=Exception('should not be read')):
+            sims = list(reader.iter(filename))
+        self.assertEqual(len(sims), 1)
+        self.assertEqual(reader.visualization, None)
+
+        list(reader.iter(filename, read_visualization=True))
+        self.assertEqual(len(reader.visualization.layout), 4)
+
+        sims_tasks_only, viz = reader.run(filename, profile='tasks_only')
+        self.assertEqual(sims_tasks_only, sims)
+        self.assertEqual(viz, None)
+
+    def test_unsupported_task(self):
+        filename = 'tests/fixtures/Simon2019-with-multiple-models-and-sims.sedml'
+        with self.assertWarnsRegex(SimulationIoWarning, 'is not supported'):
+            list(iter_simulations(filename))
+
+    def test_invalid_xml(self):
+        filename = os.path.join(self.dirname, 'sim.sedml')
+        with open(filename, 'w') as file:
+            file.write('<sedML xmlns="http://sed-ml.org/sed-ml/level1/version3" level="1" version="3"><listOfModels>')
+        with self.assertRaisesRegex(SimulationIoError, 'not valid XML'):
+            list(iter_simulations(filename))
+
+        with open(filename, 'w') as file:
+            file.write('<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1"/>')
+        with self.assertRaisesRegex(SimulationIoError, 'not a SED-ML document'):
+            list(iter_simulations(filename))
+
+    def test_file_does_not_exist(self):
+        with self.assertRaisesRegex(SimulationIoError, 'does not exist'):
+            list(iter_simulations('tests/fixtures/does-not-exist.sedml'))
@@ -0,0 +1,84 @@
+""" Tests of utilities for rendering variants of SED-ML documents from templates
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-11
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel.data_model import Biomodel, BiomodelFormat, BiomodelVariable
+from Biosimulations_utils.data_model import RemoteFile
+from Biosimulations_utils.simulation import read_simulation, write_simulation
+from Biosimulations_utils.simulation.data_model import TimecourseSimulation
+from Biosimulations_utils.simulation.sedml_template import SedMlSimulationTemplate
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class SedMlSimulationTemplateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+        with open('tests/fixtures/simulation.json', 'rb') as file:
+            self.sim = TimecourseSimulation.from_json(json.load(file))
+        self.sim.model = Biomodel(
+            id='sbml_model',
+            name='SBML model',
+            file=RemoteFile(name='model.sbml.xml', type='application/sbml+xml'),
+            format=BiomodelFormat.sbml.value,
+            variables=[
+                BiomodelVariable(id='species_1', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='species_1']"),
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def _write_variant(self, model_parameter_values, algorithm_parameter_values):
+        sim = copy.deepcopy(self.sim)
+        for change, value in zip(sim.model_parameter_changes, model_parameter_values):
+            change.value = value
+        for change, value in zip(sim.algorithm_parameter_changes, algorithm_parameter_values):
+            change.value = value
+
+        filename = os.path.join(self.dirname, 'variant.sedml')
+        write_simulation(sim, filename)
+        with open(filename, 'rb') as file:
+            return file.read()
+
+    def test_render(self):
+        self.assertEqual(len(self.sim.model_parameter_changes), 2)
+        self.assertEqual(len(self.sim.algorithm_parameter_changes), 2)
+
+        template = SedMlSimulationTemplate(self.sim)
+        self.assertEqual(template.render(), self._write_variant([1.1, 2.1], [3.3, 4.4]))
+
+        for model_parameter_values, algorithm_parameter_values in [
+            ([5, 6.5e-3], [1e-8, 1e-6]),
+            ([True, 'value'], [0, -1.]),
+            (['a & b', '<c>'], ["'d'", '"e"']),
+        ]:
+            self.assertEqual(template.render(model_parameter_values, algorithm_parameter_values),
+                             self._write_variant(model_parameter_values, algorithm_parameter_values))
+
+        filename = os.path.join(self.dirname, 'template.sedml')
+        template.write(filename, model_parameter_values=[5, 6.5e-3])
+        sims, _ = read_simulation(filename)
+        self.assertEqual([change.value for change in sims[0].model_parameter_changes], [5, 6.5e-3])
+        self.assertEqual([change.value for change in sims[0].algorithm_parameter_changes], [3.3, 4.4])
+
+        # the simulation experiment of the template isn't modified
+        self.assertEqual([change.value for change in self.sim.model_parameter_changes], [1.1, 2.1])
+
+        with self.assertRaisesRegex(ValueError, '2 values must be provided'):
+            template.render(model_parameter_values=[1.])
+
+    def test_render_without_parameter_changes(self):
+        self.sim.model_parameter_changes = []
+        self.sim.algorithm_parameter_changes = []
+        template = SedMlSimulationTemplate(self.sim)
+        self.assertEqual(template.render(), self._write_variant([], []))
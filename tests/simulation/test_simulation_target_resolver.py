@@ -0,0 +1,119 @@
+""" Test of the resolution of XPath targets
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-12
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.simulation.target_resolver import XmlTargetResolver, compile_xpath, parse_id_xpath
+from lxml import etree
+import unittest
+
+MODEL = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core"
+      xmlns:qual="http://www.sbml.org/sbml/level3/version1/qual/version1" level="3" version="1">
+  <model id="model">
+    <listOfParameters>
+      <parameter id="k1" value="1"/>
+      <parameter id="k2" value="2"/>
+      <parameter id="dup" value="3"/>
+      <parameter id="dup" value="4"/>
+    </listOfParameters>
+    <listOfReactions>
+      <reaction id="r1">
+        <kineticLaw>
+          <listOfLocalParameters>
+            <localParameter id="k1" value="5"/>
+          </listOfLocalParameters>
+        </kineticLaw>
+      </reaction>
+      <reaction id="r2">
+        <kineticLaw>
+          <listOfLocalParameters>
+            <localParameter id="k1" value="6"/>
+          </listOfLocalParameters>
+        </kineticLaw>
+      </reaction>
+    </listOfReactions>
+    <qual:listOfQualitativeSpecies>
+      <qual:qualitativeSpecies qual:id="A" qual:initialLevel="0"/>
+    </qual:listOfQualitativeSpecies>
+  </model>
+</sbml>
+"""
+
+
+class TargetResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.et = etree.ElementTree(etree.fromstring(MODEL))
+        self.namespaces = {
+            'sbml': 'http://www.sbml.org/sbml/level3/version1/core',
+            'qual': 'http://www.sbml.org/sbml/level3/version1/qual/version1',
+        }
+
+    def test_parse_id_xpath(self):
+        self.assertEqual(parse_id_xpath("/sbml:sbml/sbml:model[@id='model']/sbml:parameter[@id='k1']"), (
+            ('sbml', 'sbml', None),
+            ('sbml', 'model', (None, 'model')),
+            ('sbml', 'parameter', (None, 'k1')),
+        ))
+        self.assertEqual(parse_id_xpath('/sbml/qual:qualitativeSpecies[@qual:id="A"]'), (
+            (None, 'sbml', None),
+            ('qual', 'qualitativeSpecies', ('qual', 'A')),
+        ))
+        self.assertEqual(parse_id_xpath("/sbml:sbml/sbml:model"), None)
+        self.assertEqual(parse_id_xpath("//sbml:parameter[@id='k1']"), None)
+        self.assertEqual(parse_id_xpath("/sbml:sbml/sbml:model/sbml:parameter[@name='k1']"), None)
+        self.assertEqual(parse_id_xpath("/sbml:sbml/sbml:model/sbml:parameter[@id='k1'][1]"), None)
+
+    def test_resolve(self):
+        resolver = XmlTargetResolver(self.et, self.namespaces)
+        xpaths = [
+            # id shapes
+            "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']",
+            '/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id="k2"]',
+            "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='dup']",
+            "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k3']",
+            "/sbml:sbml/sbml:model[@id='model']/sbml:listOfParameters/sbml:parameter[@id='k1']",
+            "/sbml:sbml/sbml:model[@id='other']/sbml:listOfParameters/sbml:parameter[@id='k1']",
+            "/sbml:sbml/sbml:model[@id='model']/sbml:listOfParameters/sbml:parameter",
+            "/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction[@id='r1']/sbml:kineticLaw",
+            "/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']",
+            ("/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction[@id='r2']/sbml:kineticLaw"
+             "/sbml:listOfLocalParameters/sbml:localParameter[@id='k1']"),
+            ("/sbml:sbml/sbml:model/sbml:listOfReactions/sbml:reaction/sbml:kineticLaw"
+             "/sbml:listOfLocalParameters/sbml:localParameter[@id='k1']"),
+            "/sbml:sbml/sbml:model/qual:listOfQualitativeSpecies/qual:qualitativeSpecies[@qual:id='A']",
+            "/sbml:sbml/sbml:model/qual:listOfQualitativeSpecies/qual:qualitativeSpecies[@id='A']",
+
+            # other shapes
+            "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter",
+            "//sbml:localParameter[@id='k1']",
+            "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@value='2']",
+        ]
+        for xpath in xpaths:
+            self.assertEqual(resolver.resolve(xpath), self.et.xpath(xpath, namespaces=self.namespaces), xpath)
+
+        self.assertEqual(len(resolver.resolve("/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='dup']")), 2)
+
+    def test_resolve_undefined_prefix(self):
+        resolver = XmlTargetResolver(self.et, self.namespaces)
+        with self.assertRaises(etree.XPathEvalError):
+            resolver.resolve("/sbml:sbml/sbml:model/sbml:listOfParameters/undefined:parameter[@id='k1']")
+
+    def test_reset(self):
+        resolver = XmlTargetResolver(self.et, self.namespaces)
+        xpath = "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k3']"
+        self.assertEqual(resolver.resolve(xpath), [])
+
+        param = resolver.resolve("/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k2']")[0]
+        param.set('id', 'k3')
+        resolver.reset()
+        self.assertEqual(resolver.resolve(xpath), [param])
+
+    def test_compile_xpath(self):
+        namespaces = frozenset(self.namespaces.items())
+        xpath = compile_xpath('/sbml:sbml/sbml:model', namespaces)
+        self.assertIs(compile_xpath('/sbml:sbml/sbml:model', namespaces), xpath)
+        self.assertEqual(xpath(self.et), [self.et.getroot()[0]])
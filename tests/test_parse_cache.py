@@ -0,0 +1,159 @@
+""" Tests of the persistent cache of the results of parsing files
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-06
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.biomodel import read_biomodel
+from Biosimulations_utils.biomodel.data_model import BiomodelFormat
+from Biosimulations_utils.parse_cache import ParseCache, get_parse_cache
+from Biosimulations_utils.simulation import read_simulation
+from unittest import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class ParseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.cache_dirname = os.path.join(self.dirname, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_key(self):
+        cache = ParseCache(dirname=self.cache_dirname)
+
+        filename = os.path.join(self.dirname, 'file.xml')
+        with open(filename, 'w') as file:
+            file.write('a')
+
+        key = cache.get_key(filename, format='sbml')
+        self.assertEqual(cache.get_key(filename, format='sbml'), key)
+        self.assertNotEqual(cache.get_key(filename, format='sedml'), key)
+
+        with mock.patch('Biosimulations_utils.parse_cache.__version__', '0.0.0'):
+            self.assertNotEqual(cache.get_key(filename, format='sbml'), key)
+
+        with open(filename, 'w') as file:
+            file.write('b')
+        self.assertNotEqual(cache.get_key(filename, format='sbml'), key)
+
+        self.assertEqual(cache.get_key(os.path.join(self.dirname, 'does-not-exist.xml')), None)
+
+        # contents of files
+        self.assertEqual(cache.get_key(b'b', format='sbml'), cache.get_key(filename, format='sbml'))
+        self.assertNotEqual(cache.get_key(b'a', format='sbml'), cache.get_key(filename, format='sbml'))
+
+    def test_get_set(self):
+        cache = ParseCache(dirname=self.cache_dirname)
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 1})
+
+        cache.set('a', {'id': 'model'})
+        self.assertEqual(cache.get('a'), {'id': 'model'})
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1})
+
+        # persistent
+        self.assertEqual(ParseCache(dirname=self.cache_dirname).get('a'), {'id': 'model'})
+
+        cache.clear()
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 0})
+        self.assertEqual(cache.get('a'), None)
+
+    def test_evict_least_recently_used(self):
+        cache = ParseCache(dirname=self.cache_dirname, max_size=3 * len('"xxxx"') + 2)
+        for i_key, key in enumerate(['a', 'b', 'c']):
+            cache.set(key, 'xxxx')
+            os.utime(os.path.join(self.cache_dirname, key + '.json'), (i_key, i_key))
+
+        self.assertEqual(cache.get('a'), 'xxxx')
+        cache.set('d', 'xxxx')
+
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 'xxxx')
+        self.assertEqual(cache.get('c'), 'xxxx')
+        self.assertEqual(cache.get('d'), 'xxxx')
+
+    def test_evict_only_scans_when_full(self):
+        cache = ParseCache(dirname=self.cache_dirname, max_size=10 * len('"xxxx"'))
+        with mock.patch('os.scandir', side_effect=os.scandir) as scandir:
+            for i_key in range(10):
+                cache.set(str(i_key), 'xxxx')
+            self.assertEqual(scandir.call_count, 1)
+
+            # entries are evicted below the maximum size so that the next writes don't scan the directory
+            cache.set('10', 'xxxx')
+            self.assertEqual(scandir.call_count, 2)
+            self.assertEqual(cache._total_size, 9 * len('"xxxx"'))
+            cache.set('11', 'xxxx')
+            self.assertEqual(scandir.call_count, 2)
+
+            # replacing entries doesn't change their total size
+            cache.set('11', 'xxxx')
+            self.assertEqual(cache._total_size, 10 * len('"xxxx"'))
+            self.assertEqual(scandir.call_count, 2)
+
+    def test_read_biomodel(self):
+        cache = ParseCache(dirname=self.cache_dirname)
+        filename = 'tests/fixtures/BIOMD0000000297.xml'
+
+        model = read_biomodel(filename, format=BiomodelFormat.sbml, cache=cache)
+        self.assertEqual(cache.get_info(), {'hits': 0, 'misses': 1})
+
+        with mock.patch('Biosimulations_utils.biomodel.SbmlBiomodelReader.run', side_effect=Exception('should not be read')):
+            self.assertEqual(read_biomodel(filename, format=BiomodelFormat.sbml, cache=cache), model)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1})
+
+        # different reader options
+        self.assertEqual(read_biomodel(filename, format=BiomodelFormat.sbml, engine='lxml', cache=cache), model)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 2})
+
+        # rebuild
+        self.assertEqual(read_biomodel(filename, format=BiomodelFormat.sbml, cache=cache, rebuild_cache=True), model)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 2})
+
+        # bypass
+        with mock.patch('Biosimulations_utils.biomodel.SbmlBiomodelReader.run', return_value=None):
+            self.assertEqual(read_biomodel(filename, format=BiomodelFormat.sbml), None)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 2})
+
+        # contents of the file, and copies of the file at other paths
+        with open(filename, 'rb') as file:
+            content = file.read()
+        uncached_model = read_biomodel(content, format=BiomodelFormat.sbml)
+        self.assertEqual(uncached_model.file.name, None)
+        with mock.patch('Biosimulations_utils.biomodel.SbmlBiomodelReader.run', side_effect=Exception('should not be read')):
+            self.assertEqual(read_biomodel(content, format=BiomodelFormat.sbml, cache=cache), uncached_model)
+        self.assertEqual(cache.get_info(), {'hits': 2, 'misses': 2})
+
+        copy_filename = os.path.join(self.dirname, 'copy.xml')
+        shutil.copyfile(filename, copy_filename)
+        uncached_model = read_biomodel(copy_filename, format=BiomodelFormat.sbml)
+        self.assertEqual(uncached_model.file.name, 'copy.xml')
+        with mock.patch('Biosimulations_utils.biomodel.SbmlBiomodelReader.run', side_effect=Exception('should not be read')):
+            self.assertEqual(read_biomodel(copy_filename, format=BiomodelFormat.sbml, cache=cache), uncached_model)
+        self.assertEqual(cache.get_info(), {'hits': 3, 'misses': 2})
+
+        # errors aren't cached
+        with self.assertRaisesRegex(ValueError, 'does not exist'):
+            read_biomodel('__non_existant_file__', format=BiomodelFormat.sbml, cache=cache)
+
+    def test_read_simulation(self):
+        cache = ParseCache(dirname=self.cache_dirname)
+        filename = 'tests/fixtures/Simon2019.sedml'
+
+        sims, viz = read_simulation(filename, cache=cache)
+
+        with mock.patch('Biosimulations_utils.simulation.SedMlSimulationReader.run', side_effect=Exception('should not be read')):
+            sims_2, viz_2 = read_simulation(filename, cache=cache)
+        self.assertEqual(sims_2, sims)
+        self.assertEqual(viz_2, viz)
+        self.assertEqual(cache.get_info(), {'hits': 1, 'misses': 1})
+
+    def test_get_parse_cache(self):
+        self.assertIs(get_parse_cache(), get_parse_cache())
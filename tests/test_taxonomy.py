@@ -0,0 +1,99 @@
+""" Tests of utilities for resolving the names of taxa
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2020-05-05
+:Copyright: 2020, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from Biosimulations_utils.taxonomy import TaxonomyResolver, get_taxonomy_resolver
+from unittest import mock
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TaxonomyResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.cache_filename = os.path.join(self.dirname, 'cache', 'taxonomy.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_names(self):
+        ncbi_taxa = mock.Mock(get_taxid_translator=mock.Mock(return_value={9606: 'Homo sapiens', 10090: 'Mus musculus'}))
+        with mock.patch('ete3.NCBITaxa', return_value=ncbi_taxa) as NCBITaxa:
+            resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+            self.assertEqual(resolver.get_names([9606, '10090', 1]), {9606: 'Homo sapiens', 10090: 'Mus musculus', 1: None})
+            self.assertEqual(resolver.get_name(9606), 'Homo sapiens')
+            self.assertEqual(resolver.get_name(1), None)
+
+        NCBITaxa.assert_called_once_with()
+        ncbi_taxa.get_taxid_translator.assert_called_once_with([1, 9606, 10090])
+
+        # names are saved when the resolver is flushed
+        self.assertFalse(os.path.isfile(self.cache_filename))
+        resolver.flush()
+        with open(self.cache_filename, 'r') as file:
+            self.assertEqual(json.load(file), {'1': None, '9606': 'Homo sapiens', '10090': 'Mus musculus'})
+
+        # read from cache without opening the database
+        with mock.patch('ete3.NCBITaxa', side_effect=Exception('database should not be opened')) as NCBITaxa:
+            resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+            self.assertEqual(resolver.get_names([9606, 10090]), {9606: 'Homo sapiens', 10090: 'Mus musculus'})
+        NCBITaxa.assert_not_called()
+
+        resolver.clear()
+        self.assertFalse(os.path.isfile(self.cache_filename))
+
+    def test_flush(self):
+        ncbi_taxa = mock.Mock(get_taxid_translator=mock.Mock(side_effect=lambda taxids: {taxid: str(taxid) for taxid in taxids}))
+        with mock.patch('ete3.NCBITaxa', return_value=ncbi_taxa):
+            resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+            with mock.patch('os.replace', side_effect=os.replace) as replace:
+                for taxid in range(10):
+                    self.assertEqual(resolver.get_name(taxid), str(taxid))
+                replace.assert_not_called()
+
+                resolver.flush()
+                resolver.flush()
+                self.assertEqual(replace.call_count, 1)
+
+        self.assertEqual(TaxonomyResolver(cache_filename=self.cache_filename)._names, {taxid: str(taxid) for taxid in range(10)})
+
+    def test_database_unavailable(self):
+        with mock.patch('ete3.NCBITaxa', side_effect=Exception('no network')) as NCBITaxa:
+            resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+            self.assertEqual(resolver.get_name(9606), None)
+            self.assertEqual(resolver.get_name(10090), None)
+            resolver.flush()
+        self.assertFalse(os.path.isfile(self.cache_filename))
+
+        # opening the database isn't retried until the cache is cleared
+        NCBITaxa.assert_called_once_with()
+        ncbi_taxa = mock.Mock(get_taxid_translator=mock.Mock(return_value={9606: 'Homo sapiens'}))
+        with mock.patch('ete3.NCBITaxa', return_value=ncbi_taxa):
+            self.assertEqual(resolver.get_name(9606), None)
+            resolver.clear()
+            self.assertEqual(resolver.get_name(9606), 'Homo sapiens')
+
+        ncbi_taxa = mock.Mock(get_taxid_translator=mock.Mock(side_effect=Exception('database is corrupted')))
+        with mock.patch('ete3.NCBITaxa', return_value=ncbi_taxa):
+            resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+            self.assertEqual(resolver.get_name(9606), None)
+            resolver.flush()
+        self.assertFalse(os.path.isfile(self.cache_filename))
+
+    def test_invalid_cache(self):
+        os.makedirs(os.path.dirname(self.cache_filename))
+        with open(self.cache_filename, 'w') as file:
+            file.write('invalid')
+
+        resolver = TaxonomyResolver(cache_filename=self.cache_filename)
+        self.assertEqual(resolver._names, {})
+
+    def test_get_taxonomy_resolver(self):
+        self.assertIs(get_taxonomy_resolver(), get_taxonomy_resolver())
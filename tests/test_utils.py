@@ -7,7 +7,9 @@
 """
 
 from Biosimulations_utils.biomodel.data_model import BiomodelFormat
-from Biosimulations_utils.utils import get_enum_format_by_attr, pretty_print_units, assert_exception
+from Biosimulations_utils.utils import (get_enum_format_by_attr, pretty_print_units, assert_exception,
+                                        read_source, get_source_name, IN_MEMORY_SOURCE_NAME)
+import io
 import unittest
 
 
@@ -43,7 +45,25 @@ class UtilsTestCase(unittest.TestCase):
         self.assertEqual(pretty_print_units('10^21 s'), 'Zsecond')
         self.assertEqual(pretty_print_units('10^24 s'), 'Ysecond')
 
+    def test_pretty_print_units_cache(self):
+        pretty_print_units.cache_clear()
+        self.assertEqual(pretty_print_units('mol / s'), 'mole / second')
+        self.assertEqual(pretty_print_units('mol / s'), 'mole / second')
+        info = pretty_print_units.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
     def test_assert_exception(self):
         assert_exception(True, Exception('message'))
         with self.assertRaisesRegex(Exception, 'message'):
             assert_exception(False, Exception('message'))
+
+    def test_read_source(self):
+        self.assertEqual(read_source('model.xml'), 'model.xml')
+        self.assertEqual(read_source(b'<sbml/>'), b'<sbml/>')
+        self.assertEqual(read_source(io.BytesIO(b'<sbml/>')), b'<sbml/>')
+        self.assertEqual(read_source(io.StringIO('<sbml/>')), b'<sbml/>')
+
+    def test_get_source_name(self):
+        self.assertEqual(get_source_name('model.xml'), 'model.xml')
+        self.assertEqual(get_source_name(b'<sbml/>'), IN_MEMORY_SOURCE_NAME)